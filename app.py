@@ -2,8 +2,17 @@
 import streamlit as st
 from fpdf import FPDF
 import io
-from data_ingestion.airtable_data import load_all_airtable
+from config import load_config
+from data_ingestion.airtable_data import load_all_airtable, load_all_airtable_incremental
+from data_ingestion.data_cache import DatasetCache
+from data_ingestion.snapshot import load_snapshot, write_snapshot
 from data_models.marketing_objects import Campaign, Attendee, Response, Activity, Contact, Account, Opportunity
+from data_models.campaign_dataset import CampaignDataset
+from data_models.event_table import compact_events
+from context_layer.metric_history import MetricHistoryStore
+from context_layer.narrative_memory import NarrativeMemory
+from context_layer.sqlite_memory_backend import SQLiteMemoryBackend
+from genai.metrics_engine import compute_portfolio_metrics
 from genai.summary import generate_summary
 
 
@@ -36,16 +45,64 @@ class PDF(FPDF):
             self.cell(0, 8, f"- {item}", ln=True)
 
 
+@st.cache_resource
+def get_dataset_cache() -> DatasetCache:
+    # One cache per server process, shared by every session
+    config = load_config()
+    incremental = config["airtable_sync_mode"] == "incremental"
+    loader = load_all_airtable_incremental if incremental else load_all_airtable
+    # Cache responses/activities as EventTables instead of model lists. Not in incremental mode, whose sync
+    # mirror keeps the models alive anyway, so converting would only add memory.
+    columnar = config["columnar_events"] and not incremental
+    if columnar:
+        fetch = loader
+        loader = lambda: compact_events(fetch())
+    snapshot_dir = config["data_snapshot_dir"]
+    if not snapshot_dir:
+        return DatasetCache(loader, ttl_seconds=config["data_refresh_ttl_seconds"])
+    return DatasetCache(loader, ttl_seconds=config["data_refresh_ttl_seconds"],
+                        warm_start=lambda: load_snapshot(snapshot_dir, event_tables=columnar),
+                        on_load=lambda data: write_snapshot(data, snapshot_dir))
+
+
+def format_age(seconds: float) -> str:
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    return f"{seconds / 3600:.1f} h ago"
+
+
+@st.cache_resource(max_entries=2)
+def get_campaign_dataset(snapshot_version: int, _data) -> CampaignDataset:
+    # Indexes are built once per snapshot version and shared by every session; columnar events arrive
+    # already compacted from get_dataset_cache()
+    return CampaignDataset.from_data(_data)
+
+
+@st.cache_resource(max_entries=2)
+def get_portfolio_metrics(snapshot_version: int, _dataset: CampaignDataset):
+    # Campaign x KPI table computed in one grouped pass per snapshot
+    return compute_portfolio_metrics(_dataset)
+
+
+@st.cache_resource
+def get_metric_history():
+    # KPI time series shared by every session; fills last_period / historical_benchmark
+    path = load_config()["metric_history_db"]
+    return MetricHistoryStore(path) if path else None
+
+
+@st.cache_resource
+def get_narrative_memory() -> NarrativeMemory:
+    # Summaries persist across restarts and are shared by every session
+    path = load_config()["narrative_memory_db"]
+    return NarrativeMemory(backend=SQLiteMemoryBackend(path)) if path else NarrativeMemory()
+
+
 def load_all_data():
-    data = load_all_airtable()
-    campaigns = data["campaigns"]
-    accounts = data["accounts"]
-    contacts = data["contacts"]
-    attendees = data["attendees"]
-    responses = data["responses"]
-    activities = data["activities"]
-    opportunities = data["opportunities"]
-    return campaigns, accounts, contacts, attendees, responses, activities, opportunities
+    snapshot = get_dataset_cache().get()
+    return snapshot.version, get_campaign_dataset(snapshot.version, snapshot.data)
 
 
 st.set_page_config(
@@ -89,7 +146,7 @@ with st.sidebar:
     st.markdown("<div style='font-size:1.2rem; font-weight:700; color:#003c43;'>Select Campaign</div>",
                 unsafe_allow_html=True)
     try:
-        campaigns, accounts, contacts, attendees, responses, activities, opportunities = load_all_data()
+        dataset_version, dataset = load_all_data()
     except EnvironmentError as e:
         st.error(f"Airtable environment error: {e}")
         st.markdown("""
@@ -107,7 +164,7 @@ with st.sidebar:
     except Exception as e:
         st.error(f"Airtable loading error: {e}")
         st.stop()
-    campaign_options = {c.name: c for c in campaigns}
+    campaign_options = {c.name: c for c in dataset.campaigns}
     if not campaign_options:
         st.warning("No campaigns found in Airtable. Please check your data.")
         st.stop()
@@ -115,16 +172,23 @@ with st.sidebar:
         "Choose a Campaign", list(campaign_options.keys()), key="sidebar_campaign_select")
     selected_campaign = campaign_options[selected_campaign_name]
 
+    dataset_cache = get_dataset_cache()
+    if st.button("🔄 Refresh data", key="sidebar_refresh_data"):
+        dataset_cache.refresh_async()
+    snapshot = dataset_cache.snapshot
+    status = f"Data loaded {format_age(snapshot.age_seconds)}"
+    if dataset_cache.is_refreshing:
+        status += " · refreshing in background…"
+    st.caption(status)
+    if dataset_cache.last_error:
+        st.warning(f"Last refresh failed, showing previous data: {dataset_cache.last_error}")
+
 
 # --- Main Layout: Horizontal Split ---
-selected_attendees = [
-    a for a in attendees if a.campaign_id == selected_campaign.id]
-selected_responses = [
-    r for r in responses if r.campaign_id == selected_campaign.id]
-selected_activities = [
-    a for a in activities if a.campaign_id == selected_campaign.id]
-selected_opportunities = [
-    o for o in opportunities if o.campaign_id == selected_campaign.id]
+selected_attendees = dataset.attendees_for(selected_campaign.id)
+selected_responses = dataset.responses_for(selected_campaign.id)
+selected_activities = dataset.activities_for(selected_campaign.id)
+selected_opportunities = dataset.opportunities_for(selected_campaign.id)
 
 left_col, right_col = st.columns([1, 2], gap="large")
 
@@ -186,11 +250,16 @@ with left_col:
                 attendees=selected_attendees,
                 responses=selected_responses,
                 activities=selected_activities,
-                contacts=contacts,
-                accounts=accounts,
+                contacts=dataset.contacts,
+                accounts=dataset.accounts,
                 opportunities=selected_opportunities,
                 program_name=selected_campaign.name,
-                user_prompt=user_prompt
+                user_prompt=user_prompt,
+                business_id=load_config()["business_id"],
+                dataset=dataset,
+                metrics_table=get_portfolio_metrics(dataset_version, dataset),
+                metric_history=get_metric_history(),
+                memory=get_narrative_memory()
             )
             st.session_state['summary'] = summary
         st.success("Executive summary generated!")
@@ -201,14 +270,11 @@ with right_col:
     # --- Summary Card Rendering ---
     if st.session_state.get('summary') and st.session_state.get('selected_campaign'):
         campaign_name = st.session_state['selected_campaign'].name
-        attendees_count = len(
-            [a for a in attendees if a.campaign_id == st.session_state['selected_campaign'].id])
-        pipeline_value = sum(getattr(o, 'amount', 0)
-                             for o in opportunities if o.campaign_id == st.session_state['selected_campaign'].id)
+        campaign_stats = dataset.aggregates(st.session_state['selected_campaign'].id)
+        attendees_count = campaign_stats.attendee_count
+        pipeline_value = campaign_stats.pipeline
         pipeline_display = f"${pipeline_value/1e6:.1f}M" if pipeline_value else "$0.0M"
-        key_account_ids = set(
-            [o.account_id for o in opportunities if o.campaign_id == st.session_state['selected_campaign'].id])
-        key_accounts = [a.name for a in accounts if a.id in key_account_ids]
+        key_accounts = [a.name for a in dataset.key_accounts(st.session_state['selected_campaign'].id)]
         accounts_display = " ".join([
             f"<span class='summary-badge'>{a}</span>" for a in key_accounts[:4]
         ]) if key_accounts else "N/A"
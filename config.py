@@ -34,6 +34,38 @@ DEFAULT_CONFIG = {
         "CAC": 200.0,
     },
     "prompt_tone": os.getenv("PROMPT_TONE", "executive"),  # e.g., 'executive', 'analyst', 'casual'
+    "data_refresh_ttl_seconds": float(os.getenv("DATA_REFRESH_TTL_SECONDS", "900")),  # cached dataset max age
+    "airtable_sync_mode": os.getenv("AIRTABLE_SYNC_MODE", "full"),  # 'full' or 'incremental'
+    "data_snapshot_dir": os.getenv("DATA_SNAPSHOT_DIR", ""),  # columnar snapshot for fast cold start; '' disables
+    "columnar_events": os.getenv("COLUMNAR_EVENTS", "false").lower() == "true",  # EventTable for activities/responses
+    "metric_history_db": os.getenv("METRIC_HISTORY_DB", "metric_history.db"),  # KPI time series; '' disables
+    "narrative_memory_db": os.getenv("NARRATIVE_MEMORY_DB", "narrative_memory.db"),  # persistent summaries; '' = in-process
+    # Scope for narrative memory, retrieval and business-level KPI history; defaults to the Airtable base
+    "business_id": os.getenv("BUSINESS_ID") or os.getenv("AIRTABLE_BASE_ID") or "default",
+    # Declarative insight rules, compiled by genai/rule_engine.py. Per rule:
+    # kpi: name or '*'; reference: optional meta field to compare against (e.g., 'last_period');
+    # measure: 'value', 'pct_change' or 'delta'; op: <, <=, >, >=, ==, !=;
+    # threshold: number, or the name of a per-KPI section above (e.g., 'metric_thresholds');
+    # message: format string over kpi, value, reference, pct_change, pct; details: output key -> field
+    "insight_rules": [
+        {"name": "anomaly", "type": "anomaly", "kpi": "*", "reference": "historical_benchmark",
+         "measure": "pct_change", "op": "<", "threshold": -0.15, "severity": "warning",
+         "message": "{kpi} down {pct:.1f}% vs benchmark",
+         "details": {"current": "value", "benchmark": "reference", "pct_change": "pct_change"}},
+        {"name": "trend_acceleration", "type": "trend_acceleration", "kpi": "*", "reference": "last_period",
+         "measure": "pct_change", "op": ">", "threshold": 0.2, "severity": "info",
+         "message": "{kpi} accelerated by {pct:.1f}% vs last period",
+         "details": {"current": "value", "last_period": "reference", "pct_change": "pct_change"}},
+        {"name": "high_roas", "type": "high_roas", "kpi": "ROAS", "measure": "value", "op": ">", "threshold": 4,
+         "severity": "info", "message": "ROAS exceeds 4: high return on ad spend", "details": {"roas": "value"}},
+        {"name": "low_conversion", "type": "risk", "kpi": "Conversion Rate", "measure": "value", "op": "<",
+         "threshold": 1, "severity": "critical", "message": "Conversion Rate below 1%",
+         "details": {"conversion_rate": "value"}},
+        {"name": "declining_conversion", "type": "risk", "kpi": "Conversion Rate", "reference": "last_period",
+         "measure": "delta", "op": "<", "threshold": 0, "severity": "warning",
+         "message": "Conversion Rate declining vs last period",
+         "details": {"current": "value", "last_period": "reference"}},
+    ],
 }
 
 CONFIG_PATH = os.getenv("CONFIG_YAML", "config.yaml")
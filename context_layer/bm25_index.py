@@ -0,0 +1,87 @@
+"""
+bm25_index.py
+
+Incremental BM25 inverted index for RetrievalEngine keyword retrieval.
+Documents are indexed once when added, into a global partition and a per-business_id partition,
+so a query touches only the postings of its own terms (and tenant) rather than scanning the corpus.
+Results are ranked by BM25 and the top k are selected with a heap; ties go to the most recently added document.
+"""
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class _Partition:
+    """
+    Postings and length statistics for one slice of the corpus.
+    """
+    __slots__ = ("postings", "doc_lengths", "total_length")
+
+    def __init__(self):
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}  # term -> [(doc_id, term frequency)]
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+
+    def add(self, doc_id: int, term_counts: Counter, length: int):
+        for term, tf in term_counts.items():
+            self.postings.setdefault(term, []).append((doc_id, tf))
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+
+
+class BM25Index:
+    """
+    BM25 (Okapi) over the given text fields of dict records. Doc IDs are caller-assigned integers,
+    increasing in insertion order (e.g., positions in RetrievalEngine.data_source).
+    """
+
+    def __init__(self, fields: Iterable[str] = ("summary", "campaign", "result"), k1: float = 1.5, b: float = 0.75):
+        self.fields = tuple(fields)
+        self.k1 = k1
+        self.b = b
+        self._all = _Partition()
+        self._by_business: Dict[Any, _Partition] = {}
+
+    def __len__(self) -> int:
+        return len(self._all.doc_lengths)
+
+    def add(self, doc_id: int, record: Dict[str, Any]):
+        tokens = tokenize(" ".join(str(record.get(f) or "") for f in self.fields))
+        counts = Counter(tokens)
+        self._all.add(doc_id, counts, len(tokens))
+        business_id = record.get("business_id")
+        if business_id is not None:
+            partition = self._by_business.get(business_id)
+            if partition is None:
+                partition = self._by_business[business_id] = _Partition()
+            partition.add(doc_id, counts, len(tokens))
+
+    def search(self, query: str, business_id: Any = None, top_k: int = 3) -> List[Tuple[float, int]]:
+        """
+        (score, doc_id) pairs of the top_k documents, best first. Scores use the partition's own statistics.
+        """
+        partition = self._by_business.get(business_id) if business_id else self._all
+        if partition is None or not partition.doc_lengths:
+            return []
+        n_docs = len(partition.doc_lengths)
+        avg_length = partition.total_length / n_docs or 1.0
+        k1, b = self.k1, self.b
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = partition.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = k1 * (1 - b + b * partition.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        top = heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], item[0]))
+        return [(score, doc_id) for doc_id, score in top]
@@ -0,0 +1,169 @@
+"""
+metric_history.py
+
+Defines MetricHistoryStore, a persistent SQLite time-series store of per-campaign and per-business KPI values.
+Values are kept once per KPI and day (re-recording a day replaces it) and rolled up into day, week and month
+buckets on insert, so prior-period and trailing-benchmark values are indexed lookups instead of recomputations
+from raw events.
+Fills the "last_period" and "historical_benchmark" fields read by detect_insights() and generate_executive_prompt().
+"""
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+GRAINS = ("day", "week", "month")
+
+
+def period_start(ts: datetime, grain: str) -> str:
+    """
+    ISO date of the bucket containing ts: the day itself, the Monday of its week, or the first of its month.
+    """
+    d = ts.date() if isinstance(ts, datetime) else ts
+    if grain == "day":
+        start = d
+    elif grain == "week":
+        start = d - timedelta(days=d.weekday())
+    elif grain == "month":
+        start = date(d.year, d.month, 1)
+    else:
+        raise ValueError(f"Unknown grain: {grain}")
+    return start.isoformat()
+
+
+def period_end(start: str, grain: str) -> str:
+    """
+    ISO date of the first day after the bucket starting at start.
+    """
+    d = date.fromisoformat(start)
+    if grain == "day":
+        end = d + timedelta(days=1)
+    elif grain == "week":
+        end = d + timedelta(days=7)
+    elif grain == "month":
+        end = date(d.year + d.month // 12, d.month % 12 + 1, 1)
+    else:
+        raise ValueError(f"Unknown grain: {grain}")
+    return end.isoformat()
+
+
+class MetricHistoryStore:
+    """
+    KPI history keyed by (scope, entity_id, kpi), where scope is e.g. 'campaign' or 'business'.
+    - metric_daily keeps one observation per KPI and day; recording the same day again replaces it, so
+      regenerating a summary does not add weight to that day.
+    - metric_rollups keeps sum/count/last of the daily values per grain and period, refreshed on insert.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS metric_daily (
+                    scope TEXT NOT NULL,
+                    entity_id TEXT NOT NULL,
+                    kpi TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    ts TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (scope, entity_id, kpi, day)
+                ) WITHOUT ROWID""")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS metric_rollups (
+                    scope TEXT NOT NULL,
+                    entity_id TEXT NOT NULL,
+                    grain TEXT NOT NULL,
+                    kpi TEXT NOT NULL,
+                    period_start TEXT NOT NULL,
+                    total REAL NOT NULL,
+                    count INTEGER NOT NULL,
+                    last REAL NOT NULL,
+                    PRIMARY KEY (scope, entity_id, grain, kpi, period_start)
+                ) WITHOUT ROWID""")
+
+    def _refresh_rollups(self, buckets):
+        """
+        Recompute the given (scope, entity_id, kpi, grain, period_start) rollups from metric_daily.
+        """
+        for scope, entity_id, kpi, grain, start in buckets:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO metric_rollups (scope, entity_id, grain, kpi, period_start, total, count, last)
+                SELECT scope, entity_id, :grain, kpi, :start, SUM(value), COUNT(*),
+                       (SELECT value FROM metric_daily
+                        WHERE scope = :scope AND entity_id = :entity_id AND kpi = :kpi AND day >= :start AND day < :end
+                        ORDER BY day DESC LIMIT 1)
+                FROM metric_daily
+                WHERE scope = :scope AND entity_id = :entity_id AND kpi = :kpi AND day >= :start AND day < :end
+                GROUP BY scope, entity_id, kpi""",
+                {"scope": scope, "entity_id": entity_id, "kpi": kpi, "grain": grain,
+                 "start": start, "end": period_end(start, grain)})
+
+    def record(self, scope: str, entity_id: str, metrics: Dict[str, Any], ts: Optional[datetime] = None) -> int:
+        """
+        Record numeric KPI values (raw numbers or normalize_marketing_metrics() entries) observed at ts.
+        Idempotent per KPI and day: a later observation on the same day replaces the earlier one.
+        Non-numeric values are skipped. Returns the number of KPIs recorded.
+        """
+        ts = ts or datetime.now(timezone.utc)
+        points = []
+        for kpi, value in metrics.items():
+            if isinstance(value, dict):
+                value = value.get("value")
+            try:
+                points.append((kpi, float(value)))
+            except (TypeError, ValueError):
+                continue
+        ts_text = ts.isoformat()
+        day = period_start(ts, "day")
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO metric_daily (scope, entity_id, kpi, day, ts, value) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (scope, entity_id, kpi, day) DO UPDATE SET ts = excluded.ts, value = excluded.value""",
+                [(scope, entity_id, kpi, day, ts_text, value) for kpi, value in points])
+            self._refresh_rollups([(scope, entity_id, kpi, grain, period_start(ts, grain))
+                                   for grain in GRAINS for kpi, _ in points])
+        return len(points)
+
+    def history(self, scope: str, entity_id: str, kpis: List[str], before: datetime,
+                grain: str = "month", periods: int = 3) -> Dict[str, List[float]]:
+        """
+        Per-KPI period averages for up to `periods` buckets strictly before the bucket containing `before`,
+        most recent first. One indexed range query for all KPIs.
+        """
+        if not kpis:
+            return {}
+        placeholders = ",".join("?" * len(kpis))
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT kpi, total / count FROM (
+                    SELECT kpi, total, count, ROW_NUMBER() OVER (PARTITION BY kpi ORDER BY period_start DESC) AS rn
+                    FROM metric_rollups
+                    WHERE scope = ? AND entity_id = ? AND grain = ? AND kpi IN ({placeholders})
+                      AND period_start < ?
+                ) WHERE rn <= ? ORDER BY kpi, rn""",
+                (scope, entity_id, grain, *kpis, period_start(before, grain), periods)).fetchall()
+        result: Dict[str, List[float]] = {}
+        for kpi, avg in rows:
+            result.setdefault(kpi, []).append(avg)
+        return result
+
+    def enrich(self, normalized: Dict[str, Any], scope: str, entity_id: str, as_of: Optional[datetime] = None,
+               grain: str = "month", trailing_periods: int = 3) -> Dict[str, Any]:
+        """
+        Add "last_period" (previous period with data) and "historical_benchmark" (mean of the trailing periods)
+        to normalize_marketing_metrics() output, in place. KPIs without history are left untouched.
+        """
+        as_of = as_of or datetime.now(timezone.utc)
+        history = self.history(scope, entity_id, list(normalized), as_of, grain, trailing_periods)
+        for kpi, averages in history.items():
+            meta = normalized.get(kpi)
+            if not isinstance(meta, dict):
+                continue
+            meta["last_period"] = averages[0]
+            meta["historical_benchmark"] = sum(averages) / len(averages)
+        return normalized
+
+    def close(self):
+        self._conn.close()
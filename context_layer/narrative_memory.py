@@ -21,17 +21,23 @@ class NarrativeMemory:
     - Modular: can use EmbeddingsService, or fallback to in-memory/keyword search.
     """
 
-    def __init__(self, backend=None, use_embeddings: bool = True):
+    def __init__(self, backend=None, use_embeddings: bool = True, embeddings=None):
         """
-        backend: Optional pluggable backend (e.g., Pinecone, Weaviate, FAISS, EmbeddingsService). Defaults to in-memory list or embeddings.
+        backend: Optional pluggable backend (e.g., SQLiteMemoryBackend, Pinecone, Weaviate, FAISS). Defaults to in-memory list or embeddings.
         use_embeddings: If True and EmbeddingsService available, use vector search.
+        embeddings: Optional EmbeddingsService to use (e.g., one with a HashingEmbedder for offline use).
         """
         self.backend = backend
-        self.use_embeddings = use_embeddings and EmbeddingsService is not None
-        if self.use_embeddings and backend is None:
-            self.embeddings = EmbeddingsService()
-        else:
-            self.embeddings = None
+        self.embeddings = None
+        if embeddings is not None and backend is None:
+            self.embeddings = embeddings
+        elif use_embeddings and backend is None and EmbeddingsService is not None:
+            try:
+                self.embeddings = EmbeddingsService()
+            except (ImportError, ValueError):
+                # Embedding backend not configured (e.g., no OPENAI_API_KEY): keyword search
+                self.embeddings = None
+        self.use_embeddings = self.embeddings is not None
         if backend is None:
             self._summaries: List[dict] = []
 
@@ -50,11 +56,29 @@ class NarrativeMemory:
             self.backend.add(record)
         else:
             self._summaries.append(record)
-            if self.embeddings:
+            if self.embeddings is not None:
                 # Store summary in vector DB for semantic search
                 meta = record.copy()
                 self.embeddings.add_summary(summary, metadata=meta)
 
+    def add_summaries(self, records: List[dict]):
+        """
+        Bulk add_summary() for history backfills: records are dicts with business_id, summary and optional
+        campaign, timestamp and metadata. Embeddings are generated in batches.
+        """
+        records = [{"business_id": r.get("business_id"), "summary": r["summary"], "campaign": r.get("campaign"),
+                    "timestamp": r.get("timestamp"), "metadata": r.get("metadata") or {}} for r in records]
+        if self.backend:
+            if hasattr(self.backend, "add_many"):
+                self.backend.add_many(records)
+            else:
+                for record in records:
+                    self.backend.add(record)
+            return
+        self._summaries.extend(records)
+        if self.embeddings is not None:
+            self.embeddings.add_summaries([r["summary"] for r in records], [r.copy() for r in records])
+
     def retrieve_relevant_context(self, query: str, business_id: str = None, top_k: int = 3) -> List[dict]:
         """
         Retrieve last top_k summaries relevant to the query (semantic similarity if embeddings enabled, else keyword).
@@ -62,12 +86,9 @@ class NarrativeMemory:
         """
         if self.backend:
             return self.backend.query(query, business_id=business_id, top_k=top_k)
-        if self.embeddings:
-            results = self.embeddings.search(query, top_k=top_k)
-            if business_id:
-                results = [r for r in results if r["metadata"].get(
-                    "business_id") == business_id]
-            return results[:top_k]
+        if self.embeddings is not None:
+            # Searches only this business's sub-index, so top_k is filled whenever it has enough summaries
+            return self.embeddings.search(query, top_k=top_k, business_id=business_id)
         # Fallback: keyword search
         results = []
         pattern = re.compile(re.escape(query), re.IGNORECASE)
@@ -89,7 +110,12 @@ class NarrativeMemory:
     def get_narrative(self, business_id: str) -> str:
         """
         (Legacy) Retrieve the most recent narrative for a business. Returns empty string if not found.
+        Uses the backend's indexed latest() lookup when it provides one.
         """
+        if self.backend:
+            latest = getattr(self.backend, "latest", None)
+            record = latest(business_id) if latest else None
+            return record["summary"] if record else ""
         for record in reversed(self._summaries):
             if record["business_id"] == business_id:
                 return record["summary"]
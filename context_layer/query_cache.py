@@ -0,0 +1,70 @@
+"""
+query_cache.py
+
+Bounded LRU cache with a per-entry TTL, used for query embeddings (EmbeddingsService) and search results
+(EmbeddingsService, RetrievalEngine). Result keys include the index version, so add_summary()/add_data()
+invalidate earlier results without an explicit flush; stale entries age out through the LRU bound.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))  # entries per cache; 0 disables caching
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "600"))
+
+
+class QueryCache:
+    """
+    Thread-safe LRU + TTL cache. get() returns None on a miss, so None is never stored.
+    Hit, miss, eviction and expiration counters are exposed through stats().
+    """
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE, ttl_seconds: float = QUERY_CACHE_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry[1] >= self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        if self.maxsize <= 0 or value is None:
+            return
+        with self._lock:
+            self._entries[key] = (value, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries), "evictions": self.evictions, "expirations": self.expirations}
@@ -4,10 +4,14 @@ retrieval_engine.py
 
 RetrievalEngine: The RAG (Retrieval-Augmented Generation) bridge between the semantic layer and LLM prompt.
 Accepts new marketing data, compares with stored historical summaries, and returns relevant contextual insights.
+Keyword retrieval is BM25-ranked over an inverted index maintained incrementally by add_data() (see bm25_index.py).
+Results are cached by (query, business_id, top_k, index version); add_data() bumps the version (see query_cache.py).
 Stub vector similarity logic for future embedding/vector DB integration.
 """
+import threading
 from typing import Optional, List, Dict, Any
-import re
+from .bm25_index import BM25Index
+from .query_cache import QueryCache
 
 
 class RetrievalEngine:
@@ -17,45 +21,61 @@ class RetrievalEngine:
     - Compares with stored historical summaries
     - Returns relevant contextual insights (retrieve)
     - Stub for vector similarity logic, designed for future embedding/vector DB integration
+    Safe to share across sessions: add_data() and index reads are serialized by a lock.
     """
 
-    def __init__(self, data_source: Optional[List[Dict[str, Any]]] = None, vector_backend=None):
+    def __init__(self, data_source: Optional[List[Dict[str, Any]]] = None, vector_backend=None,
+                 result_cache: Optional[QueryCache] = None):
         # data_source: in-memory list of marketing data and summaries
         self.data_source = data_source or []
         # Placeholder for Pinecone, Weaviate, FAISS, etc.
         self.vector_backend = vector_backend
+        self.index = BM25Index()
+        for doc_id, record in enumerate(self.data_source):
+            self.index.add(doc_id, record)
+        self.results = result_cache if result_cache is not None else QueryCache()
+        self.version = 0  # bumped by add_data(); part of the result cache key
+        self._lock = threading.Lock()  # guards data_source, index and version
 
     def add_data(self, record: Dict[str, Any]):
         """
         Accept new marketing data (summary, campaign result, etc.).
         If vector_backend is set, also index for similarity search.
         """
-        self.data_source.append(record)
-        if self.vector_backend:
-            # TODO: Add embedding/indexing logic here
-            self.vector_backend.add(record)
+        with self._lock:
+            # doc_id is allocated and indexed under the lock, so concurrent adds never share one
+            self.data_source.append(record)
+            self.index.add(len(self.data_source) - 1, record)
+            if self.vector_backend:
+                # TODO: Add embedding/indexing logic here
+                self.vector_backend.add(record)
+            self.version += 1
 
     def retrieve(self, new_data: str, business_id: str = None, top_k: int = 3) -> List[Dict[str, Any]]:
         """
         Compare new marketing data with stored historical summaries and return relevant contextual insights.
         - If vector_backend is set, use vector similarity (stubbed for now).
-        - Otherwise, use simple keyword/substring match as a placeholder.
+        - Otherwise, rank records by BM25 over summary, campaign and result text (newest first on ties).
         """
-        if self.vector_backend:
-            # TODO: Use vector similarity search (stub)
-            return self.vector_backend.query(new_data, business_id=business_id, top_k=top_k)
-
-        # Simple keyword/substring match for now
-        results = []
-        pattern = re.compile(re.escape(new_data), re.IGNORECASE)
-        for record in reversed(self.data_source):  # Most recent first
-            if business_id and record.get("business_id") != business_id:
-                continue
-            # Match in summary, campaign, or other text fields
-            if any(pattern.search(str(record.get(field, ""))) for field in ("summary", "campaign", "result")):
-                results.append(record)
-            if len(results) >= top_k:
-                break
-        return results
+        key = (new_data, business_id, top_k, self.version)
+        results = self.results.get(key)
+        if results is not None:
+            return list(results)
+        with self._lock:
+            key = (new_data, business_id, top_k, self.version)
+            if self.vector_backend:
+                # TODO: Use vector similarity search (stub)
+                results = self.vector_backend.query(new_data, business_id=business_id, top_k=top_k)
+            else:
+                hits = self.index.search(new_data, business_id, top_k)
+                results = [self.data_source[doc_id] for _, doc_id in hits]
+        self.results.put(key, results)
+        return list(results)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Result cache hit/miss counters (see QueryCache.stats).
+        """
+        return self.results.stats()
 
     # Additional methods for future embedding/vector DB integration can be added here
@@ -0,0 +1,124 @@
+"""
+sqlite_memory_backend.py
+
+Persistent NarrativeMemory backend on SQLite, implementing the backend add() / query() contract plus latest().
+- summaries table with a B-tree index on (business_id, timestamp) for latest-narrative lookups
+- external-content FTS5 index on summary and campaign text, kept in sync by a trigger, for keyword retrieval
+Summaries survive process restarts and both lookups stay indexed as the history grows to millions of rows.
+"""
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_phrase(query: str) -> Optional[str]:
+    """
+    FTS5 phrase query matching the query's words in order (the indexed analogue of a substring match).
+    Returns None for queries without any word characters.
+    """
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return None
+    return '"' + " ".join(tokens) + '"'
+
+
+class SQLiteMemoryBackend:
+    """
+    Records are dicts with business_id, summary, campaign, timestamp and metadata (see NarrativeMemory.add_summary).
+    Records added without a timestamp are stamped with the UTC insertion time so latest() stays index-ordered.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS summaries (
+                    id INTEGER PRIMARY KEY,
+                    business_id TEXT,
+                    summary TEXT NOT NULL,
+                    campaign TEXT,
+                    timestamp TEXT NOT NULL,
+                    metadata TEXT
+                )""")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_summaries_business_ts ON summaries (business_id, timestamp)")
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS summaries_fts USING fts5(
+                    summary, campaign, content='summaries', content_rowid='id'
+                )""")
+            self._conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS summaries_fts_insert AFTER INSERT ON summaries BEGIN
+                    INSERT INTO summaries_fts (rowid, summary, campaign) VALUES (new.id, new.summary, new.campaign);
+                END""")
+
+    def add(self, record: Dict[str, Any]) -> int:
+        return self.add_many([record])
+
+    def add_many(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Insert records in one transaction. Returns the number inserted.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [(r.get("business_id"), r.get("summary") or "", r.get("campaign"), r.get("timestamp") or now,
+                 json.dumps(r.get("metadata") or {}, default=str)) for r in records]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO summaries (business_id, summary, campaign, timestamp, metadata) VALUES (?, ?, ?, ?, ?)",
+                rows)
+        return len(rows)
+
+    def query(self, query: str, business_id: str = None, top_k: int = 3) -> List[Dict[str, Any]]:
+        """
+        Most recently added summaries whose summary or campaign text contains the query words as a phrase.
+        """
+        phrase = fts_phrase(query)
+        if phrase is None:
+            return []
+        sql = """
+            SELECT s.business_id, s.summary, s.campaign, s.timestamp, s.metadata
+            FROM summaries_fts f JOIN summaries s ON s.id = f.rowid
+            WHERE summaries_fts MATCH ?"""
+        params: List[Any] = [phrase]
+        if business_id:
+            sql += " AND s.business_id = ?"
+            params.append(business_id)
+        sql += " ORDER BY f.rowid DESC LIMIT ?"
+        params.append(top_k)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._record(row) for row in rows]
+
+    def latest(self, business_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Most recent summary for a business by timestamp (ties broken by insertion order), or None.
+        """
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT business_id, summary, campaign, timestamp, metadata FROM summaries
+                WHERE business_id IS ? ORDER BY timestamp DESC, id DESC LIMIT 1""", (business_id,)).fetchone()
+        return self._record(row) if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+    @staticmethod
+    def _record(row) -> Dict[str, Any]:
+        business_id, summary, campaign, timestamp, metadata = row
+        return {
+            "business_id": business_id,
+            "summary": summary,
+            "campaign": campaign,
+            "timestamp": timestamp,
+            "metadata": json.loads(metadata) if metadata else {},
+        }
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,48 @@
+"""
+Unit tests for the MetricHistoryStore KPI time series.
+"""
+from datetime import datetime
+from context_layer.metric_history import MetricHistoryStore, period_start
+
+
+def test_period_start():
+    ts = datetime(2026, 3, 19, 15, 30)  # a Thursday
+    assert period_start(ts, "day") == "2026-03-19"
+    assert period_start(ts, "week") == "2026-03-16"
+    assert period_start(ts, "month") == "2026-03-01"
+
+
+def test_rollups_and_enrich():
+    store = MetricHistoryStore()
+    store.record("campaign", "c1", {"CTR": 2.0, "CAC": {"value": 100.0}}, ts=datetime(2026, 1, 10))
+    store.record("campaign", "c1", {"CTR": 4.0, "CAC": {"value": "n/a"}}, ts=datetime(2026, 1, 20))
+    store.record("campaign", "c1", {"CTR": 6.0}, ts=datetime(2026, 2, 5))
+    store.record("campaign", "c2", {"CTR": 50.0}, ts=datetime(2026, 2, 5))
+    # Current-period values are excluded from the history
+    store.record("campaign", "c1", {"CTR": 99.0}, ts=datetime(2026, 3, 1))
+
+    normalized = {"CTR": {"value": 5.0}, "CAC": {"value": 90.0}, "ROAS": {"value": 3.0}}
+    store.enrich(normalized, "campaign", "c1", as_of=datetime(2026, 3, 15))
+    assert normalized["CTR"]["last_period"] == 6.0
+    assert normalized["CTR"]["historical_benchmark"] == 4.5  # mean of Feb (6.0) and Jan (3.0)
+    assert normalized["CAC"]["last_period"] == 100.0
+    assert "last_period" not in normalized["ROAS"]
+
+    daily = store.history("campaign", "c1", ["CTR"], before=datetime(2026, 3, 1), grain="day", periods=2)
+    assert daily == {"CTR": [6.0, 4.0]}
+
+
+def test_repeated_records_on_one_day_replace_each_other():
+    store = MetricHistoryStore()
+    store.record("campaign", "c1", {"CTR": 2.0}, ts=datetime(2026, 1, 10, 9))
+    # Regenerating the summary several times the same day must not weight that day more
+    for value in (3.0, 3.0, 4.0):
+        store.record("campaign", "c1", {"CTR": value}, ts=datetime(2026, 1, 12, 10))
+    store.record("campaign", "c1", {"CTR": 6.0}, ts=datetime(2026, 1, 12, 18))
+    store.record("campaign", "c1", {"CTR": 1.0}, ts=datetime(2026, 1, 31))
+
+    monthly = store.history("campaign", "c1", ["CTR"], before=datetime(2026, 2, 1))
+    assert monthly == {"CTR": [3.0]}  # mean of 2.0, 6.0 and 1.0
+    daily = store.history("campaign", "c1", ["CTR"], before=datetime(2026, 1, 13), grain="day", periods=5)
+    assert daily == {"CTR": [6.0, 2.0]}
+
@@ -29,3 +29,44 @@ def test_legacy_narrative():
     mem.add_narrative("bizX", "Legacy narrative")
     assert mem.get_narrative("bizX") == "Legacy narrative"
     assert mem.get_narrative("notfound") == ""
+
+def test_sqlite_backend(tmp_path):
+    from context_layer.sqlite_memory_backend import SQLiteMemoryBackend
+    path = str(tmp_path / "memory.db")
+    mem = NarrativeMemory(backend=SQLiteMemoryBackend(path))
+    mem.add_summary("biz1", "Q1 summary: campaign alpha won", campaign="Alpha", timestamp="2026-01-01")
+    mem.add_summary("biz1", "Q2 summary: campaign beta lost", campaign="Beta", timestamp="2026-02-01")
+    mem.add_summary("biz2", "Q1 summary: campaign gamma won", campaign="Gamma", timestamp="2026-01-15")
+    # Reopen to check persistence
+    mem = NarrativeMemory(backend=SQLiteMemoryBackend(path))
+    results = mem.retrieve_relevant_context("Alpha")
+    assert [r["campaign"] for r in results] == ["Alpha"]
+    results = mem.retrieve_relevant_context("campaign beta", business_id="biz1")
+    assert [r["campaign"] for r in results] == ["Beta"]
+    results = mem.retrieve_relevant_context("summary", business_id="biz1", top_k=3)
+    assert [r["campaign"] for r in results] == ["Beta", "Alpha"]
+    assert mem.get_narrative("biz1") == "Q2 summary: campaign beta lost"
+    assert mem.get_narrative("notfound") == ""
+
+def test_bulk_add_summaries():
+    mem = NarrativeMemory(use_embeddings=False)
+    mem.add_summaries([
+        {"business_id": "biz1", "summary": "Spring launch beat plan", "campaign": "Spring"},
+        {"business_id": "biz1", "summary": "Summer launch missed plan", "campaign": "Summer"},
+    ])
+    assert [r["campaign"] for r in mem.retrieve_relevant_context("launch", business_id="biz1")] == ["Summer", "Spring"]
+
+def test_offline_embeddings():
+    import pytest
+    pytest.importorskip("numpy")
+    pytest.importorskip("faiss")
+    from genai.embedders import HashingEmbedder
+    from genai.embeddings_service import EmbeddingsService
+    service = EmbeddingsService(embedder=HashingEmbedder(dim=256), cache=None, persist_dir="")
+    mem = NarrativeMemory(embeddings=service)
+    mem.add_summary("biz1", "Spring webinar drove record pipeline", campaign="Spring")
+    mem.add_summary("biz1", "Trade show booth traffic was low", campaign="Expo")
+    mem.add_summary("biz2", "Spring webinar drove record pipeline", campaign="Spring")
+    results = mem.retrieve_relevant_context("webinar pipeline", business_id="biz1", top_k=2)
+    assert [r["metadata"]["campaign"] for r in results] == ["Spring", "Expo"]
+    assert service.search("webinar", business_id="biz3") == []
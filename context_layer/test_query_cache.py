@@ -0,0 +1,28 @@
+"""
+Unit tests for the LRU/TTL QueryCache.
+"""
+from context_layer.query_cache import QueryCache
+
+
+def test_lru_eviction_and_ttl():
+    now = [0.0]
+    cache = QueryCache(maxsize=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", [1])
+    cache.put("b", [2])
+    assert cache.get("a") == [1]  # "b" is now least recently used
+    cache.put("c", [3])
+    assert cache.get("b") is None
+    assert cache.get("c") == [3]
+    now[0] = 10.0
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (2, 2, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert stats["size"] == 1
+
+
+def test_disabled_cache():
+    cache = QueryCache(maxsize=0)
+    cache.put("a", [1])
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -0,0 +1,48 @@
+"""
+Unit tests for RetrievalEngine BM25 keyword retrieval.
+"""
+from context_layer.retrieval_engine import RetrievalEngine
+
+
+def test_ranked_multi_word_retrieval():
+    engine = RetrievalEngine([
+        {"business_id": "biz1", "summary": "Webinar series launched", "campaign": "Webinar"},
+        {"business_id": "biz1", "summary": "Trade show booth had low traffic", "campaign": "Expo"},
+    ])
+    engine.add_data({"business_id": "biz1", "summary": "Webinar pipeline doubled; webinar attendance up",
+                     "campaign": "Webinar Q2"})
+    engine.add_data({"business_id": "biz2", "summary": "Webinar pipeline flat", "campaign": "Webinar"})
+    results = engine.retrieve("webinar pipeline", business_id="biz1", top_k=3)
+    assert [r["campaign"] for r in results] == ["Webinar Q2", "Webinar"]
+    assert engine.retrieve("booth traffic", business_id="biz1")[0]["campaign"] == "Expo"
+    assert len(engine.retrieve("webinar", top_k=5)) == 3
+    assert engine.retrieve("webinar", business_id="biz3") == []
+    assert engine.retrieve("") == []
+
+
+def test_result_cache_invalidated_by_add_data():
+    engine = RetrievalEngine([{"business_id": "biz1", "summary": "Webinar series launched", "campaign": "Webinar"}])
+    first = engine.retrieve("webinar", business_id="biz1")
+    assert engine.retrieve("webinar", business_id="biz1") == first
+    assert engine.cache_stats()["hits"] == 1
+    engine.add_data({"business_id": "biz1", "summary": "Webinar replay views up", "campaign": "Replay"})
+    assert {r["campaign"] for r in engine.retrieve("webinar", business_id="biz1")} == {"Replay", "Webinar"}
+    stats = engine.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_concurrent_add_data_keeps_doc_ids_unique():
+    import threading
+    engine = RetrievalEngine()
+    threads = [threading.Thread(target=lambda n=n: [
+        engine.add_data({"business_id": "biz1", "summary": f"thread{n} record{i}", "campaign": f"t{n}-{i}"})
+        for i in range(50)]) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(engine.data_source) == 200
+    assert engine.version == 200
+    for n in range(4):
+        for i in (0, 49):
+            assert engine.retrieve(f"thread{n} record{i}", top_k=1)[0]["campaign"] == f"t{n}-{i}"
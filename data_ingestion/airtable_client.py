@@ -0,0 +1,151 @@
+"""
+airtable_client.py
+
+Thin Airtable REST client used by the ingestion layer.
+Shares one HTTP session across worker threads, paces requests to Airtable's per-base rate limit,
+retries 429/5xx responses with exponential backoff and jitter, and records per-table load statistics.
+"""
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_ENDPOINT_URL = "https://api.airtable.com"
+# Airtable allows 5 requests per second per base
+DEFAULT_MAX_REQUESTS_PER_SECOND = 5.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class AirtableRetriesExhausted(RuntimeError):
+    """
+    A request still failed with a connection error, timeout or retryable status after max_retries retries.
+    """
+
+
+class RateLimiter:
+    """
+    Thread-safe request pacer: hands out send slots at most `rate` per second across all threads.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AirtableClient:
+    """
+    Minimal client for the Airtable list-records endpoint.
+    - One requests.Session (connection pool sized for the worker pool) is reused for every call.
+    - Every request, including retries, passes through the shared RateLimiter.
+    - stats[table_name] holds latency_s, pages, records and retries of the last fetch_all() per table.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        base_id: str,
+        endpoint_url: str = DEFAULT_ENDPOINT_URL,
+        max_requests_per_second: float = DEFAULT_MAX_REQUESTS_PER_SECOND,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 30.0,
+        pool_size: int = 8,
+    ):
+        self.base_url = f"{endpoint_url.rstrip('/')}/v0/{base_id}"
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(max_requests_per_second)
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {token}"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self._stats_lock = threading.Lock()
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Full-jitter exponential backoff; honours a Retry-After header when the server sends one.
+        """
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _get(self, url: str, params: Dict[str, Any], counters: Dict[str, int]) -> Dict[str, Any]:
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise AirtableRetriesExhausted(
+                        f"Airtable request to {url} failed after {self.max_retries} retries: {e}") from e
+                counters["retries"] += 1
+                time.sleep(self._backoff_delay(attempt))
+                continue
+            if response.status_code in RETRYABLE_STATUS:
+                if attempt == self.max_retries:
+                    raise AirtableRetriesExhausted(
+                        f"Airtable request to {url} failed after {self.max_retries} retries: "
+                        f"HTTP {response.status_code}")
+                counters["retries"] += 1
+                time.sleep(self._backoff_delay(attempt, response.headers.get("Retry-After")))
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    def iterate_pages(self, table_name: str, params: Optional[Dict[str, Any]] = None,
+                      counters: Optional[Dict[str, int]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield one list of raw records per page, following Airtable's offset cursor.
+        """
+        url = f"{self.base_url}/{requests.utils.quote(table_name, safe='')}"
+        params = dict(params or {})
+        counters = counters if counters is not None else {"retries": 0}
+        while True:
+            payload = self._get(url, params, counters)
+            yield payload.get("records", [])
+            offset = payload.get("offset")
+            if not offset:
+                return
+            params["offset"] = offset
+
+    def fetch_all(self, table_name: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch every record of a table (optionally filtered by params) and record load statistics.
+        """
+        counters = {"retries": 0}
+        records: List[Dict[str, Any]] = []
+        pages = 0
+        start = time.perf_counter()
+        for page in self.iterate_pages(table_name, params, counters):
+            records.extend(page)
+            pages += 1
+        with self._stats_lock:
+            self.stats[table_name] = {
+                "latency_s": time.perf_counter() - start,
+                "pages": pages,
+                "records": len(records),
+                "retries": counters["retries"],
+            }
+        return records
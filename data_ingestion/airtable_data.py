@@ -1,12 +1,26 @@
-from pyairtable import Table
+from concurrent.futures import ThreadPoolExecutor
 from data_models.marketing_objects import Campaign, Attendee, Response, Activity, Contact, Account, Opportunity
-from typing import List
+from data_ingestion.airtable_client import AirtableClient, DEFAULT_ENDPOINT_URL, DEFAULT_MAX_REQUESTS_PER_SECOND
+from data_ingestion.decoders import RecordDecoder, RejectsReport
+from data_ingestion.record_store import RecordStore
+from typing import Any, Dict, List, Optional, Set
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 
 # Set these as environment variables or replace directly
 API_TOKEN = os.getenv("AIRTABLE_TOKEN")
 BASE_ID = os.getenv("AIRTABLE_BASE_ID")
+# Point at a local fake (see fake_airtable.py) for offline runs and benchmarks
+ENDPOINT_URL = os.getenv("AIRTABLE_ENDPOINT_URL", DEFAULT_ENDPOINT_URL)
+MAX_WORKERS = int(os.getenv("AIRTABLE_MAX_WORKERS", "4"))
+MAX_REQUESTS_PER_SECOND = float(os.getenv("AIRTABLE_MAX_RPS", str(DEFAULT_MAX_REQUESTS_PER_SECOND)))
+# Local record store used by the incremental sync mode
+SYNC_STORE_PATH = os.getenv("AIRTABLE_SYNC_DB", "airtable_sync.db")
+# Re-request a small window before the last watermark to absorb clock skew; upserts are idempotent
+SYNC_OVERLAP_SECONDS = 60
+# Incremental syncs list record IDs to reconcile deletions at most this often per table; 0 = every sync
+SYNC_RECONCILE_SECONDS = float(os.getenv("AIRTABLE_RECONCILE_SECONDS", "3600"))
 
 if not API_TOKEN or not BASE_ID:
     raise EnvironmentError(
@@ -22,34 +36,175 @@ TABLES = {
     "Opportunities": Opportunity,
 }
 
+# Compiled once per model; pass field_map= here if Airtable column names diverge from model fields
+DECODERS = {table_name: RecordDecoder(model) for table_name, model in TABLES.items()}
 
-def load_airtable_table(table_name: str, model) -> List:
+
+_client: Optional[AirtableClient] = None
+
+
+def get_client() -> AirtableClient:
+    """Return the process-wide client so every load reuses one HTTP session and rate limiter."""
+    global _client
+    if _client is None:
+        _client = AirtableClient(API_TOKEN, BASE_ID, endpoint_url=ENDPOINT_URL,
+                                 max_requests_per_second=MAX_REQUESTS_PER_SECOND, pool_size=MAX_WORKERS)
+    return _client
+
+
+class AirtableLoadError(RuntimeError):
+    """
+    A table could not be fetched. Raised rather than returning an empty table, so DatasetCache keeps
+    serving its last good snapshot.
+    """
+
+
+def load_airtable_table(table_name: str, model, client: Optional[AirtableClient] = None,
+                        rejects: Optional[RejectsReport] = None) -> List:
     try:
-        table = Table(API_TOKEN, BASE_ID, table_name)
-        records = table.all()
+        records = (client or get_client()).fetch_all(table_name)
     except Exception as e:
-        print(f"Error loading table '{table_name}' from Airtable: {e}")
-        return []
-    objs = []
-    for rec in records:
-        fields = rec['fields']
-        for k, v in fields.items():
-            if 'date' in k.lower() and isinstance(v, str):
-                fields[k] = parse_datetime(v)
-        try:
-            objs.append(model(**fields))
-        except Exception as e:
-            print(f"Error parsing {fields} for {table_name}: {e}")
-    return objs
+        raise AirtableLoadError(f"Error loading table '{table_name}' from Airtable: {e}") from e
+    return _decoder(table_name, model).decode(records, table_name, rejects)
+
+
+def _decoder(table_name: str, model) -> RecordDecoder:
+    decoder = DECODERS.get(table_name)
+    return decoder if decoder is not None and decoder.model is model else RecordDecoder(model)
 
 
-def load_all_airtable():
-    data = {}
-    for table_name, model in TABLES.items():
-        data[table_name.lower()] = load_airtable_table(table_name, model)
+def _report_rejects(rejects: RejectsReport):
+    for table_name, counts in rejects.summary().items():
+        details = ", ".join(f"{reason} x{n}" for reason, n in counts.items())
+        print(f"Rejected {sum(counts.values())} '{table_name}' records: {details}")
+
+
+def load_all_airtable(client: Optional[AirtableClient] = None, max_workers: int = MAX_WORKERS,
+                      rejects: Optional[RejectsReport] = None) -> Dict[str, List]:
+    """
+    Load every table in TABLES concurrently through a bounded worker pool.
+    Per-table latency, page and retry counts are available afterwards in client.stats.
+    Invalid rows are collected in rejects; without one, a per-table summary is printed.
+    A table that still fails after the client's retries raises AirtableLoadError; tables not yet started
+    are cancelled, since a partial dataset is never returned.
+    """
+    client = client or get_client()
+    report = rejects if rejects is not None else RejectsReport()
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="airtable")
+    try:
+        futures = {table_name: pool.submit(load_airtable_table, table_name, model, client, report)
+                   for table_name, model in TABLES.items()}
+        data = {table_name.lower(): future.result() for table_name, future in futures.items()}
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    if rejects is None:
+        _report_rejects(report)
     return data
 
 
+def modified_since_formula(watermark: str) -> str:
+    """Airtable filterByFormula selecting records modified after the watermark (ISO8601, UTC)."""
+    return f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{watermark}'))"
+
+
+class AirtableSync:
+    """
+    Incremental sync mode: mirrors the base into a local RecordStore and keeps decoded objects in memory.
+    - The first sync of a table is a full fetch; later syncs request only records modified since the
+      stored watermark, so steady-state refreshes cost O(changes) on the wire and in decoding.
+    - Deletions are detected on the full fetch and by an ID-only listing (a single small field per record),
+      run when reconcile_deletes=True or once reconcile_seconds have passed since the table's last listing
+      in this process. Webhook-driven deletions can go straight to store.delete().
+    - The listing requests listing_fields[table] if given, else a column of a stored record that the decoder
+      maps to a model field; Airtable rejects unknown fields[] names, so no column name is assumed.
+    """
+
+    def __init__(self, store: RecordStore, client: Optional[AirtableClient] = None, max_workers: int = MAX_WORKERS,
+                 reconcile_seconds: float = SYNC_RECONCILE_SECONDS, listing_fields: Optional[Dict[str, str]] = None):
+        self.store = store
+        self.client = client or get_client()
+        self.max_workers = max_workers
+        self.reconcile_seconds = reconcile_seconds
+        self.listing_fields = listing_fields or {}
+        self._reconciled_at: Dict[str, float] = {}  # table -> time.monotonic() of its last ID listing
+        self.last_changes: Dict[str, Dict[str, int]] = {}
+        self.rejects = RejectsReport()
+        self._objects: Dict[str, Dict[str, Any]] = {}  # table -> record ID -> model instance
+
+    def sync_table(self, table_name: str, model, reconcile_deletes: bool = False) -> Dict[str, int]:
+        """
+        Pull changes for one table into the store and the in-memory objects. Fetch errors propagate
+        and leave the watermark untouched, so the next sync retries the same window.
+        """
+        started = datetime.now(timezone.utc)
+        decoder = _decoder(table_name, model)
+        objects = self._objects.get(table_name)
+        if objects is None:
+            # Decode what is already on disk once per process; no network involved
+            objects = decoder.decode_keyed(self.store.all_records(table_name), table_name)
+        watermark = self.store.get_watermark(table_name)
+        params = {"filterByFormula": modified_since_formula(watermark)} if watermark else None
+        changed = self.client.fetch_all(table_name, params)
+        self.store.upsert(table_name, changed)
+        decoded = decoder.decode_keyed(changed, table_name, self.rejects)
+        for rec in changed:
+            if rec["id"] in decoded:
+                objects[rec["id"]] = decoded[rec["id"]]
+            else:
+                objects.pop(rec["id"], None)
+        deleted: List[str] = []
+        last_reconciled = self._reconciled_at.get(table_name)
+        if last_reconciled is None or time.monotonic() - last_reconciled >= self.reconcile_seconds:
+            reconcile_deletes = True
+        if watermark is None or reconcile_deletes:
+            if watermark is None:
+                live_ids = {rec["id"] for rec in changed}
+            else:
+                live_ids = self._live_ids(table_name, decoder)
+            deleted = self.store.delete_missing(table_name, live_ids)
+            for rid in deleted:
+                objects.pop(rid, None)
+            self._reconciled_at[table_name] = time.monotonic()
+        self.store.set_watermark(
+            table_name, (started - timedelta(seconds=SYNC_OVERLAP_SECONDS)).strftime("%Y-%m-%dT%H:%M:%S.000Z"))
+        self._objects[table_name] = objects
+        return {"upserted": len(changed), "deleted": len(deleted)}
+
+    def _live_ids(self, table_name: str, decoder: RecordDecoder) -> Set[str]:
+        column = self.listing_fields.get(table_name) or decoder.known_column(self.store.field_names(table_name))
+        if column is None and not self.store.count(table_name):
+            return set()  # nothing stored, nothing to delete
+        # Without a known column, fall back to listing full records
+        params = {"fields[]": column} if column else None
+        return {rec["id"] for rec in self.client.fetch_all(table_name, params)}
+
+    def sync_all(self, reconcile_deletes: bool = False) -> Dict[str, List]:
+        """
+        Sync every table in TABLES concurrently and return data in the same shape as load_all_airtable().
+        Rows rejected by the decoders during this sync are available in self.rejects.
+        """
+        self.rejects = RejectsReport()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="airtable-sync") as pool:
+            futures = {table_name: pool.submit(self.sync_table, table_name, model, reconcile_deletes)
+                       for table_name, model in TABLES.items()}
+            self.last_changes = {table_name: future.result() for table_name, future in futures.items()}
+        _report_rejects(self.rejects)
+        return {table_name.lower(): list(self._objects[table_name].values()) for table_name in TABLES}
+
+
+_sync: Optional[AirtableSync] = None
+
+
+def load_all_airtable_incremental(reconcile_deletes: bool = False) -> Dict[str, List]:
+    """
+    Drop-in alternative to load_all_airtable() backed by the process-wide AirtableSync and SYNC_STORE_PATH.
+    """
+    global _sync
+    if _sync is None:
+        _sync = AirtableSync(RecordStore(SYNC_STORE_PATH))
+    return _sync.sync_all(reconcile_deletes=reconcile_deletes)
+
+
 def parse_datetime(dt_str):
     """Parse ISO8601 or common date formats from Airtable fields."""
     try:
@@ -67,3 +222,5 @@ if __name__ == "__main__":
     all_data = load_all_airtable()
     for k, v in all_data.items():
         print(f"Loaded {len(v)} records for {k}")
+    for table_name, stats in get_client().stats.items():
+        print(f"{table_name}: {stats['latency_s']:.2f}s, {stats['pages']} pages, {stats['retries']} retries")
@@ -0,0 +1,120 @@
+"""
+data_cache.py
+
+Process-wide cache for the ingested marketing dataset.
+Serves the last good snapshot immediately and refreshes it in a background thread once it is older than the TTL,
+so UI reruns never wait on a full Airtable crawl.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class DataSnapshot:
+    """
+    Immutable view of one successful load: the data dict, when it was loaded, and a monotonically increasing version.
+    """
+
+    def __init__(self, data: Dict[str, Any], loaded_at: float, version: int):
+        self.data = data
+        self.loaded_at = loaded_at
+        self.version = version
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.loaded_at
+
+
+class DatasetCache:
+    """
+    Stale-while-revalidate cache around a dataset loader (e.g., load_all_airtable).
+    - The first get() loads synchronously; later calls always return the current snapshot.
+    - Once the snapshot is older than ttl_seconds, a single background refresh is started.
+    - A failed refresh keeps the last good snapshot and records the error in last_error.
+    - warm_start, if given, may return (data, loaded_at) from a local snapshot to serve the first get()
+      without calling the loader; the snapshot's real age then decides when the first refresh happens.
+    - on_load, if given, is called with the data after each successful loader call (e.g., to persist it).
+    """
+
+    def __init__(self, loader: Callable[[], Dict[str, Any]], ttl_seconds: float = 900,
+                 warm_start: Optional[Callable[[], Optional[Tuple[Dict[str, Any], float]]]] = None,
+                 on_load: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.warm_start = warm_start
+        self.on_load = on_load
+        self.last_error: Optional[Exception] = None
+        self._snapshot: Optional[DataSnapshot] = None
+        self._version = 0
+        self._load_lock = threading.Lock()  # serializes loader calls
+        self._state_lock = threading.Lock()  # guards the background thread handle
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @property
+    def snapshot(self) -> Optional[DataSnapshot]:
+        return self._snapshot
+
+    @property
+    def is_refreshing(self) -> bool:
+        thread = self._refresh_thread
+        return thread is not None and thread.is_alive()
+
+    def get(self) -> DataSnapshot:
+        """
+        Return the current snapshot, loading it on first use and scheduling a background refresh when stale.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._load_lock:
+                if self._snapshot is None:
+                    warm = self.warm_start() if self.warm_start else None
+                    if warm is not None:
+                        self._swap(*warm)
+                    else:
+                        self._load()
+            snapshot = self._snapshot
+        if snapshot.age_seconds >= self.ttl_seconds:
+            self.refresh_async()
+        return snapshot
+
+    def refresh(self) -> DataSnapshot:
+        """
+        Reload synchronously and swap in the new snapshot. Loader errors propagate to the caller.
+        """
+        with self._load_lock:
+            return self._load()
+
+    def refresh_async(self) -> bool:
+        """
+        Start a background refresh unless one is already running. Returns True if a refresh was started.
+        """
+        with self._state_lock:
+            if self.is_refreshing:
+                return False
+            self._refresh_thread = threading.Thread(
+                target=self._background_refresh, name="dataset-refresh", daemon=True)
+            self._refresh_thread.start()
+        return True
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            self.last_error = e
+            print(f"Background data refresh failed, serving previous snapshot: {e}")
+
+    def _load(self) -> DataSnapshot:
+        data = self.loader()
+        snapshot = self._swap(data, time.time())
+        self.last_error = None
+        if self.on_load:
+            try:
+                self.on_load(data)
+            except Exception as e:
+                print(f"Dataset on_load hook failed: {e}")
+        return snapshot
+
+    def _swap(self, data: Dict[str, Any], loaded_at: float) -> DataSnapshot:
+        self._version += 1
+        self._snapshot = DataSnapshot(data, loaded_at=loaded_at, version=self._version)
+        return self._snapshot
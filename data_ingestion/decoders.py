@@ -0,0 +1,205 @@
+"""
+decoders.py
+
+Record decoders for raw Airtable payloads, compiled once per model from its field annotations.
+A decoder knows which fields are datetimes, numbers, booleans or optional, maps Airtable column names
+("Campaign ID", "Start Date") to model fields, parses datetime columns in one pass with a fixed ISO format,
+and collects invalid rows into a RejectsReport instead of printing each failure.
+Rows that pass the decoder's checks (including a cheap per-field type check) are built without a second
+pydantic validation pass; rows that fail the type check go through full model validation instead.
+"""
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from data_models.field_specs import field_specs
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_TRUE = {"true", "yes", "y", "1", "checked"}
+_FALSE = {"false", "no", "n", "0", ""}
+
+
+def normalize_column_name(name: str) -> str:
+    """'Campaign ID' -> 'campaign_id', 'Start Date' -> 'start_date'."""
+    return _NON_ALNUM.sub("_", name.strip().lower()).strip("_")
+
+
+class RejectsReport:
+    """
+    Structured collection of rows that failed decoding: one entry per (table, record ID, field, error).
+    """
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+
+    def add(self, table_name: str, record_id: Optional[str], field: str, error: str):
+        self.rows.append({"table": table_name, "record_id": record_id, "field": field, "error": error})
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """
+        Reject counts per table and field, e.g. {"Campaigns": {"start_date: invalid datetime": 3}}.
+        """
+        counts: Dict[str, Counter] = {}
+        for row in self.rows:
+            counts.setdefault(row["table"], Counter())[f"{row['field']}: {row['error']}"] += 1
+        return {table: dict(counter) for table, counter in counts.items()}
+
+
+def _parse_datetime_column(values: List[Any]) -> List[Any]:
+    """
+    Parse one column of Airtable date/dateTime strings ('2026-01-31' or '2026-01-31T09:00:00.000Z').
+    Repeated values are parsed once; unparseable values come back as None.
+    """
+    parsed: Dict[str, Optional[datetime]] = {}
+    out = []
+    for value in values:
+        if value is None or isinstance(value, datetime):
+            out.append(value)
+            continue
+        result = parsed.get(value, False)
+        if result is False:
+            try:
+                # datetime.fromisoformat() only accepts a trailing 'Z' from Python 3.11
+                result = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+            except (TypeError, ValueError):
+                result = None
+            parsed[value] = result
+        out.append(result)
+    return out
+
+
+def parse_bool(value: Any) -> Optional[bool]:
+    """
+    Airtable checkbox / yes-no value -> bool: True/False, 1/0, or strings like 'true', 'No', 'checked'.
+    Returns None for anything else.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+    return None
+
+
+class RecordDecoder:
+    """
+    Decoder for one model, compiled once. field_map overrides the automatic column-name normalization
+    (Airtable column -> model field).
+    """
+
+    def __init__(self, model, field_map: Optional[Dict[str, str]] = None):
+        self.model = model
+        self.specs = field_specs(model)
+        self.field_names = [spec.name for spec in self.specs]
+        self.required = [spec.name for spec in self.specs if not spec.optional]
+        self.datetime_fields = [spec.name for spec in self.specs if spec.type is datetime]
+        self.float_fields = [spec.name for spec in self.specs if spec.type is float]
+        self.bool_fields = [spec.name for spec in self.specs if spec.type is bool]
+        # Fields whose values are used as-is, so they need a type check before construct()
+        self.checked_fields = [(spec.name, spec.type) for spec in self.specs if spec.type in (str, int)]
+        self._columns: Dict[str, Optional[str]] = {name: name for name in self.field_names}
+        self._columns.update(field_map or {})
+
+    def column_to_field(self, column: str) -> Optional[str]:
+        # Memoized: each distinct Airtable column name is normalized once per decoder
+        try:
+            return self._columns[column]
+        except KeyError:
+            field = normalize_column_name(column)
+            self._columns[column] = field if field in self.field_names else None
+            return self._columns[column]
+
+    def known_column(self, columns: Iterable[str]) -> Optional[str]:
+        """
+        First of the given Airtable columns that maps to a model field, preferring required fields.
+        """
+        mapped = [(column, self.column_to_field(column)) for column in columns]
+        mapped = [(column, field) for column, field in mapped if field is not None]
+        required = [column for column, field in mapped if field in self.required]
+        return (required or [column for column, _ in mapped] or [None])[0]
+
+    def _map_fields(self, rec: Dict[str, Any]) -> Dict[str, Any]:
+        row = {}
+        for column, value in rec.get("fields", {}).items():
+            field = self.column_to_field(column)
+            if field is None:
+                continue
+            # Linked-record and lookup fields arrive as single-element lists
+            if isinstance(value, list) and len(value) == 1:
+                value = value[0]
+            row[field] = value
+        row.setdefault("id", rec.get("id"))
+        return row
+
+    def decode_keyed(self, records: List[Dict[str, Any]], table_name: str = "",
+                     rejects: Optional[RejectsReport] = None) -> Dict[str, Any]:
+        """
+        Decode raw records into {record ID: model instance}, skipping (and reporting) invalid rows.
+        """
+        rows = [self._map_fields(rec) for rec in records]
+        bad = [None] * len(rows)  # first failure per row: (field, error)
+        for field in self.datetime_fields:
+            raw = [row.get(field) for row in rows]
+            for i, (value, parsed) in enumerate(zip(raw, _parse_datetime_column(raw))):
+                if value is not None and parsed is None and bad[i] is None:
+                    bad[i] = (field, "invalid datetime")
+                rows[i][field] = parsed
+        for field in self.float_fields:
+            for i, row in enumerate(rows):
+                value = row.get(field)
+                if value is None or isinstance(value, float):
+                    continue
+                try:
+                    row[field] = float(value)
+                except (TypeError, ValueError):
+                    bad[i] = bad[i] or (field, "invalid number")
+        for field in self.bool_fields:
+            for i, row in enumerate(rows):
+                value = row.get(field)
+                if value is None:
+                    continue
+                row[field] = parse_bool(value)
+                if row[field] is None:
+                    bad[i] = bad[i] or (field, "invalid boolean")
+        objs = {}
+        construct = self.model.construct
+        for i, (rec, row) in enumerate(zip(records, rows)):
+            if bad[i] is None:
+                missing = next((f for f in self.required if row.get(f) is None), None)
+                if missing:
+                    bad[i] = (missing, "missing required field")
+            if bad[i] is not None:
+                if rejects is not None:
+                    rejects.add(table_name, rec.get("id"), *bad[i])
+                continue
+            values = {name: row.get(name) for name in self.field_names}
+            if self._first_type_error(values) is None:
+                objs[rec.get("id")] = construct(**values)
+                continue
+            # Unexpected types (e.g. a number in a text field, a multi-record link): full validation
+            try:
+                objs[rec.get("id")] = self.model(**values)
+            except (TypeError, ValueError) as e:
+                if rejects is not None:
+                    field = self._first_type_error(values)
+                    rejects.add(table_name, rec.get("id"), field, f"invalid type: {e}".splitlines()[0])
+        return objs
+
+    def _first_type_error(self, values: Dict[str, Any]) -> Optional[str]:
+        for name, expected in self.checked_fields:
+            value = values[name]
+            if value is not None and type(value) is not expected:
+                return name
+        return None
+
+    def decode(self, records: List[Dict[str, Any]], table_name: str = "",
+               rejects: Optional[RejectsReport] = None) -> List[Any]:
+        return list(self.decode_keyed(records, table_name, rejects).values())
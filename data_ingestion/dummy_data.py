@@ -9,7 +9,8 @@ from faker import Faker
 faker = Faker()
 Faker.seed(42)
 
-# Dummy data generation utilities
+# Dummy data generation utilities (small, object-based).
+# For production-scale columnar datasets see synthetic_scale.py.
 
 
 def random_date(start, end):
@@ -80,14 +81,15 @@ def generate_attendees(campaigns: List[Campaign], contacts: List[Contact], n=40)
 def generate_responses(attendees: List[Attendee], campaigns: List[Campaign], n=80) -> List[Response]:
     response_types = ["registered", "attended",
                       "no-show", "interested", "declined", "waitlisted"]
+    # Draw the attendee first so the response points at the campaign that attendee registered for
     return [
         Response(
             id=str(uuid.uuid4()),
-            attendee_id=random.choice(attendees).id,
-            campaign_id=random.choice(campaigns).id,
+            attendee_id=attendee.id,
+            campaign_id=attendee.campaign_id,
             response_type=random.choice(response_types),
             timestamp=datetime.now() - timedelta(days=random.randint(0, 30))
-        ) for _ in range(n)
+        ) for attendee in (random.choice(attendees) for _ in range(n))
     ]
 
 
@@ -97,11 +99,11 @@ def generate_activities(attendees: List[Attendee], campaigns: List[Campaign], n=
     return [
         Activity(
             id=str(uuid.uuid4()),
-            campaign_id=random.choice(campaigns).id,
-            attendee_id=random.choice(attendees).id,
+            campaign_id=attendee.campaign_id,
+            attendee_id=attendee.id,
             type=random.choice(activity_types),
             timestamp=datetime.now() - timedelta(days=random.randint(0, 30))
-        ) for _ in range(n)
+        ) for attendee in (random.choice(attendees) for _ in range(n))
     ]
 
 
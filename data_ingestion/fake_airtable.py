@@ -0,0 +1,260 @@
+"""
+fake_airtable.py
+
+Offline stand-in for the Airtable list-records endpoint, for tests and benchmarks without network access.
+Serves paginated records over HTTP with configurable per-request latency and Airtable's per-base rate limit
+(excess requests get a 429), so concurrency, pacing and retries behave as they would against the real API.
+Understands the subset of query parameters the ingestion layer sends: offset, pageSize, fields[] and the
+LAST_MODIFIED_TIME() filter formula used by incremental sync. Like the real API, a fields[] name that is not
+a column of the table gets a 422 UNKNOWN_FIELD_NAME.
+
+Run as a script to benchmark sequential vs concurrent load_all_airtable():
+    python -m data_ingestion.fake_airtable --records 2000 --latency 0.4
+    python -m data_ingestion.fake_airtable --snapshot snapshots/latest   # replay a captured dataset
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import parse_qs, unquote, urlparse
+
+PAGE_SIZE = 100
+_MODIFIED_SINCE = re.compile(r"IS_AFTER\(LAST_MODIFIED_TIME\(\), DATETIME_PARSE\('([^']+)'\)\)")
+
+
+class FakeAirtableServer:
+    """
+    In-process HTTP server exposing GET /v0/{base_id}/{table_name} with offset pagination.
+    tables maps table name -> list of Airtable-shaped records ({"id", "createdTime", "fields"}).
+    columns maps table name -> its column names; by default every field name seen on a table's records.
+    """
+
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]], latency: float = 0.0,
+                 max_requests_per_second: float = 5.0, page_size: int = PAGE_SIZE,
+                 columns: Optional[Dict[str, Set[str]]] = None):
+        self.tables = tables
+        self.columns: Dict[str, Set[str]] = {name: set(cols) for name, cols in (columns or {}).items()}
+        for name, rows in tables.items():
+            if columns is None or name not in columns:
+                self.columns[name] = {field for rec in rows for field in rec["fields"]}
+        # (table, record ID) -> last modified time; defaults to createdTime
+        self.modified: Dict[tuple, datetime] = {
+            (name, rec["id"]): _parse_time(rec["createdTime"]) for name, rows in tables.items() for rec in rows}
+        self.latency = latency
+        self.max_requests_per_second = max_requests_per_second
+        self.page_size = page_size
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def endpoint_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeAirtableServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-airtable", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def upsert_record(self, table_name: str, fields: Dict[str, Any], record_id: Optional[str] = None):
+        """Create or modify a record (ID from record_id or fields["id"]), bumping its last-modified time."""
+        now = datetime.now(timezone.utc)
+        record_id = record_id or fields["id"]
+        rows = self.tables.setdefault(table_name, [])
+        self.columns.setdefault(table_name, set()).update(fields)
+        for rec in rows:
+            if rec["id"] == record_id:
+                rec["fields"] = fields
+                break
+        else:
+            rows.append(_record(fields, now, record_id))
+        self.modified[(table_name, record_id)] = now
+
+    def delete_record(self, table_name: str, record_id: str):
+        self.tables[table_name] = [rec for rec in self.tables[table_name] if rec["id"] != record_id]
+        self.modified.pop((table_name, record_id), None)
+
+    def _select(self, table_name: str, query: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        records = self.tables[table_name]
+        formula = query.get("filterByFormula", [""])[0]
+        match = _MODIFIED_SINCE.fullmatch(formula)
+        if match:
+            since = _parse_time(match.group(1))
+            records = [rec for rec in records if self.modified[(table_name, rec["id"])] > since]
+        if "fields[]" in query:
+            keep = set(query["fields[]"])
+            records = [{**rec, "fields": {k: v for k, v in rec["fields"].items() if k in keep}} for rec in records]
+        return records
+
+    def _admit(self) -> bool:
+        """Sliding one-second window per base, like Airtable's limit."""
+        with self._lock:
+            self.request_count += 1
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if self.max_requests_per_second and len(self._recent) >= self.max_requests_per_second:
+                self.rate_limited_count += 1
+                return False
+            self._recent.append(now)
+            return True
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                parts = url.path.strip("/").split("/")
+                if len(parts) != 3 or parts[0] != "v0":
+                    return self._send(404, {"error": "NOT_FOUND"})
+                if not server._admit():
+                    return self._send(429, {"error": {"type": "RATE_LIMIT_REACHED"}})
+                if server.latency:
+                    time.sleep(server.latency)
+                table_name = unquote(parts[2])
+                if table_name not in server.tables:
+                    return self._send(404, {"error": "TABLE_NOT_FOUND"})
+                query = parse_qs(url.query)
+                unknown = [name for name in query.get("fields[]", []) if name not in server.columns[table_name]]
+                if unknown:
+                    return self._send(422, {"error": {"type": "UNKNOWN_FIELD_NAME",
+                                                      "message": f'Unknown field name: "{unknown[0]}"'}})
+                records = server._select(table_name, query)
+                start = int(query.get("offset", ["0"])[0])
+                page_size = int(query.get("pageSize", [server.page_size])[0])
+                payload = {"records": records[start:start + page_size]}
+                if start + page_size < len(records):
+                    payload["offset"] = str(start + page_size)
+                self._send(200, payload)
+
+            def _send(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _record(fields: Dict[str, Any], created: datetime, record_id: Optional[str] = None) -> Dict[str, Any]:
+    created = created if created.tzinfo else created.replace(tzinfo=timezone.utc)
+    return {"id": record_id or fields["id"], "createdTime": created.strftime("%Y-%m-%dT%H:%M:%S.000Z"), "fields": fields}
+
+
+def generate_fake_tables(n_records: int = 1000, seed: int = 42) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Build Airtable-shaped payloads for every table in TABLES, n_records per table, with valid foreign keys.
+    """
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1)
+    ids = {name: [f"{name[:3].lower()}{i:07d}" for i in range(n_records)] for name in (
+        "Campaigns", "Accounts", "Contacts", "Attendees", "Responses", "Activities", "Opportunities")}
+    day = lambda: (now - timedelta(days=rng.randint(0, 365))).strftime("%Y-%m-%d")
+    stamp = lambda: (now - timedelta(seconds=rng.randint(0, 86400 * 365))).isoformat() + "Z"
+    tables = {
+        "Campaigns": [{"id": i, "name": f"Campaign {i}", "start_date": day(), "end_date": day(),
+                       "description": "Synthetic campaign"} for i in ids["Campaigns"]],
+        "Accounts": [{"id": i, "name": f"Account {i}", "industry": rng.choice(["Tech", "Retail", "Finance"]),
+                      "region": rng.choice(["NA", "EMEA", "APAC"])} for i in ids["Accounts"]],
+        "Contacts": [{"id": i, "name": f"Contact {i}", "email": f"{i}@example.com", "lead": rng.random() < 0.5,
+                      "account_id": rng.choice(ids["Accounts"])} for i in ids["Contacts"]],
+        "Attendees": [{"id": i, "name": f"Contact {c}", "email": f"{c}@example.com",
+                       "campaign_id": rng.choice(ids["Campaigns"]), "account_id": rng.choice(ids["Accounts"])}
+                      for i, c in zip(ids["Attendees"], ids["Contacts"])],
+    }
+    attendee_campaign = {a["id"]: a["campaign_id"] for a in tables["Attendees"]}
+    tables["Responses"] = []
+    tables["Activities"] = []
+    for rid, aid in zip(ids["Responses"], ids["Activities"]):
+        attendee = rng.choice(ids["Attendees"])
+        tables["Responses"].append({"id": rid, "attendee_id": attendee, "campaign_id": attendee_campaign[attendee],
+                                    "response_type": rng.choice(["registered", "attended", "no-show"]),
+                                    "timestamp": stamp()})
+        attendee = rng.choice(ids["Attendees"])
+        tables["Activities"].append({"id": aid, "attendee_id": attendee, "campaign_id": attendee_campaign[attendee],
+                                     "type": rng.choice(["email_open", "click", "meeting"]), "timestamp": stamp()})
+    tables["Opportunities"] = [{"id": i, "account_id": rng.choice(ids["Accounts"]),
+                                "campaign_id": rng.choice(ids["Campaigns"]),
+                                "amount": round(rng.uniform(5000, 250000), 2),
+                                "stage": rng.choice(["Open", "Closed Won", "Closed Lost"]), "close_date": day()}
+                               for i in ids["Opportunities"]]
+    return {name: [_record(fields, now) for fields in rows] for name, rows in tables.items()}
+
+
+def tables_from_snapshot(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Replay a columnar snapshot (see snapshot.py) as Airtable-shaped payloads keyed by Airtable table name.
+    """
+    from data_ingestion.snapshot import read_snapshot_tables
+    tables = {}
+    for name, table in read_snapshot_tables(path).items():
+        rows = []
+        for row in table.to_pylist():
+            fields = {k: (v.strftime("%Y-%m-%dT%H:%M:%S.000Z") if isinstance(v, datetime) else v)
+                      for k, v in row.items() if v is not None}
+            rows.append(_record(fields, datetime(2026, 1, 1)))
+        tables[name.capitalize()] = rows
+    return tables
+
+
+def _benchmark(tables: Dict[str, List[Dict[str, Any]]], latency: float, max_workers: int):
+    with FakeAirtableServer(tables, latency=latency) as server:
+        os.environ.setdefault("AIRTABLE_TOKEN", "fake-token")
+        os.environ.setdefault("AIRTABLE_BASE_ID", "appFAKE")
+        from data_ingestion.airtable_data import load_all_airtable, BASE_ID, TABLES
+        from data_ingestion.airtable_client import AirtableClient
+        for workers in (1, max_workers):
+            client = AirtableClient("fake-token", BASE_ID, endpoint_url=server.endpoint_url, pool_size=workers)
+            start = time.perf_counter()
+            data = load_all_airtable(client=client, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            total = sum(len(v) for v in data.values())
+            retries = sum(s["retries"] for s in client.stats.values())
+            print(f"workers={workers}: {elapsed:.2f}s for {total} records across {len(TABLES)} tables "
+                  f"({retries} retries)")
+            for table_name, stats in client.stats.items():
+                print(f"  {table_name:<14} {stats['latency_s']:6.2f}s  {stats['pages']:3d} pages")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Airtable loading against a local fake endpoint.")
+    parser.add_argument("--records", type=int, default=1000, help="records per table")
+    parser.add_argument("--latency", type=float, default=0.4, help="seconds of simulated latency per request")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--snapshot", help="serve a columnar snapshot directory instead of generated records")
+    args = parser.parse_args()
+    tables = tables_from_snapshot(args.snapshot) if args.snapshot else generate_fake_tables(args.records)
+    _benchmark(tables, args.latency, args.workers)
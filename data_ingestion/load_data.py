@@ -1,21 +1,65 @@
 import pandas as pd
 from data_models.marketing_objects import Campaign, Attendee, Response, Activity, Contact, Account, Opportunity
-from typing import List, Type, TypeVar
+from data_models.field_specs import field_specs
+from datetime import datetime
+from typing import Iterator, List, Type, TypeVar
 import os
+try:
+    from pydantic import TypeAdapter
+except ImportError:  # pydantic v1
+    TypeAdapter = None
+    from pydantic import parse_obj_as
 
 T = TypeVar('T')
 
+DEFAULT_CHUNK_SIZE = 50_000
 
-def load_from_csv(file_path: str, model: Type[T]) -> List[T]:
-    df = pd.read_csv(file_path)
-    # Convert NaN to None and floats to str for optional string fields
 
-    def clean_row(row):
-        return {k: (str(v) if isinstance(v, float) and not pd.isna(v) and k in ["region", "industry", "description"] else (None if pd.isna(v) else v)) for k, v in row.items()}
-    return [model(**clean_row(row)) for row in df.to_dict(orient='records')]
+def _clean_chunk(df: pd.DataFrame, model) -> List[dict]:
+    # Column-wise typing instead of a per-row clean_row: dates and numbers are converted once per column,
+    # and NaN/NaT become None in a single masked pass
+    for spec in field_specs(model):
+        if spec.name not in df.columns:
+            continue
+        if spec.type is datetime:
+            df[spec.name] = pd.to_datetime(df[spec.name], errors="coerce")
+        elif spec.type in (int, float):
+            df[spec.name] = pd.to_numeric(df[spec.name], errors="coerce")
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict(orient='records')
+
+
+def _validator(model):
+    if TypeAdapter is not None:
+        return TypeAdapter(List[model]).validate_python
+    return lambda records: parse_obj_as(List[model], records)
+
+
+def iter_csv_batches(file_path: str, model: Type[T], chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[T]]:
+    """
+    Stream a CSV as batches of validated models, reading at most `chunksize` rows at a time,
+    so memory stays flat regardless of file size. Raises pydantic.ValidationError on the first invalid batch.
+    """
+    specs = field_specs(model)
+    names = {spec.name for spec in specs}
+    # Read string fields as text so e.g. numeric-looking regions are not parsed into floats
+    dtypes = {spec.name: str for spec in specs if spec.type is str}
+    validate = _validator(model)
+    reader = pd.read_csv(file_path, chunksize=chunksize, usecols=lambda c: c in names, dtype=dtypes)
+    for chunk in reader:
+        yield validate(_clean_chunk(chunk, model))
+
+
+def load_from_csv(file_path: str, model: Type[T]) -> List[T]:
+    objs: List[T] = []
+    for batch in iter_csv_batches(file_path, model):
+        objs.extend(batch)
+    return objs
 
 # Example usage:
 # campaigns = load_from_csv('dummy_output/campaigns.csv', Campaign)
 # accounts = load_from_csv('dummy_output/accounts.csv', Account)
+# for batch in iter_csv_batches('exports/activities.csv', Activity, chunksize=100_000):
+#     process(batch)
 
 # Add similar functions for JSON if needed
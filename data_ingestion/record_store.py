@@ -0,0 +1,111 @@
+"""
+record_store.py
+
+Local SQLite store of raw Airtable records keyed by (table, record ID), plus a per-table sync watermark.
+Backs the incremental sync mode in airtable_data.py: each refresh only upserts changed records and applies deletions.
+"""
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+class RecordStore:
+    """
+    SQLite-backed record store. Safe to share across the ingestion worker threads.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS records (
+                    table_name TEXT NOT NULL,
+                    record_id TEXT NOT NULL,
+                    created_time TEXT,
+                    fields TEXT NOT NULL,
+                    PRIMARY KEY (table_name, record_id)
+                ) WITHOUT ROWID""")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    table_name TEXT PRIMARY KEY,
+                    watermark TEXT NOT NULL
+                )""")
+
+    def upsert(self, table_name: str, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or replace raw Airtable records ({"id", "createdTime", "fields"}). Returns the number written.
+        """
+        rows = [(table_name, rec["id"], rec.get("createdTime"), json.dumps(rec.get("fields", {})))
+                for rec in records]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records (table_name, record_id, created_time, fields) VALUES (?, ?, ?, ?)",
+                rows)
+        return len(rows)
+
+    def delete(self, table_name: str, record_ids: Iterable[str]) -> int:
+        """
+        Delete records by ID (e.g., from a webhook payload). Returns the number removed.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM records WHERE table_name = ? AND record_id = ?",
+                [(table_name, rid) for rid in record_ids])
+            return cursor.rowcount
+
+    def delete_missing(self, table_name: str, live_ids: Set[str]) -> List[str]:
+        """
+        Remove every stored record of the table whose ID is not in live_ids. Returns the removed IDs.
+        """
+        stale = [rid for rid in self.record_ids(table_name) if rid not in live_ids]
+        if stale:
+            self.delete(table_name, stale)
+        return stale
+
+    def record_ids(self, table_name: str) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record_id FROM records WHERE table_name = ?", (table_name,)).fetchall()
+        return {row[0] for row in rows}
+
+    def all_records(self, table_name: str) -> List[Dict[str, Any]]:
+        """
+        Return stored records of a table in Airtable's raw shape.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record_id, created_time, fields FROM records WHERE table_name = ?",
+                (table_name,)).fetchall()
+        return [{"id": rid, "createdTime": created, "fields": json.loads(fields)} for rid, created, fields in rows]
+
+    def field_names(self, table_name: str) -> List[str]:
+        """
+        Airtable column names present on one stored record of the table (empty if the table has none).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fields FROM records WHERE table_name = ? LIMIT 1", (table_name,)).fetchone()
+        return list(json.loads(row[0])) if row else []
+
+    def count(self, table_name: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM records WHERE table_name = ?", (table_name,)).fetchone()[0]
+
+    def get_watermark(self, table_name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark FROM sync_state WHERE table_name = ?", (table_name,)).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, table_name: str, watermark: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (table_name, watermark) VALUES (?, ?)", (table_name, watermark))
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,228 @@
+"""
+snapshot.py
+
+On-disk columnar snapshot of the ingested dataset: one Arrow IPC file per model plus a manifest.json
+carrying the schema version, generation, per-table row counts and SHA-256 hashes, and an overall content hash.
+Each write goes to new generation-suffixed files and becomes visible only when the manifest is swapped in,
+so a crash mid-write leaves the previous snapshot intact.
+Arrow IPC files are memory-mapped on read, so a cold start costs a page-in rather than seven API crawls.
+The same format is used for offline replay (see fake_airtable.py) and by the large-scale generators.
+
+Datetimes are stored as UTC microsecond timestamps (timestamp[us, tz=UTC]); naive datetimes are taken as UTC
+and values are read back timezone-aware.
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import pyarrow as pa
+from data_models.field_specs import field_specs
+from data_models.event_table import EventTable, StringDictionary
+from data_models.marketing_objects import Campaign, Attendee, Response, Activity, Contact, Account, Opportunity
+
+SCHEMA_VERSION = 2  # 2: timezone-aware timestamps, generation-suffixed table files
+MANIFEST_NAME = "manifest.json"
+DEFAULT_BATCH_SIZE = 65536
+
+# Same keys as load_all_airtable() output
+SNAPSHOT_MODELS = {
+    "campaigns": Campaign,
+    "accounts": Account,
+    "contacts": Contact,
+    "attendees": Attendee,
+    "responses": Response,
+    "activities": Activity,
+    "opportunities": Opportunity,
+}
+
+_ARROW_TYPES = {
+    str: pa.string(),
+    int: pa.int64(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    datetime: pa.timestamp("us", tz="UTC"),
+}
+
+
+def arrow_schema(model) -> pa.Schema:
+    """
+    Arrow schema for a marketing model, derived from its field annotations.
+    """
+    return pa.schema([pa.field(spec.name, _ARROW_TYPES[spec.type], nullable=spec.optional)
+                      for spec in field_specs(model)])
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _model_batches(objs: List[Any], model, schema: pa.Schema, batch_size: int) -> Iterable[pa.RecordBatch]:
+    names = [spec.name for spec in field_specs(model)]
+    for start in range(0, len(objs), batch_size):
+        chunk = objs[start:start + batch_size]
+        columns = {name: [getattr(o, name) for o in chunk] for name in names}
+        yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def _read_manifest_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(path, MANIFEST_NAME), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class SnapshotWriter:
+    """
+    Streams record batches into a snapshot directory, one table at a time, then writes the manifest on close().
+    Batches may be pyarrow RecordBatches or dicts of column name -> array-like matching the model schema.
+    Tables are written to <name>-<generation>.arrow; close() swaps the manifest in and then deletes table files
+    referenced by neither the new nor the previous manifest (readers may still be opening the previous one).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        os.makedirs(path, exist_ok=True)
+        self.previous = _read_manifest_json(path) or {}
+        self.generation = self.previous.get("generation", 0) + 1
+
+    def write_table(self, name: str, model, batches: Iterable[Union[pa.RecordBatch, Dict[str, Any]]]) -> int:
+        schema = arrow_schema(model)
+        file_name = f"{name}-{self.generation}.arrow"
+        file_path = os.path.join(self.path, file_name)
+        rows = 0
+        with pa.OSFile(file_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                if not isinstance(batch, pa.RecordBatch):
+                    batch = pa.RecordBatch.from_pydict(batch, schema=schema)
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        self.tables[name] = {
+            "file": file_name,
+            "model": model.__name__,
+            "rows": rows,
+            "sha256": _file_sha256(file_path),
+        }
+        return rows
+
+    def close(self) -> Dict[str, Any]:
+        content = hashlib.sha256()
+        for name in sorted(self.tables):
+            content.update(f"{name}:{self.tables[name]['sha256']}".encode())
+        manifest = {
+            "schema_version": SCHEMA_VERSION,
+            "generation": self.generation,
+            "created_at": time.time(),
+            "content_hash": content.hexdigest(),
+            "tables": self.tables,
+        }
+        # Write-then-rename so readers never see a half-written manifest
+        tmp_path = os.path.join(self.path, MANIFEST_NAME + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, MANIFEST_NAME))
+        self._remove_stale_files()
+        return manifest
+
+    def _remove_stale_files(self):
+        keep = {entry["file"] for entry in self.tables.values()}
+        keep.update(entry.get("file") for entry in self.previous.get("tables", {}).values())
+        for file_name in os.listdir(self.path):
+            if file_name.endswith(".arrow") and file_name not in keep:
+                try:
+                    os.remove(os.path.join(self.path, file_name))
+                except OSError:
+                    pass  # e.g. still memory-mapped on Windows; retried by the next write
+
+
+def write_snapshot(data: Dict[str, List[Any]], path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Write a load_all_airtable()-shaped dict of model lists (responses/activities may be EventTables)
+    to a snapshot directory. Returns the manifest.
+    """
+    writer = SnapshotWriter(path)
+    for name, model in SNAPSHOT_MODELS.items():
+        schema = arrow_schema(model)
+        objs = data.get(name, [])
+        if isinstance(objs, EventTable):
+            batches = objs.to_arrow(schema).to_batches(max_chunksize=batch_size)
+        else:
+            batches = _model_batches(objs, model, schema, batch_size)
+        writer.write_table(name, model, batches)
+    return writer.close()
+
+
+def read_manifest(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the snapshot manifest, or None if the directory holds no snapshot.
+    Raises ValueError if the snapshot was written with a different schema version.
+    """
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    if manifest.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(
+            f"Snapshot schema version {manifest.get('schema_version')} != supported version {SCHEMA_VERSION}")
+    return manifest
+
+
+def read_snapshot_tables(path: str, memory_map: bool = True, verify: bool = False) -> Dict[str, pa.Table]:
+    """
+    Open every table of a snapshot as a pyarrow Table. With memory_map=True the buffers are zero-copy views
+    over the files. verify=True re-hashes each file against the manifest first.
+    """
+    manifest = read_manifest(path)
+    if manifest is None:
+        raise FileNotFoundError(f"No snapshot manifest in {path}")
+    tables = {}
+    for name, entry in manifest["tables"].items():
+        file_path = os.path.join(path, entry["file"])
+        if verify and _file_sha256(file_path) != entry["sha256"]:
+            raise ValueError(f"Snapshot table '{name}' does not match its manifest hash")
+        source = pa.memory_map(file_path, "r") if memory_map else pa.OSFile(file_path, "rb")
+        tables[name] = pa.ipc.open_file(source).read_all()
+    return tables
+
+
+def read_snapshot(path: str, verify: bool = False, event_tables: bool = False) -> Dict[str, Any]:
+    """
+    Rebuild the load_all_airtable()-shaped dict of model instances from a snapshot.
+    Rows were validated when the snapshot was written, so models are constructed without re-validation.
+    event_tables=True returns responses and activities as compact EventTables instead of model lists.
+    """
+    tables = read_snapshot_tables(path, verify=verify)
+    campaign_dict, attendee_dict = StringDictionary(), StringDictionary()
+    data = {}
+    for name, model in SNAPSHOT_MODELS.items():
+        table = tables.get(name)
+        if table is None:
+            data[name] = []
+        elif event_tables and model in (Response, Activity):
+            data[name] = EventTable.from_arrow(table, model, campaign_dict, attendee_dict)
+        else:
+            data[name] = [model.construct(**row) for row in table.to_pylist()]
+    return data
+
+
+def load_snapshot(path: str, event_tables: bool = False) -> Optional[Tuple[Dict[str, List[Any]], float]]:
+    """
+    Warm-start hook for DatasetCache: (data, created_at) if a readable snapshot exists, else None.
+    event_tables=True loads responses and activities straight into EventTables (no per-row models).
+    """
+    try:
+        manifest = read_manifest(path)
+        if manifest is None:
+            return None
+        return read_snapshot(path, event_tables=event_tables), manifest["created_at"]
+    except Exception as e:
+        print(f"Ignoring unreadable snapshot at {path}: {e}")
+        return None
@@ -0,0 +1,170 @@
+"""
+synthetic_scale.py
+
+Scale mode for synthetic data: seeded NumPy generation of referentially consistent datasets at production size
+(e.g. 10k campaigns, tens of millions of activities and responses), written straight to the columnar snapshot
+format in bounded chunks without creating pydantic objects.
+
+Skew controls:
+- attendee_skew: Zipf-like exponent for attendees per campaign (0 = uniform, ~1 = a few flagship events)
+- event_skew: exponent for activities/responses per attendee (a few highly engaged attendees)
+
+Every response/activity is drawn for an attendee and inherits that attendee's campaign, and every
+opportunity is sourced from an attendee so its (account, campaign) pair actually met.
+
+    python -m data_ingestion.synthetic_scale out/scale --campaigns 10000 --activities 20000000
+"""
+import argparse
+import time
+from typing import Dict, Iterator, Optional
+import numpy as np
+from data_models.marketing_objects import Campaign, Attendee, Response, Activity, Contact, Account, Opportunity
+from data_ingestion.snapshot import SnapshotWriter
+
+CHUNK_ROWS = 1_000_000
+EPOCH_2025_US = 1_735_689_600 * 1_000_000  # 2025-01-01T00:00:00Z in microseconds
+DAY_US = 86_400 * 1_000_000
+
+INDUSTRIES = np.array(["Tech", "Finance", "Retail", "Healthcare", "Manufacturing", "CPG", "Automotive"])
+REGIONS = np.array(["NA", "EMEA", "APAC", "LATAM"])
+RESPONSE_TYPES = np.array(["registered", "attended", "no-show", "interested", "declined", "waitlisted"])
+ACTIVITY_TYPES = np.array(["email_open", "click", "meeting", "demo", "call", "webinar_join"])
+STAGES = np.array(["Open", "In Progress", "Closed Won", "Closed Lost"])
+
+
+def _ids(prefix: str, idx: np.ndarray) -> np.ndarray:
+    return np.char.add(prefix, idx.astype(np.str_))
+
+
+def _power_law_cdf(n: int, exponent: float, rng: np.random.Generator) -> np.ndarray:
+    # Rank-based Zipf weights, shuffled so popularity is not correlated with ID order
+    weights = 1.0 / np.arange(1, n + 1, dtype=np.float64) ** exponent
+    rng.shuffle(weights)
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def _sample(cdf: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    # Inverse-CDF sampling; unlike rng.choice(p=...) the CDF is built once and reused per chunk
+    return np.minimum(np.searchsorted(cdf, rng.random(k), side="right"), len(cdf) - 1)
+
+
+class ScaleConfig:
+    def __init__(self, campaigns: int = 10_000, accounts: int = 50_000, contacts: int = 500_000,
+                 attendees: int = 2_000_000, responses: int = 10_000_000, activities: int = 20_000_000,
+                 opportunities: int = 200_000, attendee_skew: float = 1.0, event_skew: float = 0.8,
+                 seed: int = 42, chunk_rows: int = CHUNK_ROWS):
+        self.campaigns = campaigns
+        self.accounts = accounts
+        self.contacts = contacts
+        self.attendees = attendees
+        self.responses = responses
+        self.activities = activities
+        self.opportunities = opportunities
+        self.attendee_skew = attendee_skew
+        self.event_skew = event_skew
+        self.seed = seed
+        self.chunk_rows = chunk_rows
+
+
+def _chunks(total: int, size: int) -> Iterator[tuple]:
+    for start in range(0, total, size):
+        yield start, min(start + size, total)
+
+
+def generate_scale_dataset(path: str, config: Optional[ScaleConfig] = None) -> Dict[str, int]:
+    """
+    Generate a full dataset into a snapshot directory. Returns row counts per table.
+    Peak memory is bounded by the dimension tables plus one chunk of events.
+    """
+    cfg = config or ScaleConfig()
+    rng = np.random.default_rng(cfg.seed)
+    writer = SnapshotWriter(path)
+    counts = {}
+
+    # Campaigns: staggered start dates over two years, 1-14 day duration
+    c_idx = np.arange(cfg.campaigns)
+    c_start = EPOCH_2025_US + rng.integers(0, 730, cfg.campaigns) * DAY_US
+    c_end = c_start + rng.integers(1, 15, cfg.campaigns) * DAY_US
+    counts["campaigns"] = writer.write_table("campaigns", Campaign, [{
+        "id": _ids("cmp", c_idx), "name": np.char.add("Campaign ", c_idx.astype(np.str_)),
+        "start_date": c_start.astype("datetime64[us]"), "end_date": c_end.astype("datetime64[us]"),
+        "description": np.full(cfg.campaigns, None, dtype=object),
+    }])
+
+    a_idx = np.arange(cfg.accounts)
+    counts["accounts"] = writer.write_table("accounts", Account, [{
+        "id": _ids("acc", a_idx), "name": np.char.add("Account ", a_idx.astype(np.str_)),
+        "industry": INDUSTRIES[rng.integers(0, len(INDUSTRIES), cfg.accounts)],
+        "region": REGIONS[rng.integers(0, len(REGIONS), cfg.accounts)],
+    }])
+
+    # Contacts belong to accounts with power-law account sizes
+    contact_account = _sample(_power_law_cdf(cfg.accounts, 0.8, rng), cfg.contacts, rng)
+    counts["contacts"] = writer.write_table("contacts", Contact, ({
+        "id": _ids("con", np.arange(lo, hi)), "name": np.char.add("Contact ", np.arange(lo, hi).astype(np.str_)),
+        "email": np.char.add(_ids("con", np.arange(lo, hi)), "@example.com"),
+        "lead": rng.random(hi - lo) < 0.3, "account_id": _ids("acc", contact_account[lo:hi]),
+    } for lo, hi in _chunks(cfg.contacts, cfg.chunk_rows)))
+
+    # Attendees: a contact registered for a campaign; campaign popularity follows attendee_skew
+    attendee_contact = rng.integers(0, cfg.contacts, cfg.attendees)
+    attendee_campaign = _sample(_power_law_cdf(cfg.campaigns, cfg.attendee_skew, rng), cfg.attendees, rng)
+    attendee_account = contact_account[attendee_contact]
+    counts["attendees"] = writer.write_table("attendees", Attendee, ({
+        "id": _ids("att", np.arange(lo, hi)),
+        "name": np.char.add("Contact ", attendee_contact[lo:hi].astype(np.str_)),
+        "email": np.char.add(_ids("con", attendee_contact[lo:hi]), "@example.com"),
+        "campaign_id": _ids("cmp", attendee_campaign[lo:hi]), "account_id": _ids("acc", attendee_account[lo:hi]),
+    } for lo, hi in _chunks(cfg.attendees, cfg.chunk_rows)))
+
+    # Events: pick an attendee (engagement skew), inherit its campaign, timestamp within the campaign window
+    engagement = _power_law_cdf(cfg.attendees, cfg.event_skew, rng)
+
+    def events(total: int, prefix: str, type_field: str, types: np.ndarray):
+        for lo, hi in _chunks(total, cfg.chunk_rows):
+            att = _sample(engagement, hi - lo, rng)
+            camp = attendee_campaign[att]
+            span = c_end[camp] - c_start[camp] + DAY_US
+            ts = c_start[camp] - 14 * DAY_US + (rng.random(hi - lo) * (span + 14 * DAY_US)).astype(np.int64)
+            yield {
+                "id": _ids(prefix, np.arange(lo, hi)), "attendee_id": _ids("att", att),
+                "campaign_id": _ids("cmp", camp), type_field: types[rng.integers(0, len(types), hi - lo)],
+                "timestamp": ts.astype("datetime64[us]"),
+            }
+
+    counts["responses"] = writer.write_table(
+        "responses", Response, events(cfg.responses, "rsp", "response_type", RESPONSE_TYPES))
+    counts["activities"] = writer.write_table(
+        "activities", Activity, events(cfg.activities, "act", "type", ACTIVITY_TYPES))
+
+    # Opportunities: sourced from an attendee so the (account, campaign) pair actually met
+    source = rng.integers(0, cfg.attendees, cfg.opportunities)
+    counts["opportunities"] = writer.write_table("opportunities", Opportunity, [{
+        "id": _ids("opp", np.arange(cfg.opportunities)), "account_id": _ids("acc", attendee_account[source]),
+        "campaign_id": _ids("cmp", attendee_campaign[source]),
+        "amount": np.round(rng.lognormal(10.5, 1.0, cfg.opportunities), 2),
+        "stage": STAGES[rng.integers(0, len(STAGES), cfg.opportunities)],
+        "close_date": (c_end[attendee_campaign[source]] + rng.integers(10, 120, cfg.opportunities) * DAY_US
+                       ).astype("datetime64[us]"),
+    }])
+    writer.close()
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a production-scale synthetic snapshot.")
+    parser.add_argument("path")
+    defaults = ScaleConfig()
+    for name in ("campaigns", "accounts", "contacts", "attendees", "responses", "activities", "opportunities"):
+        parser.add_argument(f"--{name}", type=int, default=getattr(defaults, name))
+    parser.add_argument("--attendee-skew", type=float, default=defaults.attendee_skew)
+    parser.add_argument("--event-skew", type=float, default=defaults.event_skew)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    counts = generate_scale_dataset(args.path, ScaleConfig(
+        campaigns=args.campaigns, accounts=args.accounts, contacts=args.contacts, attendees=args.attendees,
+        responses=args.responses, activities=args.activities, opportunities=args.opportunities,
+        attendee_skew=args.attendee_skew, event_skew=args.event_skew, seed=args.seed))
+    print(f"Wrote {sum(counts.values()):,} rows to {args.path} in {time.perf_counter() - start:.1f}s: {counts}")
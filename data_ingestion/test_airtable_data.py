@@ -0,0 +1,101 @@
+"""
+Integration tests for Airtable loading and incremental sync against the in-process fake_airtable server.
+"""
+import importlib
+import pytest
+from data_ingestion.data_cache import DatasetCache
+from data_ingestion.fake_airtable import FakeAirtableServer
+from data_ingestion.record_store import RecordStore
+
+
+@pytest.fixture
+def airtable(monkeypatch):
+    pytest.importorskip("pydantic")
+    pytest.importorskip("requests")
+    monkeypatch.setenv("AIRTABLE_TOKEN", "test-token")
+    monkeypatch.setenv("AIRTABLE_BASE_ID", "appTest")
+    return importlib.import_module("data_ingestion.airtable_data")
+
+
+def _client(airtable, server, **kwargs):
+    from data_ingestion.airtable_client import AirtableClient
+    return AirtableClient("test-token", "appTest", endpoint_url=server.endpoint_url,
+                          max_requests_per_second=0, **kwargs)
+
+
+def test_failed_load_keeps_last_good_snapshot(airtable):
+    tables = {name: [] for name in airtable.TABLES}
+    with FakeAirtableServer(tables, max_requests_per_second=0) as server:
+        client = _client(airtable, server)
+        cache = DatasetCache(lambda: airtable.load_all_airtable(client), ttl_seconds=3600)
+        first = cache.get()
+        del server.tables["Campaigns"]  # the next fetch of this table fails with a 404
+        with pytest.raises(airtable.AirtableLoadError):
+            cache.refresh()
+        cache.refresh_async()
+        cache._refresh_thread.join(5)
+    assert cache.snapshot is first
+    assert isinstance(cache.last_error, airtable.AirtableLoadError)
+
+
+def test_exhausted_retries_raise(airtable):
+    from data_ingestion.airtable_client import AirtableRetriesExhausted
+    tables = {name: [] for name in airtable.TABLES}
+    # One request per second on the server and no client-side pacing: most requests get a 429
+    with FakeAirtableServer(tables, max_requests_per_second=1) as server:
+        client = _client(airtable, server, max_retries=1, backoff_base=0.001, backoff_max=0.001)
+        with pytest.raises(airtable.AirtableLoadError) as excinfo:
+            airtable.load_all_airtable(client, max_workers=len(tables))
+    assert isinstance(excinfo.value.__cause__, AirtableRetriesExhausted)
+
+
+def _campaign(rid, name, created="2026-01-01T00:00:00.000Z"):
+    # Airtable-style column names and no "id" column: the record ID lives outside the fields
+    fields = {"Name": name, "Start Date": "2026-01-01", "End Date": "2026-01-31"}
+    return {"id": rid, "createdTime": created, "fields": fields}
+
+
+def test_incremental_sync_upserts_and_reconciles_deletes(airtable):
+    from datetime import datetime, timedelta, timezone
+    tables = {name: [] for name in airtable.TABLES}
+    tables["Campaigns"] = [_campaign("c1", "Alpha"), _campaign("c2", "Beta")]
+    with FakeAirtableServer(tables, max_requests_per_second=0) as server:
+        sync = airtable.AirtableSync(RecordStore(), _client(airtable, server), reconcile_seconds=3600)
+        sync.sync_all()
+        assert sync.last_changes["Campaigns"] == {"upserted": 2, "deleted": 0}
+
+        # Modified just before the last sync started: re-fetched thanks to the watermark overlap
+        server.modified[("Campaigns", "c1")] = datetime.now(timezone.utc) - timedelta(seconds=30)
+        server.upsert_record("Campaigns", _campaign("c3", "Gamma")["fields"], record_id="c3")
+        server.delete_record("Campaigns", "c2")
+        data = sync.sync_all()
+        # c2 is gone upstream but no ID listing is due yet
+        assert sync.last_changes["Campaigns"] == {"upserted": 2, "deleted": 0}
+        assert sorted(c.id for c in data["campaigns"]) == ["c1", "c2", "c3"]
+
+        server.upsert_record("Campaigns", _campaign("c3", "Gamma v2")["fields"], record_id="c3")
+        sync.reconcile_seconds = 0
+        data = sync.sync_all()
+        assert sync.last_changes["Campaigns"]["deleted"] == 1
+        assert {c.id: c.name for c in data["campaigns"]} == {"c1": "Alpha", "c3": "Gamma v2"}
+        assert sync.store.record_ids("Campaigns") == {"c1", "c3"}
+
+
+def test_unknown_listing_field_is_rejected(airtable):
+    import requests
+    tables = {name: [] for name in airtable.TABLES}
+    tables["Campaigns"] = [_campaign("c1", "Alpha")]
+    with FakeAirtableServer(tables, max_requests_per_second=0) as server:
+        client = _client(airtable, server)
+        # Like the real API: no column is literally named "id"
+        with pytest.raises(requests.HTTPError) as excinfo:
+            client.fetch_all("Campaigns", {"fields[]": "id"})
+        assert excinfo.value.response.status_code == 422
+        assert excinfo.value.response.json()["error"]["type"] == "UNKNOWN_FIELD_NAME"
+        assert [r["id"] for r in client.fetch_all("Campaigns", {"fields[]": "Name"})] == ["c1"]
+
+        # A per-table override is used as is, so a wrong one surfaces the same error on the first ID listing
+        sync = airtable.AirtableSync(RecordStore(), client, reconcile_seconds=0, listing_fields={"Campaigns": "Nope"})
+        sync.sync_all()
+        with pytest.raises(requests.HTTPError):
+            sync.sync_all()
@@ -0,0 +1,69 @@
+"""
+Unit tests for the stale-while-revalidate DatasetCache.
+"""
+import threading
+import time
+from data_ingestion.data_cache import DatasetCache
+
+
+def test_serves_cached_snapshot_until_stale():
+    calls = []
+    cache = DatasetCache(lambda: calls.append(1) or {"n": len(calls)}, ttl_seconds=60)
+    first = cache.get()
+    assert cache.get() is first
+    assert first.data == {"n": 1}
+    assert first.version == 1
+    assert len(calls) == 1
+
+
+def test_background_refresh_keeps_old_snapshot_until_done():
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return {"n": len(calls)}
+
+    cache = DatasetCache(loader, ttl_seconds=0)
+    first = cache.get()
+    # Stale: triggers one background refresh but still returns the old snapshot
+    assert cache.get() is first
+    assert cache.get() is first
+    assert cache.is_refreshing
+    release.set()
+    cache._refresh_thread.join(5)
+    assert cache.snapshot.data == {"n": 2}
+    assert cache.snapshot.version == 2
+    assert len(calls) == 2
+
+
+def test_failed_refresh_keeps_last_good_snapshot():
+    state = {"fail": False}
+
+    def loader():
+        if state["fail"]:
+            raise RuntimeError("airtable down")
+        return {"ok": True}
+
+    cache = DatasetCache(loader, ttl_seconds=3600)
+    first = cache.get()
+    state["fail"] = True
+    cache.refresh_async()
+    cache._refresh_thread.join(5)
+    assert cache.snapshot is first
+    assert isinstance(cache.last_error, RuntimeError)
+
+
+def test_warm_start_serves_persisted_data_then_refreshes():
+    persisted = []
+    cache = DatasetCache(lambda: {"source": "live"}, ttl_seconds=60,
+                         warm_start=lambda: ({"source": "snapshot"}, time.time() - 120),
+                         on_load=persisted.append)
+    first = cache.get()
+    assert first.data == {"source": "snapshot"}
+    # The snapshot is older than the TTL, so a background refresh was scheduled
+    cache._refresh_thread.join(5)
+    assert cache.snapshot.data == {"source": "live"}
+    assert persisted == [{"source": "live"}]
@@ -0,0 +1,59 @@
+"""
+Unit tests for the precompiled Airtable record decoders.
+"""
+from datetime import datetime, timezone
+import pytest
+from data_ingestion.decoders import RecordDecoder, RejectsReport, parse_bool
+
+
+def _model(name):
+    pytest.importorskip("pydantic")
+    from data_models import marketing_objects
+    return getattr(marketing_objects, name)
+
+
+def _rec(rid, **fields):
+    return {"id": rid, "fields": {"id": rid, **fields}}
+
+
+def test_parse_bool():
+    assert [parse_bool(v) for v in (True, "false", "No", "TRUE", 1, 0, "checked")] == \
+        [True, False, False, True, True, False, True]
+    assert parse_bool("maybe") is None
+
+
+def test_boolean_strings_are_parsed_not_truthy():
+    decoder = RecordDecoder(_model("Contact"))
+    rejects = RejectsReport()
+    objs = decoder.decode_keyed([
+        _rec("p1", name="Ann", email="a@x.com", lead="false"),
+        _rec("p2", name="Bob", email="b@x.com", lead="true"),
+        _rec("p3", name="Cy", email="c@x.com", lead="sometimes"),
+    ], "Contacts", rejects)
+    assert objs["p1"].lead is False
+    assert objs["p2"].lead is True
+    assert "p3" not in objs
+    assert rejects.rows[0]["field"] == "lead"
+
+
+def test_trailing_z_datetimes():
+    decoder = RecordDecoder(_model("Campaign"))
+    objs = decoder.decode_keyed([_rec("c1", name="Alpha", start_date="2026-01-31T09:00:00.000Z",
+                                      end_date="2026-02-01")])
+    assert objs["c1"].start_date == datetime(2026, 1, 31, 9, tzinfo=timezone.utc)
+
+
+def test_wrong_types_are_validated_or_rejected():
+    decoder = RecordDecoder(_model("Attendee"))
+    rejects = RejectsReport()
+    objs = decoder.decode_keyed([
+        _rec("a1", name="Ann", email="a@x.com", campaign_id="c1"),
+        _rec("a2", name="Bob", email="b@x.com", campaign_id=["c1", "c2"]),
+        _rec("a3", name=42, email="c@x.com", campaign_id="c1"),
+    ], "Attendees", rejects)
+    assert objs["a1"].campaign_id == "c1"
+    # Never a raw list or int in a str field: either coerced by validation or rejected
+    assert "a2" not in objs
+    assert "a3" not in objs or objs["a3"].name == "42"
+    assert {row["record_id"] for row in rejects.rows} >= {"a2"}
+    assert all(isinstance(o.name, str) and isinstance(o.campaign_id, str) for o in objs.values())
@@ -0,0 +1,62 @@
+"""
+Unit tests for chunked CSV loading: batch boundaries, missing values, text columns and dates.
+"""
+from datetime import datetime
+import pytest
+
+pytest.importorskip("pandas")
+pydantic = pytest.importorskip("pydantic")
+from data_ingestion.load_data import iter_csv_batches, load_from_csv  # noqa: E402
+from data_models.marketing_objects import Account, Activity, Opportunity  # noqa: E402
+
+
+def _csv(tmp_path, text):
+    path = tmp_path / "table.csv"
+    path.write_text(text)
+    return str(path)
+
+
+def test_batches_split_at_chunksize(tmp_path):
+    rows = "".join(f"acc{i},Name {i},Retail,EMEA\n" for i in range(7))
+    path = _csv(tmp_path, "id,name,industry,region\n" + rows)
+    batches = list(iter_csv_batches(path, Account, chunksize=3))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [a.id for batch in batches for a in batch] == [f"acc{i}" for i in range(7)]
+    assert [a.id for a in load_from_csv(path, Account)] == [f"acc{i}" for i in range(7)]
+
+
+def test_missing_values_become_none_and_text_stays_text(tmp_path):
+    # Unknown columns are ignored; numeric-looking strings keep their leading zeros
+    path = _csv(tmp_path, "id,name,industry,region,extra\n"
+                          "001,42,,0044,x\n"
+                          "002,Acme,Retail,,y\n")
+    first, second = next(iter_csv_batches(path, Account))
+    assert (first.id, first.name, first.industry, first.region) == ("001", "42", None, "0044")
+    assert isinstance(first.name, str)
+    assert (second.industry, second.region) == ("Retail", None)
+
+
+def test_dates_are_parsed_and_missing_dates_are_none(tmp_path):
+    path = _csv(tmp_path, "id,account_id,campaign_id,amount,stage,close_date\n"
+                          "o1,acc1,c1,1500.5,won,2026-03-01 09:30:00\n"
+                          "o2,acc1,,0,open,\n")
+    won, open_ = next(iter_csv_batches(path, Opportunity))
+    assert won.close_date == datetime(2026, 3, 1, 9, 30) and won.amount == 1500.5
+    assert open_.close_date is None and open_.campaign_id is None and open_.amount == 0.0
+
+    path = _csv(tmp_path, "id,campaign_id,attendee_id,type,timestamp\n"
+                          "a1,c1,,click,2026-01-05T10:15:00\n")
+    (activity,) = next(iter_csv_batches(path, Activity))
+    assert activity.timestamp == datetime(2026, 1, 5, 10, 15) and activity.attendee_id is None
+
+
+def test_invalid_row_fails_its_chunk_after_earlier_batches(tmp_path):
+    path = _csv(tmp_path, "id,account_id,campaign_id,amount,stage,close_date\n"
+                          "o1,acc1,c1,10,open,\n"
+                          "o2,acc1,c1,20,open,\n"
+                          "o3,acc1,c1,not-a-number,open,\n"
+                          "o4,acc1,c1,40,open,\n")
+    batches = iter_csv_batches(path, Opportunity, chunksize=2)
+    assert [o.id for o in next(batches)] == ["o1", "o2"]
+    with pytest.raises(pydantic.ValidationError):
+        next(batches)
@@ -0,0 +1,23 @@
+"""
+Unit tests for the SQLite RecordStore behind incremental Airtable sync.
+"""
+from data_ingestion.record_store import RecordStore
+
+
+def _rec(rid, name):
+    return {"id": rid, "createdTime": "2026-01-01T00:00:00.000Z", "fields": {"id": rid, "name": name}}
+
+
+def test_upsert_delete_and_watermark():
+    store = RecordStore()
+    assert store.get_watermark("Campaigns") is None
+    store.upsert("Campaigns", [_rec("c1", "Alpha"), _rec("c2", "Beta"), _rec("c3", "Gamma")])
+    store.upsert("Campaigns", [_rec("c2", "Beta v2")])
+    assert store.count("Campaigns") == 3
+    names = {r["id"]: r["fields"]["name"] for r in store.all_records("Campaigns")}
+    assert names["c2"] == "Beta v2"
+    assert store.delete_missing("Campaigns", {"c1", "c2"}) == ["c3"]
+    assert store.delete("Campaigns", ["c1"]) == 1
+    assert store.record_ids("Campaigns") == {"c2"}
+    store.set_watermark("Campaigns", "2026-01-02T00:00:00.000Z")
+    assert store.get_watermark("Campaigns") == "2026-01-02T00:00:00.000Z"
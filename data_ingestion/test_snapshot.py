@@ -0,0 +1,72 @@
+"""
+Unit tests for the columnar snapshot: write/read round trip, timezones and generation swaps.
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("pydantic")
+pytest.importorskip("numpy")
+from data_ingestion.snapshot import MANIFEST_NAME, read_snapshot, write_snapshot  # noqa: E402
+from data_models.marketing_objects import Activity, Campaign  # noqa: E402
+
+UTC = timezone.utc
+
+
+def _data(name="Launch"):
+    start = datetime(2026, 3, 1, 9, 30, tzinfo=timezone(timedelta(hours=-5)))
+    campaigns = [Campaign.construct(id="c1", name=name, start_date=start, end_date=start + timedelta(days=1),
+                                    description=None)]
+    activities = [
+        Activity.construct(id="a1", attendee_id="p1", campaign_id="c1", type="click",
+                           timestamp=datetime(2026, 3, 1, 15, 0, tzinfo=UTC)),
+        Activity.construct(id="a2", attendee_id=None, campaign_id="c1", type="meeting",
+                           timestamp=datetime(2026, 3, 2, 8, 0)),  # naive: taken as UTC
+    ]
+    return {"campaigns": campaigns, "activities": activities}
+
+
+def test_round_trip_keeps_values_and_timezones(tmp_path):
+    manifest = write_snapshot(_data(), str(tmp_path))
+    assert manifest["tables"]["campaigns"]["rows"] == 1
+
+    data = read_snapshot(str(tmp_path), verify=True)
+    campaign = data["campaigns"][0]
+    assert campaign.name == "Launch"
+    assert campaign.start_date == datetime(2026, 3, 1, 14, 30, tzinfo=UTC)
+    assert campaign.start_date.utcoffset() == timedelta(0)
+    assert campaign.description is None
+    expected = [datetime(2026, 3, 1, 15, 0, tzinfo=UTC), datetime(2026, 3, 2, 8, 0, tzinfo=UTC)]
+    assert [a.timestamp for a in data["activities"]] == expected
+    assert data["activities"][1].attendee_id is None
+    assert data["responses"] == []
+
+    # EventTables decode the same aware timestamps
+    events = read_snapshot(str(tmp_path), event_tables=True)["activities"]
+    assert [row.timestamp for row in events] == expected
+
+
+def test_rewrite_switches_generation_and_removes_stale_files(tmp_path):
+    path = str(tmp_path)
+    write_snapshot(_data("First"), path)
+    write_snapshot(_data("Second"), path)
+    with open(os.path.join(path, MANIFEST_NAME)) as f:
+        assert json.load(f)["generation"] == 2
+    # Generation 1 stays for readers holding the previous manifest
+    assert "campaigns-1.arrow" in os.listdir(path)
+    write_snapshot(_data("Third"), path)
+    files = os.listdir(path)
+    assert "campaigns-1.arrow" not in files and "campaigns-3.arrow" in files
+    assert read_snapshot(path)["campaigns"][0].name == "Third"
+
+
+def test_interrupted_write_keeps_previous_snapshot(tmp_path):
+    path = str(tmp_path)
+    write_snapshot(_data("Good"), path)
+    data = _data("Broken")
+    data["activities"] = [object()]  # fails mid-write, after campaigns were written
+    with pytest.raises(AttributeError):
+        write_snapshot(data, path)
+    assert read_snapshot(path, verify=True)["campaigns"][0].name == "Good"
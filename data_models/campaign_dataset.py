@@ -0,0 +1,196 @@
+"""
+campaign_dataset.py
+
+Indexed, read-only view over one data snapshot.
+Builds hash indexes on campaign_id, account_id, attendee_id and normalized contact email once, and precomputes
+per-campaign aggregates, so per-campaign lookups and contact/account enrichment in the app, the summary pipeline
+and batch jobs cost O(result) instead of a scan of every table.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from .marketing_objects import Campaign, Attendee, Response, Activity, Contact, Account, Opportunity
+from .event_table import EventTable, compact_events
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    if not email:
+        return None
+    return email.strip().lower() or None
+
+
+def _group_by(items: Sequence[Any], key: str) -> Dict[Any, List[Any]]:
+    if isinstance(items, EventTable):
+        # Columnar events already carry coded columns; reuse their CSR index instead of per-key lists
+        return items.group_index(key)
+    groups: Dict[Any, List[Any]] = defaultdict(list)
+    for item in items:
+        value = getattr(item, key)
+        if value is not None:
+            groups[value].append(item)
+    return dict(groups)
+
+
+class CampaignAggregates:
+    """
+    Precomputed per-campaign figures shown in the UI and fed to the summary pipeline.
+    """
+
+    def __init__(self, attendee_count: int = 0, opportunity_count: int = 0, pipeline: float = 0.0,
+                 key_account_ids: Optional[List[str]] = None, attendee_account_ids: Optional[List[str]] = None):
+        self.attendee_count = attendee_count
+        self.opportunity_count = opportunity_count
+        self.pipeline = pipeline
+        self.key_account_ids = key_account_ids or []  # accounts with opportunities, first-seen order
+        self.attendee_account_ids = attendee_account_ids or []  # accounts of attendees, first-seen order
+
+
+class CampaignDataset:
+    """
+    All tables of a snapshot plus hash indexes and per-campaign aggregates. Build once per snapshot.
+    responses and activities may be model lists or EventTables; the *_for() accessors behave the same.
+    Attendees are resolved to CRM contacts by normalized email and to accounts by account_id.
+    """
+
+    def __init__(
+        self,
+        campaigns: List[Campaign],
+        accounts: List[Account],
+        contacts: List[Contact],
+        attendees: List[Attendee],
+        responses: Sequence[Response],
+        activities: Sequence[Activity],
+        opportunities: List[Opportunity],
+    ):
+        self.campaigns = campaigns
+        self.accounts = accounts
+        self.contacts = contacts
+        self.attendees = attendees
+        self.responses = responses
+        self.activities = activities
+        self.opportunities = opportunities
+
+        # Primary-key indexes
+        self.campaigns_by_id = {c.id: c for c in campaigns}
+        self.accounts_by_id = {a.id: a for a in accounts}
+        self.attendees_by_id = {a.id: a for a in attendees}
+        # campaign_id indexes
+        self.attendees_by_campaign = _group_by(attendees, "campaign_id")
+        self.responses_by_campaign = _group_by(responses, "campaign_id")
+        self.activities_by_campaign = _group_by(activities, "campaign_id")
+        self.opportunities_by_campaign = _group_by(opportunities, "campaign_id")
+        # account_id indexes
+        self.contacts_by_account = _group_by(contacts, "account_id")
+        self.attendees_by_account = _group_by(attendees, "account_id")
+        self.opportunities_by_account = _group_by(opportunities, "account_id")
+        # attendee_id indexes
+        self.responses_by_attendee = _group_by(responses, "attendee_id")
+        self.activities_by_attendee = _group_by(activities, "attendee_id")
+        # Entity resolution: normalized email -> Contact (first occurrence wins)
+        self.contacts_by_email: Dict[str, Contact] = {}
+        for c in contacts:
+            email = normalize_email(c.email)
+            if email and email not in self.contacts_by_email:
+                self.contacts_by_email[email] = c
+
+        self._aggregates = {cid: self._aggregate(cid) for cid in self.campaigns_by_id}
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Sequence[Any]], columnar_events: bool = False) -> "CampaignDataset":
+        """
+        Build from a load_all_airtable()/read_snapshot()-shaped dict; responses and activities may already
+        be EventTables (see compact_events() and read_snapshot(event_tables=True)).
+        columnar_events=True converts model lists into EventTables here. That only saves memory if the caller
+        drops the model lists afterwards; long-lived data should be compacted before it is cached instead.
+        """
+        if columnar_events:
+            data = compact_events(data)
+        return cls(
+            campaigns=data.get("campaigns", []),
+            accounts=data.get("accounts", []),
+            contacts=data.get("contacts", []),
+            attendees=data.get("attendees", []),
+            responses=data.get("responses", []),
+            activities=data.get("activities", []),
+            opportunities=data.get("opportunities", []),
+        )
+
+    def _aggregate(self, campaign_id: str) -> CampaignAggregates:
+        attendees = self.attendees_by_campaign.get(campaign_id, [])
+        opportunities = self.opportunities_by_campaign.get(campaign_id, [])
+        return CampaignAggregates(
+            attendee_count=len(attendees),
+            opportunity_count=len(opportunities),
+            pipeline=sum(getattr(o, "amount", 0) or 0 for o in opportunities),
+            key_account_ids=list(dict.fromkeys(o.account_id for o in opportunities if o.account_id)),
+            attendee_account_ids=list(dict.fromkeys(a.account_id for a in attendees if a.account_id)),
+        )
+
+    def aggregates(self, campaign_id: str) -> CampaignAggregates:
+        aggregates = self._aggregates.get(campaign_id)
+        return aggregates if aggregates is not None else self._aggregate(campaign_id)
+
+    def attendees_for(self, campaign_id: str) -> List[Attendee]:
+        return self.attendees_by_campaign.get(campaign_id, [])
+
+    def responses_for(self, campaign_id: str) -> Sequence[Response]:
+        return self.responses_by_campaign.get(campaign_id, [])
+
+    def activities_for(self, campaign_id: str) -> Sequence[Activity]:
+        return self.activities_by_campaign.get(campaign_id, [])
+
+    def opportunities_for(self, campaign_id: str) -> List[Opportunity]:
+        return self.opportunities_by_campaign.get(campaign_id, [])
+
+    def get_accounts(self, account_ids: Sequence[str]) -> List[Account]:
+        return [self.accounts_by_id[aid] for aid in account_ids if aid in self.accounts_by_id]
+
+    def key_accounts(self, campaign_id: str) -> List[Account]:
+        """Accounts with opportunities attributed to the campaign."""
+        return self.get_accounts(self.aggregates(campaign_id).key_account_ids)
+
+    def attendee_accounts(self, campaign_id: str) -> List[Account]:
+        """Accounts whose people attended the campaign."""
+        return self.get_accounts(self.aggregates(campaign_id).attendee_account_ids)
+
+    def contact_for(self, attendee: Attendee) -> Optional[Contact]:
+        return self.contacts_by_email.get(normalize_email(attendee.email))
+
+    def account_for(self, person: Any) -> Optional[Account]:
+        """
+        Account of an attendee or contact; falls back to the matched contact's account for attendees without one.
+        """
+        account_id = getattr(person, "account_id", None)
+        if not account_id and isinstance(person, Attendee):
+            contact = self.contact_for(person)
+            account_id = contact.account_id if contact else None
+        return self.accounts_by_id.get(account_id) if account_id else None
+
+    def resolve(self, attendees: Iterable[Attendee]) -> List[Tuple[Attendee, Optional[Contact], Optional[Account]]]:
+        """
+        Enrich attendees with their CRM contact and account, for batch jobs.
+        """
+        return [(a, self.contact_for(a), self.account_for(a)) for a in attendees]
+
+    def key_contacts(self, attendees: Iterable[Attendee], limit: int = 3) -> List[Contact]:
+        """
+        Contacts of the first `limit` attendees that resolve to a known contact, from any account.
+        """
+        found: List[Contact] = []
+        for a in attendees:
+            contact = self.contact_for(a)
+            if contact is not None:
+                found.append(contact)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def accounts_for(self, attendees: Iterable[Attendee]) -> List[Account]:
+        """
+        Distinct accounts represented by the attendees, in first-seen order.
+        """
+        seen: Dict[str, Account] = {}
+        for a in attendees:
+            account = self.account_for(a)
+            if account is not None and account.id not in seen:
+                seen[account.id] = account
+        return list(seen.values())
@@ -0,0 +1,283 @@
+"""
+event_table.py
+
+Compact columnar representation for high-volume event models (Activity, Response).
+Instead of one pydantic object per row, an EventTable keeps:
+- row IDs in an Arrow string array (offsets + bytes, no per-row objects)
+- campaign_id / attendee_id as int32 codes into shared StringDictionary instances
+- the event type as int16 categorical codes
+- timestamps as int64 microseconds since the epoch (UTC; decoded timezone-aware)
+which is roughly 40 bytes per row versus several hundred for a BaseModel instance.
+EventRow gives attribute access for code that still expects model-like rows, and GroupIndex
+provides the .get(key, default) lookups CampaignDataset uses, so per-campaign accessors keep working.
+"""
+import collections.abc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import numpy as np
+import pyarrow as pa
+from .marketing_objects import Activity, Response
+
+NULL_CODE = -1
+NULL_TIMESTAMP = np.iinfo(np.int64).min
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# The categorical "type" column of each event model
+EVENT_TYPE_FIELD = {Activity: "type", Response: "response_type"}
+
+
+class StringDictionary:
+    """
+    Append-only string <-> int32 code mapping, shareable between tables so codes are comparable.
+    """
+
+    def __init__(self, values: Optional[Sequence[str]] = None):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for value in values or []:
+            self.encode(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return NULL_CODE
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code_of(self, value: Optional[str]) -> Optional[int]:
+        """Code for an existing value, without inserting it."""
+        return self._codes.get(value)
+
+    def decode(self, code: int) -> Optional[str]:
+        return None if code == NULL_CODE else self.values[code]
+
+    def encode_arrow(self, column: pa.ChunkedArray) -> np.ndarray:
+        """
+        Encode an Arrow string column. Python-level work is per distinct value, not per row.
+        """
+        encoded = column.combine_chunks().dictionary_encode()
+        mapping = np.array([self.encode(v) for v in encoded.dictionary.to_pylist()] or [NULL_CODE], dtype=np.int32)
+        local = encoded.indices.fill_null(NULL_CODE).to_numpy(zero_copy_only=False).astype(np.int64)
+        return np.where(local == NULL_CODE, NULL_CODE, mapping[np.maximum(local, 0)]).astype(np.int32)
+
+
+def _to_epoch_us(value: Optional[datetime]) -> int:
+    if value is None:
+        return NULL_TIMESTAMP
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)  # naive datetimes are taken as UTC
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+class EventRow:
+    """
+    Lightweight attribute view of one row; fields are decoded on access.
+    """
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: "EventTable", i: int):
+        self._table = table
+        self._i = i
+
+    def __getattr__(self, name: str) -> Any:
+        return self._table.value(name, self._i)
+
+    def __repr__(self) -> str:
+        return f"EventRow({self._table.model.__name__}, id={self.id!r})"
+
+
+class EventSlice(collections.abc.Sequence):
+    """
+    Sequence of EventRows selected by row positions (e.g., one campaign's events).
+    """
+
+    def __init__(self, table: "EventTable", positions: np.ndarray):
+        self.table = table
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return EventSlice(self.table, self.positions[i])
+        return EventRow(self.table, int(self.positions[i]))
+
+    def __iter__(self) -> Iterator[EventRow]:
+        table = self.table
+        return (EventRow(table, int(i)) for i in self.positions)
+
+
+class GroupIndex:
+    """
+    CSR-style index from a coded column's value to the positions of its rows (stable within a group).
+    Exposes the dict-like .get() used by CampaignDataset without allocating one list per key.
+    """
+
+    def __init__(self, table: "EventTable", codes: np.ndarray, dictionary: StringDictionary):
+        self.table = table
+        self.dictionary = dictionary
+        valid = codes != NULL_CODE
+        self._order = np.flatnonzero(valid)[np.argsort(codes[valid], kind="stable")]
+        counts = np.bincount(codes[valid], minlength=len(dictionary))
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    def get(self, key: Optional[str], default=None):
+        code = self.dictionary.code_of(key)
+        if code is None or code + 1 >= len(self._offsets):
+            return default
+        start, end = self._offsets[code], self._offsets[code + 1]
+        if start == end:
+            return default
+        return EventSlice(self.table, self._order[start:end])
+
+    def __contains__(self, key: Optional[str]) -> bool:
+        return self.get(key) is not None
+
+
+class EventTable(collections.abc.Sequence):
+    """
+    Array-backed table of Activity or Response rows. Build with from_models() or from_arrow().
+    """
+
+    def __init__(self, model, ids: pa.Array, campaign_codes: np.ndarray, attendee_codes: np.ndarray,
+                 type_codes: np.ndarray, timestamps: np.ndarray, campaign_dict: StringDictionary,
+                 attendee_dict: StringDictionary, type_dict: StringDictionary):
+        self.model = model
+        self.type_field = EVENT_TYPE_FIELD[model]
+        self.ids = ids
+        self.campaign_codes = campaign_codes
+        self.attendee_codes = attendee_codes
+        self.type_codes = type_codes
+        self.timestamps = timestamps
+        self.campaign_dict = campaign_dict
+        self.attendee_dict = attendee_dict
+        self.type_dict = type_dict
+        self._indexes: Dict[str, GroupIndex] = {}
+
+    @classmethod
+    def from_models(cls, models: Sequence[Any], model, campaign_dict: Optional[StringDictionary] = None,
+                    attendee_dict: Optional[StringDictionary] = None) -> "EventTable":
+        campaign_dict = campaign_dict if campaign_dict is not None else StringDictionary()
+        attendee_dict = attendee_dict if attendee_dict is not None else StringDictionary()
+        type_dict = StringDictionary()
+        type_field = EVENT_TYPE_FIELD[model]
+        return cls(
+            model,
+            ids=pa.array([m.id for m in models], type=pa.string()),
+            campaign_codes=np.fromiter((campaign_dict.encode(m.campaign_id) for m in models), np.int32, len(models)),
+            attendee_codes=np.fromiter((attendee_dict.encode(m.attendee_id) for m in models), np.int32, len(models)),
+            type_codes=np.fromiter((type_dict.encode(getattr(m, type_field)) for m in models), np.int16, len(models)),
+            timestamps=np.fromiter((_to_epoch_us(m.timestamp) for m in models), np.int64, len(models)),
+            campaign_dict=campaign_dict, attendee_dict=attendee_dict, type_dict=type_dict,
+        )
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table, model, campaign_dict: Optional[StringDictionary] = None,
+                   attendee_dict: Optional[StringDictionary] = None) -> "EventTable":
+        """
+        Build from a snapshot table (see data_ingestion/snapshot.py) without materializing rows.
+        """
+        campaign_dict = campaign_dict if campaign_dict is not None else StringDictionary()
+        attendee_dict = attendee_dict if attendee_dict is not None else StringDictionary()
+        type_dict = StringDictionary()
+        timestamps = table.column("timestamp").combine_chunks().cast(pa.int64()).fill_null(NULL_TIMESTAMP)
+        return cls(
+            model,
+            ids=table.column("id").combine_chunks(),
+            campaign_codes=campaign_dict.encode_arrow(table.column("campaign_id")),
+            attendee_codes=attendee_dict.encode_arrow(table.column("attendee_id")),
+            type_codes=type_dict.encode_arrow(table.column(EVENT_TYPE_FIELD[model])).astype(np.int16),
+            timestamps=timestamps.to_numpy(zero_copy_only=False),
+            campaign_dict=campaign_dict, attendee_dict=attendee_dict, type_dict=type_dict,
+        )
+
+    def __len__(self) -> int:
+        return len(self.campaign_codes)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return EventSlice(self, np.arange(len(self))[i])
+        if i < 0:
+            i += len(self)
+        return EventRow(self, i)
+
+    def __iter__(self) -> Iterator[EventRow]:
+        return (EventRow(self, i) for i in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        return (self.ids.nbytes + self.campaign_codes.nbytes + self.attendee_codes.nbytes
+                + self.type_codes.nbytes + self.timestamps.nbytes)
+
+    def value(self, name: str, i: int) -> Any:
+        if name == "id":
+            return self.ids[i].as_py()
+        if name == "campaign_id":
+            return self.campaign_dict.decode(int(self.campaign_codes[i]))
+        if name == "attendee_id":
+            return self.attendee_dict.decode(int(self.attendee_codes[i]))
+        if name == self.type_field:
+            return self.type_dict.decode(int(self.type_codes[i]))
+        if name == "timestamp":
+            ts = int(self.timestamps[i])
+            return None if ts == NULL_TIMESTAMP else _EPOCH + timedelta(microseconds=ts)
+        raise AttributeError(f"{self.model.__name__} has no field '{name}'")
+
+    def group_index(self, field: str) -> GroupIndex:
+        """
+        Lazily built, cached GroupIndex on 'campaign_id', 'attendee_id' or the type field.
+        """
+        if field not in self._indexes:
+            codes, dictionary = {
+                "campaign_id": (self.campaign_codes, self.campaign_dict),
+                "attendee_id": (self.attendee_codes, self.attendee_dict),
+                self.type_field: (self.type_codes.astype(np.int32), self.type_dict),
+            }[field]
+            self._indexes[field] = GroupIndex(self, codes, dictionary)
+        return self._indexes[field]
+
+    def to_arrow(self, schema: Optional[pa.Schema] = None) -> pa.Table:
+        """
+        Decode back to an Arrow table in model field order (the snapshot schema), one column at a time.
+        """
+        def strings(codes: np.ndarray, dictionary: StringDictionary) -> pa.Array:
+            # NULL_CODE (-1) picks the trailing None
+            return pa.array(np.array(dictionary.values + [None], dtype=object)[codes], type=pa.string())
+
+        columns = {
+            "id": self.ids,
+            "campaign_id": strings(self.campaign_codes, self.campaign_dict),
+            "attendee_id": strings(self.attendee_codes, self.attendee_dict),
+            self.type_field: strings(self.type_codes.astype(np.int32), self.type_dict),
+            "timestamp": pa.array(self.timestamps, mask=self.timestamps == NULL_TIMESTAMP,
+                                  type=pa.timestamp("us", tz="UTC")),
+        }
+        names = schema.names if schema is not None else list(columns)
+        table = pa.Table.from_pydict({name: columns[name] for name in names})
+        return table.cast(schema) if schema is not None else table
+
+    def to_models(self, positions: Optional[Sequence[int]] = None) -> List[Any]:
+        rows = range(len(self)) if positions is None else positions
+        construct = self.model.construct
+        fields = ("id", "campaign_id", "attendee_id", self.type_field, "timestamp")
+        return [construct(**{f: self.value(f, int(i)) for f in fields}) for i in rows]
+
+
+def compact_events(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a copy of a load_all_airtable()-shaped dict with responses and activities as EventTables sharing
+    ID dictionaries. The model lists are not referenced by the result, so they can be freed.
+    """
+    campaign_dict, attendee_dict = StringDictionary(), StringDictionary()
+    compacted = dict(data)
+    for name, model in (("responses", Response), ("activities", Activity)):
+        events = data.get(name, [])
+        if not isinstance(events, EventTable):
+            compacted[name] = EventTable.from_models(events, model, campaign_dict, attendee_dict)
+    return compacted
@@ -0,0 +1,34 @@
+"""
+field_specs.py
+
+Flattens the pydantic models in marketing_objects.py into simple field descriptions (name, base type, optional).
+Shared by the columnar snapshot format and the ingestion decoders so they agree on one view of each model.
+"""
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple, Union, get_args, get_origin, get_type_hints
+
+
+class FieldSpec(NamedTuple):
+    name: str
+    type: type  # str, int, float, bool or datetime
+    optional: bool
+
+
+@lru_cache(maxsize=None)
+def field_specs(model) -> Tuple[FieldSpec, ...]:
+    """
+    Return the model's fields in declaration order, unwrapping Optional[X] into (X, optional=True).
+    """
+    hints = get_type_hints(model)
+    # pydantic v2 exposes model_fields, v1 __fields__; both keep declaration order
+    names = getattr(model, "model_fields", None) or model.__fields__
+    specs: List[FieldSpec] = []
+    for name in names:
+        annotation = hints[name]
+        optional = False
+        if get_origin(annotation) is Union:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            optional = len(args) < len(get_args(annotation))
+            annotation = args[0]
+        specs.append(FieldSpec(name, annotation, optional))
+    return tuple(specs)
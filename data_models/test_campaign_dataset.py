@@ -0,0 +1,59 @@
+"""
+Unit tests for CampaignDataset indexes, aggregates and entity resolution.
+"""
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("numpy")
+pytest.importorskip("pyarrow")
+from data_models.campaign_dataset import CampaignDataset, normalize_email  # noqa: E402
+from data_models.marketing_objects import Account, Attendee, Contact, Opportunity  # noqa: E402
+
+
+def _dataset():
+    accounts = [Account.construct(id=f"acc{i}", name=f"Account {i}", industry=None, region=None) for i in range(3)]
+    contacts = [
+        Contact.construct(id="k1", name="Ada", email="ada@example.com", account_id="acc1"),
+        Contact.construct(id="k2", name="Bob", email="bob@example.com", account_id="acc2"),
+        Contact.construct(id="k3", name="Ada (dup)", email=" ADA@example.com", account_id="acc0"),
+    ]
+    attendees = [
+        Attendee.construct(id="p1", name="A. Lovelace", email="Ada@Example.com ", campaign_id="c1", account_id=None),
+        Attendee.construct(id="p2", name="Eve", email="eve@example.com", campaign_id="c1", account_id="acc0"),
+        Attendee.construct(id="p3", name="Bob", email="bob@example.com", campaign_id="c2", account_id="acc0"),
+    ]
+    opportunities = [Opportunity.construct(id="o1", account_id="acc2", campaign_id="c1", amount=500.0,
+                                           stage="Open", close_date=None)]
+    return CampaignDataset(campaigns=[], accounts=accounts, contacts=contacts, attendees=attendees,
+                           responses=[], activities=[], opportunities=opportunities)
+
+
+def test_normalize_email():
+    assert normalize_email("  Ada@Example.COM ") == "ada@example.com"
+    assert normalize_email("") is None and normalize_email("   ") is None and normalize_email(None) is None
+
+
+def test_contacts_and_accounts_resolve_by_email_and_account():
+    dataset = _dataset()
+    p1, p2, p3 = dataset.attendees
+    assert dataset.contact_for(p1).id == "k1"  # first contact with the normalized email wins
+    assert dataset.contact_for(p2) is None
+    # Attendees without an account fall back to their contact's account
+    assert dataset.account_for(p1).id == "acc1"
+    assert dataset.account_for(p3).id == "acc0"
+    # Key contacts are not restricted to the attendee's own account
+    assert [c.id for c in dataset.key_contacts(dataset.attendees)] == ["k1", "k2"]
+    assert [c.id for c in dataset.key_contacts(dataset.attendees, limit=1)] == ["k1"]
+    assert [a.id for a in dataset.accounts_for(dataset.attendees)] == ["acc1", "acc0"]
+    assert [(a.id, c.id if c else None) for a, c, _ in dataset.resolve(dataset.attendees)] == [
+        ("p1", "k1"), ("p2", None), ("p3", "k2")]
+
+
+def test_campaign_lookups():
+    dataset = _dataset()
+    assert [a.id for a in dataset.attendees_for("c1")] == ["p1", "p2"]
+    assert [c.id for c in dataset.contacts_by_account["acc1"]] == ["k1"]
+    aggregates = dataset.aggregates("c1")
+    assert (aggregates.attendee_count, aggregates.opportunity_count, aggregates.pipeline) == (2, 1, 500.0)
+    assert [a.id for a in dataset.key_accounts("c1")] == ["acc2"]
+    assert [a.id for a in dataset.attendee_accounts("c1")] == ["acc0"]
@@ -0,0 +1,85 @@
+"""
+Unit tests for EventTable: snapshot round trip and GroupIndex parity with the list-based dataset.
+"""
+from datetime import datetime, timezone
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("numpy")
+pytest.importorskip("pyarrow")
+from data_ingestion.snapshot import arrow_schema, read_snapshot, write_snapshot  # noqa: E402
+from data_models.campaign_dataset import CampaignDataset  # noqa: E402
+from data_models.event_table import EventTable, compact_events  # noqa: E402
+from data_models.marketing_objects import Activity, Campaign, Response  # noqa: E402
+
+UTC = timezone.utc
+FIELDS = ("id", "campaign_id", "attendee_id", "timestamp")
+
+
+def _data():
+    at = datetime(2026, 4, 1, 12, 0, tzinfo=UTC)
+    campaigns = [Campaign.construct(id=cid, name=cid, start_date=at, end_date=at, description=None)
+                 for cid in ("c1", "c2", "c3")]
+    activities = [
+        Activity.construct(id="a1", campaign_id="c2", attendee_id="p1", type="click", timestamp=at),
+        Activity.construct(id="a2", campaign_id="c1", attendee_id=None, type="email_open",
+                           timestamp=datetime(2026, 4, 2, 8, 30)),  # naive: taken as UTC
+        Activity.construct(id="a3", campaign_id="c2", attendee_id="p2", type="click", timestamp=at),
+        Activity.construct(id="a4", campaign_id="c1", attendee_id="p1", type="meeting", timestamp=at),
+    ]
+    # c3 only has a response, so it is in the shared campaign dictionary with no activities
+    responses = [
+        Response.construct(id="r1", attendee_id="p1", campaign_id="c1", response_type="attended", timestamp=at),
+        Response.construct(id="r2", attendee_id="p3", campaign_id="c3", response_type="no-show", timestamp=at),
+    ]
+    return {"campaigns": campaigns, "activities": activities, "responses": responses}
+
+
+def _rows(events, type_field):
+    def value(row, field):
+        ts = getattr(row, field)
+        return ts.replace(tzinfo=UTC) if field == "timestamp" and ts.tzinfo is None else ts
+    return [tuple(value(row, f) for f in FIELDS + (type_field,)) for row in events]
+
+
+def test_models_to_arrow_to_snapshot_round_trip(tmp_path):
+    data = _data()
+    compacted = compact_events(data)
+    table = compacted["activities"]
+    assert isinstance(table, EventTable) and len(table) == 4
+    assert _rows(table, "type") == _rows(data["activities"], "type")
+
+    arrow = table.to_arrow(arrow_schema(Activity))
+    assert arrow.schema.names == arrow_schema(Activity).names
+    assert _rows(EventTable.from_arrow(arrow, Activity), "type") == _rows(data["activities"], "type")
+
+    write_snapshot(compacted, str(tmp_path))
+    restored = read_snapshot(str(tmp_path), verify=True, event_tables=True)
+    assert isinstance(restored["activities"], EventTable)
+    assert _rows(restored["activities"], "type") == _rows(data["activities"], "type")
+    assert _rows(restored["responses"], "response_type") == _rows(data["responses"], "response_type")
+    assert restored["activities"][1].attendee_id is None
+    assert restored["activities"][1].timestamp == datetime(2026, 4, 2, 8, 30, tzinfo=UTC)
+    # Event tables of one snapshot share their ID dictionaries
+    assert restored["activities"].campaign_dict is restored["responses"].campaign_dict
+
+
+def test_group_index_matches_list_dataset():
+    data = _data()
+    lists = CampaignDataset.from_data(data)
+    columnar = CampaignDataset.from_data(data, columnar_events=True)
+    assert isinstance(columnar.activities, EventTable)
+
+    for cid in ("c1", "c2", "c3", "unknown"):
+        for accessor in ("activities_for", "responses_for"):
+            expected = [e.id for e in getattr(lists, accessor)(cid)]
+            assert [e.id for e in getattr(columnar, accessor)(cid)] == expected, (cid, accessor)
+    # c3 is a known key of the index with an empty group: same default as a missing key
+    assert columnar.activities_for("c3") == [] and "c3" not in columnar.activities_by_campaign
+    assert "c2" in columnar.activities_by_campaign
+
+    for pid in ("p1", "p2", "p3"):
+        expected = [a.id for a in lists.activities_by_attendee.get(pid, [])]
+        assert [a.id for a in columnar.activities_by_attendee.get(pid, [])] == expected, pid
+    by_type = columnar.activities.group_index("type")
+    assert [a.id for a in by_type.get("click")] == ["a1", "a3"]
@@ -0,0 +1,115 @@
+"""
+embedders.py
+
+Pluggable text embedders for EmbeddingsService. An embedder has a model name (part of the embedding cache
+key), a dim, and embed(texts) -> (n, dim) float32 array for one batch.
+- OpenAIEmbedder   OpenAI embeddings API (network; needs OPENAI_API_KEY)
+- HashingEmbedder  local CPU hashing vectorizer + sparse random projection; no network, no model files,
+                   deterministic across processes, so the memory layer runs offline (tests, air-gapped deployments)
+"""
+import hashlib
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Sequence, Tuple
+import numpy as np
+try:
+    import openai
+except ImportError:
+    openai = None
+
+DEFAULT_OPENAI_MODEL = "text-embedding-ada-002"
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class OpenAIEmbedder:
+    """
+    OpenAI embeddings API client. The API key is checked here rather than at import time.
+    """
+    remote = True
+
+    def __init__(self, model: str = DEFAULT_OPENAI_MODEL, dim: int = 1536, api_key: str = None):
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if openai is None:
+            raise ImportError("The openai package is required for OpenAIEmbedder.")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable not set.")
+        self.model = model
+        self.dim = dim
+        self.client = openai.OpenAI(api_key=api_key)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        response = self.client.embeddings.create(input=list(texts), model=self.model)
+        vectors = np.array([item.embedding for item in sorted(response.data, key=lambda d: d.index)], dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension mismatch: {vectors.shape[1]} != {self.dim}")
+        return vectors
+
+
+@lru_cache(maxsize=65536)
+def _feature_projection(feature: str, dim: int, nonzeros: int) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    """
+    Output positions and +/-1 signs for one feature: its column of a sparse random projection matrix,
+    derived from a stable hash so every process agrees without storing the matrix.
+    """
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=4 * nonzeros).digest()
+    positions, signs = [], []
+    for i in range(nonzeros):
+        value = int.from_bytes(digest[4 * i:4 * i + 4], "little")
+        positions.append((value >> 1) % dim)
+        signs.append(1.0 if value & 1 else -1.0)
+    return tuple(positions), tuple(signs)
+
+
+class HashingEmbedder:
+    """
+    Word unigram/bigram and character trigram features, hashed straight into dim outputs through a sparse
+    random projection (nonzeros signed entries per feature), with sublinear term frequency and L2 normalization.
+    Similar wording gives nearby vectors; there is no semantic knowledge beyond shared terms.
+    """
+    remote = False
+
+    def __init__(self, dim: int = 1536, nonzeros: int = 4, char_ngrams: int = 3):
+        self.dim = dim
+        self.nonzeros = nonzeros
+        self.char_ngrams = char_ngrams
+        self.model = f"hashing-v1-{dim}-{nonzeros}-{char_ngrams}"
+
+    def features(self, text: str) -> dict:
+        words = TOKEN_PATTERN.findall(text.lower())
+        counts = {}
+        grams = [f"w:{w}" for w in words] + [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        n = self.char_ngrams
+        for w in words:
+            padded = f" {w} "
+            grams.extend(f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+        for gram in grams:
+            counts[gram] = counts.get(gram, 0) + 1
+        return counts
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows, cols, values = [], [], []
+        for row, text in enumerate(texts):
+            for feature, count in self.features(text).items():
+                positions, signs = _feature_projection(feature, self.dim, self.nonzeros)
+                weight = 1.0 + math.log(count)
+                rows.extend([row] * self.nonzeros)
+                cols.extend(positions)
+                values.extend(weight * s for s in signs)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(vectors, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)),
+                  np.array(values, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, np.float32(1.0))
+
+
+def make_embedder(backend: str, dim: int = 1536, model: str = DEFAULT_OPENAI_MODEL):
+    """
+    Embedder for an EMBEDDING_BACKEND name: "openai" or "hashing".
+    """
+    if backend == "openai":
+        return OpenAIEmbedder(model=model, dim=dim)
+    if backend == "hashing":
+        return HashingEmbedder(dim=dim)
+    raise ValueError(f"Unknown embedding backend: {backend!r}")
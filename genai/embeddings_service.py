@@ -1,57 +1,158 @@
 """
 embeddings_service.py
 
-Provides embedding generation (OpenAI), local FAISS storage, and similarity search for executive summaries.
+Provides embedding generation (OpenAI or a local hashing embedder, see embedders.py), local FAISS storage,
+and similarity search for executive summaries.
+Texts are embedded in provider-sized batches and remote embeddings are cached on disk by hash of (model, text),
+so backfills, restarts and repeated queries never re-embed the same text. Query embeddings and search results
+are also kept in bounded in-process LRU/TTL caches; results are keyed by index version, which every add bumps.
 Modular, production-ready for future backend swap.
 """
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Sequence
 import numpy as np
-import faiss
-import openai
+from genai.embedders import DEFAULT_OPENAI_MODEL, make_embedder
+from genai.embedding_cache import EmbeddingCache, embedding_key
+from context_layer.query_cache import QueryCache
+from genai.tenant_index import PartitionedVectorIndex
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")  # "openai" or "hashing" (offline)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", DEFAULT_OPENAI_MODEL)
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))  # inputs per embedder call
+EMBEDDING_CACHE_DB = os.getenv("EMBEDDING_CACHE_DB", "embedding_cache.db")  # '' disables the disk cache
+# faiss.index_factory string, e.g. "Flat", "HNSW32", "IVF{nlist},SQfp16", "IVF{nlist},PQ64" (see vector_index.py)
+EMBEDDING_INDEX_FACTORY = os.getenv("EMBEDDING_INDEX_FACTORY", "Flat")
+EMBEDDING_INDEX_TRAIN_THRESHOLD = int(os.getenv("EMBEDDING_INDEX_TRAIN_THRESHOLD", "10000"))
+EMBEDDING_INDEX_SEARCH_PARAMS = os.getenv("EMBEDDING_INDEX_SEARCH_PARAMS", "")  # e.g. "nprobe=16"
+EMBEDDING_INDEX_DIR = os.getenv("EMBEDDING_INDEX_DIR", "")  # persistent index + WAL directory; '' keeps it in memory
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY environment variable not set.")
-openai.api_key = OPENAI_API_KEY
 
 class EmbeddingsService:
-    def __init__(self, dim: int = 1536):
-        self.dim = dim
-        self.index = faiss.IndexFlatL2(dim)
-        self.records: List[Dict[str, Any]] = []  # Store metadata for each vector
+    def __init__(self, dim: int = 1536, model: str = EMBEDDING_MODEL, batch_size: int = EMBEDDING_BATCH_SIZE,
+                 cache: Optional[EmbeddingCache] = None, index_factory: str = EMBEDDING_INDEX_FACTORY,
+                 train_threshold: int = EMBEDDING_INDEX_TRAIN_THRESHOLD,
+                 search_params: str = EMBEDDING_INDEX_SEARCH_PARAMS, persist_dir: str = EMBEDDING_INDEX_DIR,
+                 embedder=None):
+        """
+        embedder: OpenAIEmbedder, HashingEmbedder or any object with model, dim and embed(texts).
+        Defaults to the EMBEDDING_BACKEND embedder; its dim overrides dim.
+        """
+        self.embedder = embedder or make_embedder(EMBEDDING_BACKEND, dim=dim, model=model)
+        self.dim = self.embedder.dim
+        self.model = self.embedder.model
+        self.batch_size = batch_size
+        if cache is None and EMBEDDING_CACHE_DB and getattr(self.embedder, "remote", True):
+            # Local embedders are cheaper to recompute than to look up
+            cache = EmbeddingCache(EMBEDDING_CACHE_DB)
+        self.cache = cache
+        self.api_calls = 0
+        self.query_embeddings = QueryCache()
+        self.results = QueryCache()
+        self.version = 0  # bumped by every add; part of the result cache key
+        self.persist_dir = persist_dir
+        # With persist_dir, each tenant's saved index and metadata are memory-mapped and its WAL replayed
+        # Retraining re-embeds each partition's summaries, which the embedding cache turns into lookups
+        self.index = PartitionedVectorIndex(self.dim, index_factory, persist_dir,
+                                            raw_vectors=lambda records: self.embed_texts([r["summary"] for r in records]),
+                                            train_threshold=train_threshold, search_params=search_params)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def iter_records(self, business_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stored records of one business_id, or of every business (grouped by business_id) when None.
+        Streams from the partitions instead of copying the corpus.
+        """
+        if business_id is None:
+            return iter(self.index)
+        partition = self.index.partition(business_id)
+        return iter(partition.records) if partition else iter(())
 
     def embed_text(self, text: str) -> np.ndarray:
         """
-        Generate OpenAI embedding for a given text.
+        Embed a single text.
+        """
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed many texts as an (n, dim) float32 array. Cached vectors are reused; the remaining distinct
+        texts are sent in batches of batch_size and written back to the cache.
         """
-        response = openai.embeddings.create(
-            input=[text],
-            model="text-embedding-ada-002"
-        )
-        vec = np.array(response.data[0].embedding, dtype=np.float32)
-        if vec.shape[0] != self.dim:
-            raise ValueError(f"Embedding dimension mismatch: {vec.shape[0]} != {self.dim}")
-        return vec
+        keys = [embedding_key(self.model, t) for t in texts]
+        vectors: Dict[str, np.ndarray] = self.cache.get_many(list(dict.fromkeys(keys))) if self.cache is not None else {}
+        missing = {k: t for k, t in zip(keys, texts) if k not in vectors}
+        pending = list(missing.items())
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            embedded = self.embedder.embed([t for _, t in batch])
+            self.api_calls += 1
+            fresh = []
+            for (key, _), vec in zip(batch, embedded):
+                vectors[key] = vec
+                fresh.append((key, vec))
+            if self.cache is not None:
+                self.cache.put_many(fresh)
+        if not keys:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.stack([vectors[k] for k in keys])
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Embedding cache hit/miss counters plus the number of embedder calls made, with the query-embedding
+        and search-result cache counters under "query_embeddings" and "results".
+        """
+        stats = self.cache.stats() if self.cache is not None else {"hits": 0, "misses": 0, "hit_rate": 0.0}
+        stats["api_calls"] = self.api_calls
+        stats["query_embeddings"] = self.query_embeddings.stats()
+        stats["results"] = self.results.stats()
+        return stats
 
     def add_summary(self, summary: str, metadata: Optional[Dict[str, Any]] = None):
         """
         Embed and store a summary with optional metadata.
         """
-        vec = self.embed_text(summary)
-        self.index.add(np.expand_dims(vec, axis=0))
-        self.records.append({"summary": summary, "metadata": metadata or {}})
+        self.add_summaries([summary], [metadata])
+
+    def add_summaries(self, summaries: Sequence[str], metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None):
+        """
+        Bulk embed and store summaries (e.g., a history backfill) with one index insert per business_id.
+        """
+        if not summaries:
+            return
+        metadatas = metadatas or [None] * len(summaries)
+        vectors = self.embed_texts(summaries)
+        records = [{"summary": s, "metadata": m or {}} for s, m in zip(summaries, metadatas)]
+        self.index.add(vectors, records)
+        self.version += 1
 
-    def search(self, query: str, top_k: int = 3) -> List[Dict[str, Any]]:
+    def save(self):
+        """
+        Compact each tenant's write-ahead log into a new on-disk generation (requires persist_dir) and reopen
+        it memory-mapped.
         """
-        Embed query and return top_k most similar summaries (with metadata).
+        if not self.persist_dir:
+            raise ValueError("EmbeddingsService was created without a persist_dir")
+        self.index.compact()
+        self.version += 1
+
+    def search(self, query: str, top_k: int = 3, business_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        if len(self.records) == 0:
+        Embed query and return top_k most similar summaries (with metadata), searching only business_id's
+        sub-index when given.
+        """
+        if len(self.index) == 0:
+            return []
+        if business_id is not None and self.index.partition(business_id) is None:
             return []
-        qvec = self.embed_text(query)
-        D, I = self.index.search(np.expand_dims(qvec, axis=0), top_k)
-        results = []
-        for idx in I[0]:
-            if idx < len(self.records):
-                results.append(self.records[idx])
-        return results
+        key = (query, business_id, top_k, self.version)
+        results = self.results.get(key)
+        if results is None:
+            qvec = self.query_embeddings.get(query)
+            if qvec is None:
+                qvec = self.embed_text(query)
+                self.query_embeddings.put(query, qvec)
+            results = self.index.search(qvec, top_k, business_id=business_id)
+            self.results.put(key, results)
+        return list(results)
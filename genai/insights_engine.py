@@ -3,8 +3,14 @@ insights_engine.py
 
 Detects marketing anomalies, trends, high ROAS, and risk patterns.
 Outputs structured insight objects. Rule-based logic, extendable to ML.
+detect_insights_batch() evaluates the same rules as array operations over a campaign x KPI matrix
+and returns a columnar insight table; insights_from_table() turns rows back into Insight objects.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import numpy as np
+import pandas as pd
+from semantic_layer.ontology import resolve_metric_alias
+from genai.rule_engine import RuleEngine, get_rule_engine
 
 class Insight:
     def __init__(self, type: str, message: str, kpi: str = None, severity: str = "info", details: dict = None):
@@ -22,81 +28,104 @@ class Insight:
             "details": self.details
         }
 
-def detect_insights(semantic_data: Dict[str, Any], historical_data: Dict[str, Any]) -> List[Insight]:
+def detect_insights(semantic_data: Dict[str, Any], historical_data: Dict[str, Any], engine: RuleEngine = None) -> List[Insight]:
     """
     Rule-based detection of anomalies, trends, high ROAS, and risks.
+    Rules come from load_config()["insight_rules"] via the compiled RuleEngine; they are evaluated
+    in definition order, each over the KPIs in semantic_data order.
     Returns a list of structured Insight objects.
     """
+    engine = engine or get_rule_engine()
     insights = []
-    # 1. Anomaly: KPI drops > 15% vs historical
-    for kpi, meta in semantic_data.items():
-        val = meta.get("value")
-        hist = meta.get("historical_benchmark")
-        if val is not None and hist is not None:
-            try:
-                pct_change = (float(val) - float(hist)) / float(hist)
-                if pct_change < -0.15:
-                    insights.append(Insight(
-                        type="anomaly",
-                        message=f"{kpi} down {pct_change*100:.1f}% vs benchmark",
-                        kpi=kpi,
-                        severity="warning",
-                        details={"current": val, "benchmark": hist, "pct_change": pct_change}
-                    ))
-            except Exception:
-                pass
-    # 2. Trend acceleration: KPI up > 20% vs last period
-    for kpi, meta in semantic_data.items():
-        val = meta.get("value")
-        last = meta.get("last_period")
-        if val is not None and last is not None:
-            try:
-                pct_change = (float(val) - float(last)) / float(last)
-                if pct_change > 0.2:
-                    insights.append(Insight(
-                        type="trend_acceleration",
-                        message=f"{kpi} accelerated by {pct_change*100:.1f}% vs last period",
-                        kpi=kpi,
-                        severity="info",
-                        details={"current": val, "last_period": last, "pct_change": pct_change}
-                    ))
-            except Exception:
-                pass
-    # 3. High ROAS: ROAS > 4
-    roas = semantic_data.get("ROAS")
-    if roas and roas.get("value") is not None:
-        try:
-            if float(roas["value"]) > 4:
+    for rule in engine.rules:
+        for kpi, meta in semantic_data.items():
+            if not rule.applies_to(kpi):
+                continue
+            fields = rule.evaluate(kpi, meta)
+            if fields is not None:
                 insights.append(Insight(
-                    type="high_roas",
-                    message="ROAS exceeds 4: high return on ad spend",
-                    kpi="ROAS",
-                    severity="info",
-                    details={"roas": roas["value"]}
+                    type=rule.type,
+                    message=rule.format_message(fields),
+                    kpi=kpi,
+                    severity=rule.severity,
+                    details=rule.details_for(fields)
                 ))
-        except Exception:
-            pass
-    # 4. Risk: Conversion Rate < 1% or negative trend
-    conv = semantic_data.get("Conversion Rate")
-    if conv and conv.get("value") is not None:
-        try:
-            if float(conv["value"]) < 1:
-                insights.append(Insight(
-                    type="risk",
-                    message="Conversion Rate below 1%",
-                    kpi="Conversion Rate",
-                    severity="critical",
-                    details={"conversion_rate": conv["value"]}
-                ))
-            last = conv.get("last_period")
-            if last is not None and float(conv["value"]) < float(last):
-                insights.append(Insight(
-                    type="risk",
-                    message="Conversion Rate declining vs last period",
-                    kpi="Conversion Rate",
-                    severity="warning",
-                    details={"current": conv["value"], "last_period": last}
-                ))
-        except Exception:
-            pass
+    return insights
+
+
+INSIGHT_COLUMNS = ["entity_id", "rule", "type", "kpi", "severity", "value", "reference", "pct_change"]
+
+
+def _canonical_matrix(frame: Optional[pd.DataFrame], index: pd.Index = None, columns: pd.Index = None) -> Optional[pd.DataFrame]:
+    """
+    Numeric copy of a KPI matrix with canonical column names, aligned to (index, columns) when given.
+    """
+    if frame is None:
+        return None
+    renamed = {}
+    for name in frame.columns:
+        resolution = resolve_metric_alias(str(name))
+        renamed[name] = resolution.canonical if resolution else name
+    frame = frame.rename(columns=renamed)
+    frame = frame.loc[:, ~frame.columns.duplicated(keep="last")].apply(pd.to_numeric, errors="coerce")
+    if index is not None:
+        frame = frame.reindex(index=index, columns=columns)
+    return frame.astype(np.float64)
+
+
+def _hits(mask: np.ndarray, index: pd.Index, columns: pd.Index, rule, value: np.ndarray,
+          reference: Optional[np.ndarray] = None, pct_change: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    rows, cols = np.nonzero(mask)
+    nan = np.full(len(rows), np.nan)
+    return {
+        "entity_id": index.to_numpy()[rows],
+        "rule": np.full(len(rows), rule.name, dtype=object),
+        "type": np.full(len(rows), rule.type, dtype=object),
+        "kpi": columns.to_numpy()[cols],
+        "severity": np.full(len(rows), rule.severity, dtype=object),
+        "value": value[rows, cols],
+        "reference": reference[rows, cols] if reference is not None else nan,
+        "pct_change": pct_change[rows, cols] if pct_change is not None else nan,
+    }
+
+
+def detect_insights_batch(current: pd.DataFrame, last_period: pd.DataFrame = None,
+                          benchmark: pd.DataFrame = None, engine: RuleEngine = None) -> pd.DataFrame:
+    """
+    Vectorized detect_insights() over a campaign x KPI matrix (e.g., compute_portfolio_metrics() output).
+    last_period and benchmark are optional matrices of the same shape; columns may use any known alias.
+    Each compiled rule is one array expression. Returns one row per insight with INSIGHT_COLUMNS,
+    grouped by rule in definition order.
+    """
+    engine = engine or get_rule_engine()
+    current = _canonical_matrix(current)
+    index, columns = current.index, current.columns
+    values = current.to_numpy()
+    references = {}
+    for field, frame in (("last_period", last_period), ("historical_benchmark", benchmark)):
+        aligned = _canonical_matrix(frame, index, columns)
+        references[field] = aligned.to_numpy() if aligned is not None else None
+    parts = []
+    for rule in engine.rules:
+        mask, ref, pct = rule.mask(list(columns), values, references)
+        parts.append(_hits(mask, index, columns, rule, values, ref, pct))
+    if not parts:
+        return pd.DataFrame(columns=INSIGHT_COLUMNS)
+    return pd.DataFrame({name: np.concatenate([p[name] for p in parts]) for name in INSIGHT_COLUMNS})
+
+
+def insights_from_table(table: pd.DataFrame, engine: RuleEngine = None) -> List[Insight]:
+    """
+    Materialize detect_insights_batch() rows as Insight objects, with messages and details from their rule.
+    """
+    engine = engine or get_rule_engine()
+    insights = []
+    for row in table.itertuples(index=False):
+        rule = engine.rule(row.rule)
+        reference = None if pd.isna(row.reference) else float(row.reference)
+        fields = rule.fields(row.kpi, float(row.value), reference) if rule else {}
+        details = rule.details_for(fields) if rule else {}
+        details["entity_id"] = row.entity_id
+        message = rule.format_message(fields) if rule else row.type
+        insights.append(Insight(type=row.type, message=message, kpi=row.kpi, severity=row.severity, details=details))
     return insights
@@ -0,0 +1,115 @@
+"""
+metrics_engine.py
+
+Portfolio-wide KPI engine: computes the _extract_raw_metrics() KPI set for every campaign in one grouped,
+columnar pass over a CampaignDataset and returns a campaign x KPI DataFrame.
+The same pass can be grouped by an account attribute (region, industry) instead of campaign.
+Per-campaign callers become a row lookup via campaign_metrics_row().
+"""
+from typing import Any, Dict, Sequence
+import numpy as np
+import pandas as pd
+from data_models.campaign_dataset import CampaignDataset
+from data_models.event_table import EventTable
+
+# Same keys, in the same order, as genai.summary._extract_raw_metrics
+KPI_COLUMNS = [
+    "Number of attendees",
+    "Number of opportunities",
+    "Pipeline",
+    "customer acquisition cost",
+    "LTV",
+    "roas",
+    "Click Through Rate",
+    "Conversion Rate",
+]
+COUNT_COLUMNS = ["Number of attendees", "Number of opportunities"]
+
+
+def _column(items: Sequence[Any], field: str) -> pd.Series:
+    """
+    One column of a model list or EventTable; EventTable columns stay dictionary-encoded as a Categorical.
+    """
+    if isinstance(items, EventTable):
+        codes, dictionary = {
+            "campaign_id": (items.campaign_codes, items.campaign_dict),
+            "attendee_id": (items.attendee_codes, items.attendee_dict),
+        }[field]
+        return pd.Series(pd.Categorical.from_codes(codes, categories=dictionary.values))
+    return pd.Series([getattr(item, field) for item in items], dtype=object)
+
+
+def _kpis(attendees: pd.Series, opportunities: pd.Series, pipeline: pd.Series, activities: pd.Series) -> pd.DataFrame:
+    """
+    Vectorized form of the _extract_raw_metrics() formulas. CAC is NaN where there are no opportunities,
+    mirroring the scalar path which omits the key.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        has_attendees = attendees > 0
+        table = pd.DataFrame({
+            "Number of attendees": attendees.astype(np.int64),
+            "Number of opportunities": opportunities.astype(np.int64),
+            "Pipeline": pipeline.astype(np.float64),
+            "customer acquisition cost": (pipeline / opportunities).where(opportunities > 0),
+            "LTV": (pipeline / attendees).where(has_attendees, 0.0),
+            "roas": pipeline.astype(np.float64),
+            "Click Through Rate": (activities / attendees * 100).where(has_attendees, 0.0),
+            "Conversion Rate": (opportunities / attendees * 100).where(has_attendees, 0.0),
+        })
+    return table[KPI_COLUMNS]
+
+
+def _grouped_counts(attendee_keys: pd.Series, opp_keys: pd.Series, amounts: pd.Series,
+                    activity_keys: pd.Series, index: pd.Index) -> pd.DataFrame:
+    def size(keys: pd.Series) -> pd.Series:
+        return keys.value_counts(dropna=True).reindex(index, fill_value=0)
+
+    pipeline = amounts.groupby(opp_keys.values, observed=True).sum().reindex(index, fill_value=0.0)
+    return _kpis(size(attendee_keys), size(opp_keys), pipeline, size(activity_keys))
+
+
+def compute_portfolio_metrics(dataset: CampaignDataset) -> pd.DataFrame:
+    """
+    KPI table indexed by campaign_id, one row per campaign in the dataset (campaigns without activity get zeros).
+    """
+    index = pd.Index([c.id for c in dataset.campaigns], name="campaign_id")
+    amounts = pd.Series([getattr(o, "amount", 0) or 0 for o in dataset.opportunities], dtype=np.float64)
+    return _grouped_counts(
+        _column(dataset.attendees, "campaign_id"),
+        _column(dataset.opportunities, "campaign_id"),
+        amounts,
+        _column(dataset.activities, "campaign_id"),
+        index,
+    )
+
+
+def compute_group_metrics(dataset: CampaignDataset, by: str = "region") -> pd.DataFrame:
+    """
+    KPI table grouped by an account attribute ('region' or 'industry'). Attendees and opportunities are
+    attributed through their account; activities through their attendee's account.
+    """
+    account_attr = pd.Series({a.id: getattr(a, by) for a in dataset.accounts}, dtype=object)
+    attendee_account = pd.Series({a.id: a.account_id for a in dataset.attendees}, dtype=object)
+    attendee_keys = _column(dataset.attendees, "account_id").map(account_attr)
+    opp_keys = _column(dataset.opportunities, "account_id").map(account_attr)
+    activity_accounts = _column(dataset.activities, "attendee_id").astype(object).map(attendee_account)
+    activity_keys = activity_accounts.map(account_attr)
+    index = pd.Index(sorted(v for v in account_attr.dropna().unique()), name=by)
+    amounts = pd.Series([getattr(o, "amount", 0) or 0 for o in dataset.opportunities], dtype=np.float64)
+    return _grouped_counts(attendee_keys, opp_keys, amounts, activity_keys, index)
+
+
+def campaign_metrics_row(table: pd.DataFrame, campaign_id: str) -> Dict[str, Any]:
+    """
+    Row lookup returning the same dict as _extract_raw_metrics() for that campaign.
+    """
+    if campaign_id not in table.index:
+        return {}
+    row = table.loc[campaign_id]
+    metrics = {}
+    for name in KPI_COLUMNS:
+        value = row[name]
+        if pd.isna(value):
+            continue
+        metrics[name] = int(value) if name in COUNT_COLUMNS else float(value)
+    return metrics
@@ -0,0 +1,179 @@
+"""
+rule_engine.py
+
+Compiles the declarative insight rules from load_config()["insight_rules"] (see config.py) into predicate
+functions that run on a single normalized-metrics dict or on whole campaign x KPI arrays.
+Rules are compiled once and recompiled only when the config YAML's mtime changes; evaluation never
+re-reads YAML or re-parses rule definitions.
+"""
+import operator
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import config as app_config
+
+OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+MEASURES = ("value", "pct_change", "delta")
+
+
+class CompiledRule:
+    """
+    One insight rule with its operator, threshold lookup and message template resolved up front.
+    """
+
+    def __init__(self, spec: Dict[str, Any], config: Dict[str, Any]):
+        self.name = spec["name"]
+        self.type = spec.get("type", self.name)
+        kpi = spec.get("kpi", "*")
+        self.kpi: Optional[str] = None if kpi == "*" else kpi
+        self.reference: Optional[str] = spec.get("reference")
+        self.measure = spec.get("measure", "value")
+        if self.measure not in MEASURES:
+            raise ValueError(f"Rule '{self.name}': unknown measure '{self.measure}'")
+        if self.measure != "value" and not self.reference:
+            raise ValueError(f"Rule '{self.name}': measure '{self.measure}' needs a reference")
+        try:
+            self.op = OPERATORS[spec["op"]]
+        except KeyError:
+            raise ValueError(f"Rule '{self.name}': unknown operator '{spec.get('op')}'")
+        threshold = spec["threshold"]
+        # A string threshold names a per-KPI config section, e.g. 'metric_thresholds'
+        self.thresholds: Optional[Dict[str, float]] = (
+            {k: float(v) for k, v in config[threshold].items()} if isinstance(threshold, str) else None)
+        self.threshold: Optional[float] = None if isinstance(threshold, str) else float(threshold)
+        self.severity = spec.get("severity", "info")
+        self.message = spec.get("message", f"{self.name}: {{kpi}}")
+        self.details: Dict[str, str] = spec.get("details") or {"current": "value"}
+
+    def applies_to(self, kpi: str) -> bool:
+        return self.kpi is None or self.kpi == kpi
+
+    def threshold_for(self, kpi: str) -> Optional[float]:
+        return self.threshold if self.thresholds is None else self.thresholds.get(kpi)
+
+    def fields(self, kpi: str, value: float, reference: Optional[float]) -> Dict[str, Any]:
+        pct_change = (value - reference) / reference if reference not in (None, 0) else None
+        return {"kpi": kpi, "value": value, "reference": reference, "pct_change": pct_change,
+                "pct": pct_change * 100 if pct_change is not None else None}
+
+    def evaluate(self, kpi: str, meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Template fields for this KPI if the rule fires, else None. Non-numeric inputs never fire.
+        """
+        threshold = self.threshold_for(kpi)
+        if threshold is None or meta.get("value") is None:
+            return None
+        try:
+            value = float(meta["value"])
+            reference = None
+            if self.reference:
+                if meta.get(self.reference) is None:
+                    return None
+                reference = float(meta[self.reference])
+        except (TypeError, ValueError):
+            return None
+        fields = self.fields(kpi, value, reference)
+        measured = {"value": value, "pct_change": fields["pct_change"],
+                    "delta": value - reference if reference is not None else None}[self.measure]
+        if measured is None or not self.op(measured, threshold):
+            return None
+        return fields
+
+    def mask(self, columns: List[str], values: np.ndarray, references: Dict[str, Optional[np.ndarray]]) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Vectorized evaluate() over a rows x KPI array: (hit mask, reference array, pct_change array).
+        """
+        thresholds = np.array([
+            self.threshold_for(c) if self.applies_to(c) and self.threshold_for(c) is not None else np.nan
+            for c in columns], dtype=np.float64)[np.newaxis, :]
+        ref = references.get(self.reference) if self.reference else None
+        if self.reference and ref is None:
+            return np.zeros(values.shape, dtype=bool), None, None
+        pct = None
+        if ref is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                pct = np.where(ref != 0, (values - ref) / ref, np.nan)
+        measured = {"value": values, "pct_change": pct, "delta": values - ref if ref is not None else None}[self.measure]
+        with np.errstate(invalid="ignore"):
+            hits = self.op(measured, thresholds) & ~np.isnan(measured) & ~np.isnan(thresholds)
+        return hits, ref, pct
+
+    def details_for(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: fields[source] for key, source in self.details.items()}
+
+    def format_message(self, fields: Dict[str, Any]) -> str:
+        return self.message.format(**fields)
+
+
+def compile_rules(config: Dict[str, Any]) -> List[CompiledRule]:
+    return [CompiledRule(spec, config) for spec in config.get("insight_rules", [])]
+
+
+class RuleEngine:
+    """
+    Holds the compiled rules and hot-reloads them when the config YAML changes (one os.stat per access).
+    Pass rules=[...] to pin an explicit rule set (no reloading).
+    """
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None):
+        self.config_path = app_config.CONFIG_PATH
+        self._pinned = rules is not None
+        self._lock = threading.Lock()
+        self._mtime: Optional[int] = self._config_mtime()
+        config = app_config.load_config()
+        if rules is not None:
+            config["insight_rules"] = rules
+        self._rules = compile_rules(config)
+
+    def _config_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+
+    @property
+    def rules(self) -> List[CompiledRule]:
+        if not self._pinned:
+            mtime = self._config_mtime()
+            if mtime != self._mtime:
+                with self._lock:
+                    if mtime != self._mtime:
+                        self._reload(mtime)
+        return self._rules
+
+    def _reload(self, mtime: Optional[int]):
+        try:
+            rules = compile_rules(app_config.load_config())
+        except Exception as e:
+            # Keep serving the last good rule set
+            print(f"[WARN] Ignoring invalid insight rules in {self.config_path}: {e}")
+        else:
+            self._rules = rules
+        self._mtime = mtime
+
+    def rule(self, name: str) -> Optional[CompiledRule]:
+        return next((r for r in self.rules if r.name == name), None)
+
+
+_engine: Optional[RuleEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_rule_engine() -> RuleEngine:
+    """
+    Process-wide engine compiled from load_config().
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RuleEngine()
+    return _engine
@@ -4,12 +4,17 @@
 
 import openai
 import os
+import threading
+from datetime import datetime, timezone
 from typing import List, Dict, Any
 from data_models.marketing_objects import Campaign, Attendee, Response, Activity, Contact, Account, Opportunity
+from data_models.campaign_dataset import CampaignDataset
+from genai.metrics_engine import campaign_metrics_row
 from semantic_layer.metric_normalizer import normalize_marketing_metrics
 from context_layer.narrative_memory import NarrativeMemory
 from context_layer.retrieval_engine import RetrievalEngine
 from context_layer.context_builder import ContextBuilder
+from context_layer.metric_history import MetricHistoryStore
 from genai.prompt_builder import PromptBuilder
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -19,6 +24,35 @@ if not OPENAI_API_KEY:
 openai.api_key = OPENAI_API_KEY
 
 
+_default_memory = None
+_default_retriever = None
+_defaults_lock = threading.Lock()
+
+
+def get_default_memory() -> NarrativeMemory:
+    """
+    Process-wide NarrativeMemory used when generate_summary() is not given one.
+    """
+    global _default_memory
+    if _default_memory is None:
+        with _defaults_lock:
+            if _default_memory is None:
+                _default_memory = NarrativeMemory()
+    return _default_memory
+
+
+def get_default_retriever() -> RetrievalEngine:
+    """
+    Process-wide RetrievalEngine, so its BM25 index accumulates generated summaries across calls.
+    """
+    global _default_retriever
+    if _default_retriever is None:
+        with _defaults_lock:
+            if _default_retriever is None:
+                _default_retriever = RetrievalEngine()
+    return _default_retriever
+
+
 def _extract_raw_metrics(campaigns, attendees, responses, activities, contacts, accounts, opportunities) -> Dict[str, Any]:
     metrics = {}
     # Example calculations (customize as needed for your business logic):
@@ -51,22 +85,46 @@ def generate_summary(
     program_name: str = None,
     user_prompt: str = None,
     debug: bool = False,
-    business_id: str = None
+    business_id: str = None,
+    dataset: CampaignDataset = None,
+    metrics_table=None,
+    metric_history: MetricHistoryStore = None,
+    memory: NarrativeMemory = None,
+    retriever: RetrievalEngine = None
 ) -> str:
     """
     Executive summary pipeline:
     Raw Input -> Semantic Normalization -> Context Enrichment -> Prompt Builder -> LLM Call
+    Contact and account enrichment uses the snapshot's CampaignDataset indexes; without a dataset, a throwaway
+    one is built from attendees/contacts/accounts in linear time.
+    For a single campaign, a precomputed portfolio metrics_table (see metrics_engine.py) replaces
+    the per-call KPI computation with a row lookup.
+    With a metric_history store, KPIs are enriched with prior-period and trailing-benchmark values
+    (per campaign, or per business for multi-campaign calls) and the current values are recorded.
+    memory and retriever (default: process-wide instances) supply prior context and index each new summary.
     """
     # 1. Semantic Normalization
-    raw_metrics = _extract_raw_metrics(
-        campaigns, attendees, responses, activities, contacts, accounts, opportunities)
+    raw_metrics = None
+    if metrics_table is not None and len(campaigns) == 1:
+        raw_metrics = campaign_metrics_row(metrics_table, campaigns[0].id) or None
+    if raw_metrics is None:
+        raw_metrics = _extract_raw_metrics(
+            campaigns, attendees, responses, activities, contacts, accounts, opportunities)
     normalized_metrics = normalize_marketing_metrics(raw_metrics)
+    if metric_history is not None:
+        if len(campaigns) == 1:
+            scope, entity_id = "campaign", campaigns[0].id
+        else:
+            scope, entity_id = "business", business_id
+        if entity_id:
+            metric_history.enrich(normalized_metrics, scope, entity_id)
+            metric_history.record(scope, entity_id, normalized_metrics)
     strategic_tags = list(
         {meta["category"] for meta in normalized_metrics.values() if "category" in meta})
 
     # 2. Context Enrichment
-    memory = NarrativeMemory()
-    retriever = RetrievalEngine()
+    memory = memory or get_default_memory()
+    retriever = retriever or get_default_retriever()
     context_builder = ContextBuilder(memory, retriever)
     # For demo: retrieve historical context using a key metric or campaign name
     hist_context = context_builder.build_context(
@@ -75,19 +133,14 @@ def generate_summary(
 
 
     # --- Extract key contacts and notable accounts ---
-    key_contacts = []
-    for att in attendees:
-        for c in contacts:
-            if att.name == c.name and att.email == c.email:
-                key_contacts.append(f"{c.name} ({c.email})")
-                break
-        if len(key_contacts) >= 3:
-            break
+    if dataset is None:
+        dataset = CampaignDataset(campaigns=[], accounts=accounts, contacts=contacts, attendees=attendees,
+                                  responses=[], activities=[], opportunities=[])
+    key_contacts = [f"{c.name} ({c.email})" for c in dataset.key_contacts(attendees, limit=3)]
     if not key_contacts and attendees:
         key_contacts = [f"{a.name} ({a.email})" for a in attendees[:3]]
 
-    attendee_account_ids = set(a.account_id for a in attendees if a.account_id)
-    notable_accounts = [a.name for a in accounts if a.id in attendee_account_ids]
+    notable_accounts = [a.name for a in dataset.accounts_for(attendees)]
 
     # 3. Prompt Builder
     prompt_builder = PromptBuilder()
@@ -120,7 +173,12 @@ def generate_summary(
             ],
             max_tokens=400
         )
-        return chat_response.choices[0].message.content.strip()
+        summary_text = chat_response.choices[0].message.content.strip()
     except Exception as e:
         print(f"[ERROR] Exception during OpenAI call: {e}")
         return "[ERROR] Failed to generate summary. Please check your OpenAI API key and try again."
+    timestamp = datetime.now(timezone.utc).isoformat()
+    memory.add_summary(business_id, summary_text, campaign=program_name, timestamp=timestamp)
+    retriever.add_data({"business_id": business_id, "summary": summary_text, "campaign": program_name,
+                        "timestamp": timestamp})
+    return summary_text
@@ -0,0 +1,143 @@
+"""
+tenant_index.py
+
+Per-business_id partitioning for EmbeddingsService. Each tenant gets its own VectorIndex and record list
+(and, when persisted, its own VectorStore directory), so a tenant-scoped search costs the same as searching
+that tenant's corpus alone and fills top_k whenever the tenant has enough summaries.
+Unscoped searches query every partition and merge the hits by distance.
+"""
+import hashlib
+import heapq
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from genai.vector_index import VectorIndex, as_vector_batch
+from genai.vector_store import VectorStore
+
+TENANTS_FILE = "tenants.json"
+DEFAULT_TENANT = ""  # records without a business_id
+
+
+def tenant_key(business_id: Any) -> str:
+    return DEFAULT_TENANT if business_id is None else str(business_id)
+
+
+class TenantPartition:
+    """
+    One tenant's vectors and records, optionally persisted through a VectorStore.
+    raw_vectors(records), if given, re-derives exact vectors for the index to retrain on.
+    """
+
+    def __init__(self, index: VectorIndex, records: Sequence[Dict[str, Any]], store: Optional[VectorStore] = None,
+                 raw_vectors: Optional[Callable[[Sequence[Dict[str, Any]]], np.ndarray]] = None):
+        self.index = index
+        self.records = records
+        self.store = store
+        self.raw_vectors = raw_vectors
+        self._attach()
+
+    def _attach(self):
+        if self.raw_vectors is not None:
+            self.index.raw_source = lambda: self.raw_vectors(self.records)
+
+    def add(self, vectors: np.ndarray, records: List[Dict[str, Any]]):
+        vectors = as_vector_batch(vectors, self.index.dim, len(records))
+        if self.store:
+            self.store.append(vectors, records)
+        # Records first, so a retrain triggered by this add sees every record
+        self.records.extend(records)
+        self.index.add(vectors)
+
+    def search(self, query: np.ndarray, top_k: int) -> List[Tuple[float, Dict[str, Any]]]:
+        if len(self.records) == 0:
+            return []
+        distances, ids = self.index.search(np.expand_dims(query, axis=0), top_k)
+        # ANN indexes pad missing hits with -1
+        return [(float(d), self.records[i]) for d, i in zip(distances[0], ids[0]) if 0 <= i < len(self.records)]
+
+    def compact(self):
+        if self.store:
+            self.index, self.records = self.store.compact(self.index, self.records)
+            self._attach()
+
+
+class PartitionedVectorIndex:
+    """
+    business_id -> TenantPartition. With persist_dir, partitions live in hashed subdirectories listed in
+    tenants.json and are opened (memory-mapped) at construction. raw_vectors is passed to every partition.
+    """
+
+    def __init__(self, dim: int, factory: str, persist_dir: str = "",
+                 raw_vectors: Optional[Callable[[Sequence[Dict[str, Any]]], np.ndarray]] = None, **index_kwargs):
+        self.dim = dim
+        self.factory = factory
+        self.persist_dir = persist_dir
+        self.raw_vectors = raw_vectors
+        self.index_kwargs = index_kwargs
+        self.partitions: Dict[str, TenantPartition] = {}
+        self._dirs: Dict[str, str] = {}
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+            path = os.path.join(persist_dir, TENANTS_FILE)
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    self._dirs = json.load(f)
+            for key in self._dirs:
+                self.partitions[key] = self._open(key)
+
+    def __len__(self) -> int:
+        return sum(len(p.records) for p in self.partitions.values())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for partition in self.partitions.values():
+            yield from partition.records
+
+    def _open(self, key: str) -> TenantPartition:
+        if not self.persist_dir:
+            return TenantPartition(VectorIndex(self.dim, self.factory, **self.index_kwargs), [],
+                                   raw_vectors=self.raw_vectors)
+        store = VectorStore(os.path.join(self.persist_dir, self._dirs[key]), self.dim, self.factory,
+                            **self.index_kwargs)
+        index, records = store.open()
+        return TenantPartition(index, records, store, raw_vectors=self.raw_vectors)
+
+    def partition(self, business_id: Any, create: bool = False) -> Optional[TenantPartition]:
+        key = tenant_key(business_id)
+        partition = self.partitions.get(key)
+        if partition is None and create:
+            if self.persist_dir:
+                self._dirs[key] = "tenant-" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+                tmp_path = os.path.join(self.persist_dir, TENANTS_FILE + ".tmp")
+                with open(tmp_path, "w") as f:
+                    json.dump(self._dirs, f, indent=2)
+                os.replace(tmp_path, os.path.join(self.persist_dir, TENANTS_FILE))
+            partition = self.partitions[key] = self._open(key)
+        return partition
+
+    def add(self, vectors: np.ndarray, records: List[Dict[str, Any]]):
+        """
+        Route each (vector, record) to its tenant by record["metadata"]["business_id"]; one add per tenant.
+        """
+        groups: Dict[str, List[int]] = {}
+        for i, record in enumerate(records):
+            groups.setdefault(tenant_key(record["metadata"].get("business_id")), []).append(i)
+        for key, positions in groups.items():
+            partition = self.partition(key, create=True)
+            partition.add(vectors[positions], [records[i] for i in positions])
+
+    def search(self, query: np.ndarray, top_k: int, business_id: Any = None) -> List[Dict[str, Any]]:
+        """
+        top_k nearest records within one tenant, or across all tenants when business_id is None.
+        """
+        if business_id is not None:
+            partition = self.partitions.get(tenant_key(business_id))
+            return [record for _, record in partition.search(query, top_k)] if partition else []
+        hits = []
+        for partition in self.partitions.values():
+            hits.extend(partition.search(query, top_k))
+        return [record for _, record in heapq.nsmallest(top_k, hits, key=lambda hit: hit[0])]
+
+    def compact(self):
+        for partition in self.partitions.values():
+            partition.compact()
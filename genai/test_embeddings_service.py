@@ -0,0 +1,98 @@
+"""
+Unit tests for EmbeddingsService batching, de-duplication and the on-disk embedding cache.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+from genai.embedding_cache import EmbeddingCache  # noqa: E402
+from genai.embeddings_service import EmbeddingsService  # noqa: E402
+
+DIM = 4
+
+
+class CountingEmbedder:
+    """Deterministic remote-style embedder that records every batch it is asked to embed."""
+    model = "counting-test"
+    dim = DIM
+    remote = True
+
+    def __init__(self):
+        self.batches = []
+
+    def embed(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[len(t), i, 0, 1] for i, t in enumerate(texts)], dtype=np.float32)
+
+
+def _service(embedder, cache):
+    return EmbeddingsService(embedder=embedder, cache=cache, batch_size=2, persist_dir="")
+
+
+def test_batches_split_and_duplicates_embedded_once(tmp_path):
+    embedder = CountingEmbedder()
+    service = _service(embedder, EmbeddingCache(str(tmp_path / "cache.db")))
+    vectors = service.embed_texts(["a", "bb", "a", "ccc", "dddd", "bb", "eeeee"])
+    assert vectors.shape == (7, DIM)
+    assert [len(batch) for batch in embedder.batches] == [2, 2, 1]
+    assert sorted(t for batch in embedder.batches for t in batch) == ["a", "bb", "ccc", "dddd", "eeeee"]
+    # Duplicates get the same vector as their first occurrence
+    assert np.array_equal(vectors[0], vectors[2]) and np.array_equal(vectors[1], vectors[5])
+    stats = service.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["api_calls"]) == (0, 5, 3)
+    assert service.embed_texts([]).shape == (0, DIM)
+
+
+def test_second_instance_hits_disk_cache(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = _service(CountingEmbedder(), EmbeddingCache(path))
+    expected = first.embed_texts(["alpha", "beta", "gamma"])
+    first.cache.close()
+
+    embedder = CountingEmbedder()
+    second = _service(embedder, EmbeddingCache(path))
+    vectors = second.embed_texts(["gamma", "alpha", "delta"])
+    assert embedder.batches == [["delta"]]
+    assert np.array_equal(vectors[0], expected[2]) and np.array_equal(vectors[1], expected[0])
+    stats = second.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["api_calls"]) == (2, 1, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+    assert second.cache.count() == 4
+
+
+def test_records_are_counted_and_streamed_per_business():
+    service = _service(CountingEmbedder(), EmbeddingCache())
+    service.add_summaries(["a1", "b1", "a2"], [{"business_id": "a"}, {"business_id": "b"}, {"business_id": "a"}])
+    assert len(service) == 3
+    assert [r["summary"] for r in service.iter_records("a")] == ["a1", "a2"]
+    assert list(service.iter_records("missing")) == []
+    assert sorted(r["summary"] for r in service.iter_records()) == ["a1", "a2", "b1"]
+
+
+def _texts(start, n):
+    return [f"summary number {i} " + "x" * (i % 7) for i in range(start, start + n)]
+
+
+def test_retraining_reads_the_cache_instead_of_the_embedder(tmp_path):
+    embedder = CountingEmbedder()
+    kwargs = {"index_factory": "IVF{nlist},SQ8", "train_threshold": 10}
+    service = EmbeddingsService(embedder=embedder, cache=EmbeddingCache(), batch_size=64, persist_dir="", **kwargs)
+    service.add_summaries(_texts(0, 10))
+    partition = service.index.partition(None)
+    assert partition.index.trained_size == 10
+    calls = service.api_calls
+    service.add_summaries(_texts(10, 30))  # 40 >= 4 x 10: retrain on the exact vectors of the whole corpus
+    assert partition.index.trained_size == 40
+    assert service.api_calls == calls + 1  # only the 30 new summaries were embedded
+
+    # Compaction folds the delta of a reopened store and retrains from exact vectors too
+    path = str(tmp_path / "index")
+    service = EmbeddingsService(embedder=embedder, cache=EmbeddingCache(), batch_size=64, persist_dir=path, **kwargs)
+    service.add_summaries(_texts(0, 10))
+    service.save()
+    reopened = EmbeddingsService(embedder=embedder, cache=service.cache, batch_size=64, persist_dir=path, **kwargs)
+    reopened.add_summaries(_texts(10, 30))
+    calls = reopened.api_calls
+    reopened.save()
+    assert reopened.index.partition(None).index.trained_size == 40
+    assert reopened.api_calls == calls
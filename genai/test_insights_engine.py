@@ -0,0 +1,66 @@
+"""
+Unit tests checking that batch insight detection matches the per-campaign scalar path.
+"""
+import math
+import pytest
+
+pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("yaml")
+pytest.importorskip("dotenv")
+from config import DEFAULT_CONFIG  # noqa: E402
+from genai.insights_engine import detect_insights, detect_insights_batch, insights_from_table  # noqa: E402
+from genai.rule_engine import RuleEngine  # noqa: E402
+
+NAN = float("nan")
+KPIS = ["CTR", "ROAS", "Conversion Rate", "CAC"]
+CURRENT = {
+    "c1": [1.2, 5.0, 0.5, 180.0],
+    "c2": [3.0, 2.0, 6.0, 100.0],
+    "c3": [2.0, NAN, 4.0, 0.0],
+}
+LAST_PERIOD = {
+    "c1": [1.0, 3.0, 0.8, 180.0],
+    "c2": [3.1, NAN, 4.0, 0.0],
+    "c3": [1.5, 2.0, 4.0, 90.0],
+}
+BENCHMARK = {
+    "c1": [2.0, 4.0, 5.0, 150.0],
+    "c2": [2.5, 4.0, 0.0, 120.0],
+    "c3": [2.5, 4.0, 5.0, 200.0],
+}
+
+
+def _frame(rows):
+    return pd.DataFrame.from_dict(rows, orient="index", columns=KPIS)
+
+
+def _key(campaign_id, insight):
+    details = {k: v for k, v in insight.details.items() if k != "entity_id"}
+    return (campaign_id, insight.type, insight.kpi, insight.severity, insight.message, repr(sorted(details.items())))
+
+
+def _meta(campaign_id, i):
+    meta = {"value": CURRENT[campaign_id][i]}
+    for field, rows in (("last_period", LAST_PERIOD), ("historical_benchmark", BENCHMARK)):
+        meta[field] = rows[campaign_id][i]
+    # The scalar path sees missing values as None, as normalize_marketing_metrics() produces them
+    return {k: None if isinstance(v, float) and math.isnan(v) else v for k, v in meta.items()}
+
+
+def test_batch_matches_scalar_detection(tmp_path, monkeypatch):
+    import config as app_config
+    monkeypatch.setattr(app_config, "CONFIG_PATH", str(tmp_path / "missing.yaml"))
+    engine = RuleEngine(rules=DEFAULT_CONFIG["insight_rules"])
+
+    scalar = []
+    for campaign_id in CURRENT:
+        semantic = {kpi: _meta(campaign_id, i) for i, kpi in enumerate(KPIS)}
+        scalar.extend(_key(campaign_id, insight) for insight in detect_insights(semantic, {}, engine=engine))
+
+    table = detect_insights_batch(_frame(CURRENT), _frame(LAST_PERIOD), _frame(BENCHMARK), engine=engine)
+    batch = [_key(insight.details["entity_id"], insight) for insight in insights_from_table(table, engine=engine)]
+
+    assert len(scalar) >= 5  # the fixture exercises every default rule
+    assert {key[1] for key in scalar} == {"anomaly", "trend_acceleration", "high_roas", "risk"}
+    assert sorted(batch) == sorted(scalar)
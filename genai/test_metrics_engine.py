@@ -0,0 +1,84 @@
+"""
+Unit tests checking that the columnar portfolio KPIs match the scalar _extract_raw_metrics() path.
+"""
+import importlib
+from datetime import datetime, timezone
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+pytest.importorskip("pydantic")
+from data_models.campaign_dataset import CampaignDataset  # noqa: E402
+from data_models.marketing_objects import Account, Activity, Attendee, Campaign, Opportunity  # noqa: E402
+from genai.metrics_engine import campaign_metrics_row, compute_group_metrics, compute_portfolio_metrics  # noqa: E402
+
+AT = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def summary(monkeypatch):
+    pytest.importorskip("openai")
+    pytest.importorskip("yaml")
+    pytest.importorskip("dotenv")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")  # checked at import time
+    return importlib.import_module("genai.summary")
+
+
+def _data():
+    campaigns = [Campaign.construct(id=cid, name=cid, start_date=AT, end_date=AT, description=None)
+                 for cid in ("busy", "no_spend", "no_clicks", "empty")]
+    accounts = [Account.construct(id="acc1", name="One", industry="Retail", region="EMEA"),
+                Account.construct(id="acc2", name="Two", industry="Retail", region="APAC"),
+                Account.construct(id="acc3", name="Three", industry=None, region="EMEA")]
+    people = [("p1", "busy", "acc1"), ("p2", "busy", "acc2"), ("p3", "busy", None),
+              ("p4", "no_spend", "acc3"), ("p5", "no_clicks", "acc1"), ("p6", "no_clicks", "acc2")]
+    attendees = [Attendee.construct(id=pid, name=pid, email=f"{pid}@example.com", campaign_id=cid, account_id=acc)
+                 for pid, cid, acc in people]
+    clicks = [("p1", "busy"), ("p1", "busy"), ("p2", "busy"), ("p3", "busy"), ("p4", "no_spend")]
+    activities = [Activity.construct(id=f"a{i}", campaign_id=cid, attendee_id=pid, type="click", timestamp=AT)
+                  for i, (pid, cid) in enumerate(clicks)]
+    deals = [("busy", "acc1", 1000.0), ("busy", "acc2", 500.0), ("no_spend", "acc3", 0.0), ("no_clicks", "acc1", 250.0)]
+    opportunities = [Opportunity.construct(id=f"o{i}", account_id=acc, campaign_id=cid, amount=amount,
+                                           stage="open", close_date=None)
+                     for i, (cid, acc, amount) in enumerate(deals)]
+    return {"campaigns": campaigns, "accounts": accounts, "contacts": [], "attendees": attendees,
+            "responses": [], "activities": activities, "opportunities": opportunities}
+
+
+def _scalar(summary, attendees, activities, opportunities):
+    return summary._extract_raw_metrics([], attendees, [], activities, [], [], opportunities)
+
+
+@pytest.mark.parametrize("columnar_events", [False, True])
+def test_campaign_rows_match_scalar_metrics(summary, columnar_events):
+    data = _data()
+    dataset = CampaignDataset.from_data(data, columnar_events=columnar_events)
+    table = compute_portfolio_metrics(dataset)
+    assert list(table.index) == ["busy", "no_spend", "no_clicks", "empty"]
+    for campaign in data["campaigns"]:
+        cid = campaign.id
+        expected = _scalar(summary, [a for a in data["attendees"] if a.campaign_id == cid],
+                           [a for a in data["activities"] if a.campaign_id == cid],
+                           [o for o in data["opportunities"] if o.campaign_id == cid])
+        assert campaign_metrics_row(table, cid) == pytest.approx(expected), cid
+    # Zero spend still has a CAC (of 0); no opportunities means no CAC at all
+    assert campaign_metrics_row(table, "no_spend")["customer acquisition cost"] == 0
+    assert "customer acquisition cost" not in campaign_metrics_row(table, "empty")
+    assert campaign_metrics_row(table, "no_clicks")["Click Through Rate"] == 0
+    assert campaign_metrics_row(table, "missing") == {}
+
+
+@pytest.mark.parametrize("columnar_events", [False, True])
+def test_region_groups_match_scalar_metrics(summary, columnar_events):
+    data = _data()
+    table = compute_group_metrics(CampaignDataset.from_data(data, columnar_events=columnar_events), by="region")
+    assert list(table.index) == ["APAC", "EMEA"]
+    accounts = {a.id: a.region for a in data["accounts"]}
+    attendee_region = {a.id: accounts.get(a.account_id) for a in data["attendees"]}
+    expected = _scalar(summary, [a for a in data["attendees"] if accounts.get(a.account_id) == "EMEA"],
+                       [a for a in data["activities"] if attendee_region[a.attendee_id] == "EMEA"],
+                       [o for o in data["opportunities"] if accounts[o.account_id] == "EMEA"])
+    assert campaign_metrics_row(table, "EMEA") == pytest.approx(expected)
+    # p3 has no account, so neither it nor its click count towards any region
+    assert table["Number of attendees"].sum() == 5
@@ -0,0 +1,63 @@
+"""
+Unit tests for the streaming OnlineAnomalyDetector: false alarms, step changes and late events.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+pytest.importorskip("yaml")
+pytest.importorskip("dotenv")
+from genai.online_detector import OnlineAnomalyDetector  # noqa: E402
+
+START = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+
+def _events(rng, campaign_id, rates):
+    """Poisson-ish activity stream: rates[h] events spread uniformly over hour h."""
+    events = []
+    for hour, rate in enumerate(rates):
+        n = sum(rng.random() < rate / 100 for _ in range(100))
+        for _ in range(n):
+            ts = START + timedelta(hours=hour, seconds=rng.uniform(0, 3600))
+            events.append(SimpleNamespace(campaign_id=campaign_id, type="click", timestamp=ts))
+    return events
+
+
+def test_stationary_stream_raises_no_alerts():
+    rng = random.Random(3)
+    events = []
+    for i, rate in enumerate([1, 5, 20] * 4):
+        events.extend(_events(rng, f"c{i}", [rate] * 24 * 10))
+    events.sort(key=lambda e: e.timestamp)
+    detector = OnlineAnomalyDetector()
+    insights = detector.consume_many(events) + detector.flush()
+    assert len(detector.series) == 24
+    assert len(insights) <= 2
+
+
+def test_step_drop_is_flagged():
+    rng = random.Random(5)
+    rates = [20] * 24 * 4 + [2] * 12
+    detector = OnlineAnomalyDetector()
+    insights = detector.consume_many(_events(rng, "c1", rates)) + detector.flush()
+    drops = [i for i in insights if i.kpi == "activities" and i.details["value"] < i.details["expected"]]
+    assert drops
+    first = min(i.details["bucket_start"] for i in drops)
+    assert START + timedelta(hours=96) <= first <= START + timedelta(hours=99)
+
+
+def test_late_events_within_lateness_land_in_their_bucket():
+    detector = OnlineAnomalyDetector(allowed_lateness_seconds=3600, min_observations=1000)
+    at = [START + timedelta(minutes=m) for m in (10, 70, 20, 130, 30, 200)]  # minutes 20 and 30 arrive late
+    detector.consume_many(SimpleNamespace(campaign_id="c1", type=None, timestamp=ts) for ts in at)
+    # Hour 0 closed once hour 2 arrived, so the event at minute 30 was too late
+    assert detector.late_events == 1
+    stats = detector.series[("c1", "activities")]
+    detector.flush()
+    assert stats.n == 3 and stats.counts == {}
+    # Hour 0 seeded the level with its two events; hours 1-3 followed
+    assert detector.events == 6
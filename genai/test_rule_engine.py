@@ -0,0 +1,100 @@
+"""
+Unit tests for the compiled insight rules and their config hot reload.
+"""
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("yaml")
+pytest.importorskip("dotenv")
+import config as app_config  # noqa: E402
+from genai.rule_engine import CompiledRule, RuleEngine, compile_rules  # noqa: E402
+
+THRESHOLDS = {"metric_thresholds": {"CTR": 2.0, "CAC": 150.0}}
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    monkeypatch.setattr(app_config, "CONFIG_PATH", str(path))
+    return path
+
+
+def _write(path, text, mtime_ns):
+    path.write_text(text)
+    # Explicit mtimes: two writes within one filesystem tick would otherwise look unchanged
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_rule_parsing_and_validation():
+    rule = CompiledRule({"name": "below_threshold", "op": "<", "threshold": "metric_thresholds"}, THRESHOLDS)
+    assert rule.type == "below_threshold" and rule.kpi is None
+    assert rule.threshold_for("CAC") == 150.0 and rule.threshold_for("ROAS") is None
+    for spec, error in [({"name": "r", "op": "~", "threshold": 1}, "unknown operator"),
+                        ({"name": "r", "op": "<", "threshold": 1, "measure": "ratio"}, "unknown measure"),
+                        ({"name": "r", "op": "<", "threshold": 1, "measure": "delta"}, "needs a reference")]:
+        with pytest.raises(ValueError, match=error):
+            CompiledRule(spec, THRESHOLDS)
+    with pytest.raises(KeyError):
+        CompiledRule({"name": "r", "op": "<", "threshold": "missing_section"}, THRESHOLDS)
+
+
+def test_rule_evaluation():
+    drop = CompiledRule({"name": "drop", "kpi": "*", "reference": "last_period", "measure": "pct_change",
+                         "op": "<", "threshold": -0.1, "message": "{kpi} down {pct:.0f}%"}, {})
+    fields = drop.evaluate("CTR", {"value": 1.5, "last_period": 2.0})
+    assert fields["pct_change"] == pytest.approx(-0.25)
+    assert drop.format_message(fields) == "CTR down -25%"
+    assert drop.evaluate("CTR", {"value": 1.9, "last_period": 2.0}) is None
+    assert drop.evaluate("CTR", {"value": 1.5}) is None  # no reference
+    assert drop.evaluate("CTR", {"value": "n/a", "last_period": 2.0}) is None
+    assert drop.evaluate("CTR", {"value": 1.5, "last_period": 0}) is None  # pct_change undefined
+
+    high_cac = CompiledRule({"name": "high_cac", "kpi": "CAC", "op": ">", "threshold": "metric_thresholds"},
+                            THRESHOLDS)
+    assert high_cac.evaluate("CAC", {"value": 200}) == {
+        "kpi": "CAC", "value": 200.0, "reference": None, "pct_change": None, "pct": None}
+    assert high_cac.details_for(high_cac.evaluate("CAC", {"value": 200})) == {"current": 200.0}
+
+    # The vectorized mask agrees with evaluate() row by row
+    columns = ["CTR", "CAC"]
+    values = np.array([[1.5, 100.0], [2.0, np.nan]])
+    refs = {"last_period": np.array([[2.0, 100.0], [2.0, 50.0]])}
+    hits, _, pct = drop.mask(columns, values, refs)
+    assert hits.tolist() == [[True, False], [False, False]]
+    assert pct[0, 0] == pytest.approx(-0.25)
+    assert high_cac.mask(columns, np.array([[500.0, 200.0]]), {})[0].tolist() == [[False, True]]
+
+
+def test_rules_hot_reload_on_mtime_change(config_file):
+    _write(config_file, "insight_rules:\n  - {name: first, kpi: CTR, op: '<', threshold: 1}\n", 1_000_000_000)
+    engine = RuleEngine()
+    assert [r.name for r in engine.rules] == ["first"]
+    compiled = engine.rules
+    assert engine.rules is compiled  # unchanged file: no recompilation
+
+    _write(config_file, "insight_rules:\n  - {name: second, kpi: CAC, op: '>', threshold: 200}\n", 2_000_000_000)
+    assert [r.name for r in engine.rules] == ["second"]
+    assert engine.rule("second").threshold == 200.0 and engine.rule("first") is None
+
+
+def test_invalid_reload_keeps_previous_rules(config_file):
+    _write(config_file, "insight_rules:\n  - {name: good, kpi: CTR, op: '<', threshold: 1}\n", 1_000_000_000)
+    engine = RuleEngine()
+    for mtime, text in enumerate(["insight_rules:\n  - {name: bad, op: '=~', threshold: 1}\n",
+                                  "insight_rules: [unclosed\n",
+                                  "insight_rules:\n  - {name: bad, op: '<', threshold: no_such_section}\n",
+                                  "insight_rules: not-a-list\n"], start=2):
+        _write(config_file, text, mtime * 1_000_000_000)
+        assert [r.name for r in engine.rules] == ["good"], text
+    # A later valid edit is picked up again
+    _write(config_file, "insight_rules:\n  - {name: fixed, kpi: CTR, op: '<', threshold: 1}\n", 9_000_000_000)
+    assert [r.name for r in engine.rules] == ["fixed"]
+
+
+def test_pinned_rules_ignore_config(config_file):
+    _write(config_file, "insight_rules: []\n", 1_000_000_000)
+    engine = RuleEngine(rules=[{"name": "pinned", "op": "<", "threshold": 1}])
+    _write(config_file, "insight_rules:\n  - {name: other, op: '<', threshold: 1}\n", 2_000_000_000)
+    assert [r.name for r in engine.rules] == ["pinned"]
+    assert len(compile_rules({"insight_rules": []})) == 0
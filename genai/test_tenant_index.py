@@ -0,0 +1,74 @@
+"""
+Unit tests for per-business_id partitioning of the embeddings index.
+"""
+import json
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+pytest.importorskip("pyarrow")
+from genai.tenant_index import TENANTS_FILE, PartitionedVectorIndex, tenant_key  # noqa: E402
+
+DIM = 4
+
+
+def _batch(business_ids, offset=0.0):
+    vectors = np.zeros((len(business_ids), DIM), dtype=np.float32)
+    vectors[:, 0] = np.arange(len(business_ids)) + offset
+    records = [{"summary": f"{b}-{i}", "metadata": {"business_id": b} if b is not None else {}}
+               for i, b in enumerate(business_ids)]
+    return vectors, records
+
+
+def _summaries(records):
+    return [r["summary"] for r in records]
+
+
+def test_records_are_routed_to_their_tenant():
+    index = PartitionedVectorIndex(DIM, "Flat")
+    vectors, records = _batch(["a", "b", "a", None, "b"])
+    index.add(vectors, records)
+    assert sorted(index.partitions) == sorted([tenant_key(None), "a", "b"])
+    assert _summaries(index.partition("a").records) == ["a-0", "a-2"]
+    assert _summaries(index.partition(None).records) == ["None-3"]
+    assert index.partition("missing") is None
+    assert len(index) == 5 and sorted(_summaries(index)) == sorted(_summaries(records))
+
+    query = np.array([2.0, 0, 0, 0], dtype=np.float32)
+    # Scoped searches fill top_k from the tenant alone, however close other tenants' vectors are
+    assert _summaries(index.search(query, 2, business_id="a")) == ["a-2", "a-0"]
+    assert _summaries(index.search(query, 5, business_id="b")) == ["b-1", "b-4"]
+    assert index.search(query, 2, business_id="missing") == []
+
+
+def test_unscoped_search_merges_partitions_by_distance():
+    index = PartitionedVectorIndex(DIM, "Flat")
+    vectors, records = _batch(["a", "b", "c", "a", "b", "c"])
+    index.add(vectors, records)
+    query = np.array([2.2, 0, 0, 0], dtype=np.float32)
+    assert _summaries(index.search(query, 3)) == ["c-2", "a-3", "b-1"]
+    assert len(index.search(query, 10)) == 6
+
+
+def test_tenants_reload_from_persist_dir(tmp_path):
+    path = str(tmp_path)
+    index = PartitionedVectorIndex(DIM, "Flat", path)
+    vectors, records = _batch(["a", "b", "a"])
+    index.add(vectors, records)
+    index.compact()
+    more, batch = _batch(["b"], offset=10.0)
+    index.add(more, batch)  # WAL only
+
+    with open(os.path.join(path, TENANTS_FILE)) as f:
+        dirs = json.load(f)
+    assert sorted(dirs) == ["a", "b"]
+    assert all(name.startswith("tenant-") and os.path.isdir(os.path.join(path, name)) for name in dirs.values())
+
+    reopened = PartitionedVectorIndex(DIM, "Flat", path)
+    assert sorted(reopened.partitions) == ["a", "b"]
+    assert _summaries(reopened.partition("a").records) == ["a-0", "a-2"]
+    assert _summaries(reopened.partition("b").records) == ["b-1", "b-0"]
+    query = np.array([10.0, 0, 0, 0], dtype=np.float32)
+    assert _summaries(reopened.search(query, 1, business_id="b")) == ["b-0"]
+    assert _summaries(reopened.search(query, 1)) == ["b-0"]
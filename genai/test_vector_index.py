@@ -0,0 +1,75 @@
+"""
+Unit tests for VectorIndex staging, training, retraining and search padding.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+faiss = pytest.importorskip("faiss")
+from genai.vector_index import VectorIndex, min_train_points  # noqa: E402
+
+DIM = 8
+
+
+def _vectors(n, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+
+
+def test_min_train_points():
+    assert min_train_points("Flat", DIM) == 1
+    assert min_train_points("IVF{nlist},Flat", DIM) == 1
+    assert min_train_points("IVF1024,Flat", DIM) == 1024
+    assert min_train_points("IVF{nlist},PQ{pq_m}", DIM) == 256
+    assert min_train_points("PQ4x4", DIM) == 16
+
+
+def test_staging_then_training_migration():
+    index = VectorIndex(DIM, "IVF{nlist},Flat", train_threshold=100)
+    data = _vectors(160)
+    index.add(data[:60])
+    assert index.trained_size == 0
+    assert isinstance(index.index, faiss.IndexFlatL2)
+    index.add(data[60:])
+    assert index.trained_size == 160
+    assert faiss.extract_index_ivf(index.index).nlist > 1
+    faiss.ParameterSpace().set_index_parameters(index.index, "nprobe=64")
+    _, ids = index.search(data[[5, 150]], 1)
+    assert ids[:, 0].tolist() == [5, 150]
+
+
+def test_pq_threshold_is_clamped_to_training_minimum():
+    index = VectorIndex(DIM, "PQ4", train_threshold=100)
+    assert index.train_threshold == 256
+    data = _vectors(300)
+    index.add(data[:150])  # below 2**8 points: stays staged instead of raising
+    assert index.trained_size == 0
+    index.add(data[150:])
+    assert index.trained_size == 300
+
+
+def test_retrain_uses_raw_vectors():
+    data = _vectors(400)
+    index = VectorIndex(DIM, "IVF{nlist},SQ8", train_threshold=100, retrain_growth=2.0)
+    index.add(data[:100])
+    assert index.trained_size == 100
+    index.add(data[100:200])
+    # Quantized index without a raw source: no retraining from lossy reconstructions
+    assert index.trained_size == 100
+
+    calls = []
+    index.raw_source = lambda: calls.append(1) or data[:index.index.ntotal]
+    index.add(data[200:210])
+    assert calls and index.trained_size == 210
+    assert index.ntotal == 210
+
+
+def test_search_pads_missing_hits_with_minus_one():
+    from genai.tenant_index import TenantPartition
+    index = VectorIndex(DIM, "Flat")
+    data = _vectors(3)
+    index.add(data)
+    _, ids = index.search(data[:1], 5)
+    assert ids[0].tolist()[3:] == [-1, -1]
+    partition = TenantPartition(index, [{"summary": str(i), "metadata": {}} for i in range(3)])
+    hits = partition.search(data[0], 5)
+    assert [record["summary"] for _, record in hits][0] == "0"
+    assert len(hits) == 3
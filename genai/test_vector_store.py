@@ -0,0 +1,120 @@
+"""
+Unit tests for the persisted VectorStore: WAL replay, torn-tail truncation, compaction and reopen.
+"""
+import json
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+pytest.importorskip("pyarrow")
+from genai.vector_store import MANIFEST_NAME, VectorStore  # noqa: E402
+
+DIM = 8
+
+
+def _batch(start, n):
+    rng = np.random.default_rng(start)
+    vectors = rng.standard_normal((n, DIM)).astype(np.float32)
+    records = [{"summary": f"summary {start + i}", "metadata": {"n": start + i}} for i in range(n)]
+    return vectors, records
+
+
+def _ids(records):
+    return [r["metadata"]["n"] for r in records]
+
+
+def test_wal_replay_on_reopen(tmp_path):
+    store = VectorStore(str(tmp_path), DIM, "Flat")
+    index, records = store.open()
+    vectors, batch = _batch(0, 5)
+    store.append(vectors, batch)
+    index.add(vectors)
+    records.extend(batch)
+    store.close()
+
+    index, records = VectorStore(str(tmp_path), DIM, "Flat").open()
+    assert index.ntotal == 5
+    assert _ids(records) == [0, 1, 2, 3, 4]
+    _, ids = index.search(vectors[3:4], 1)
+    assert ids[0][0] == 3
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    store = VectorStore(str(tmp_path), DIM, "Flat")
+    store.open()
+    vectors, batch = _batch(0, 2)
+    store.append(vectors, batch)
+    store.close()
+    wal = os.path.join(str(tmp_path), "wal-0.jsonl")
+    size = os.path.getsize(wal)
+    with open(wal, "a") as f:
+        f.write('{"summary": "torn", "vec')
+
+    store = VectorStore(str(tmp_path), DIM, "Flat")
+    index, records = store.open()
+    assert index.ntotal == 2
+    assert os.path.getsize(wal) == size
+    # Appends after the truncation start on a clean line and replay too
+    vectors, batch = _batch(2, 1)
+    store.append(vectors, batch)
+    store.close()
+    _, records = VectorStore(str(tmp_path), DIM, "Flat").open()
+    assert _ids(records) == [0, 1, 2]
+
+
+def test_compact_switches_generation_and_reopens(tmp_path):
+    store = VectorStore(str(tmp_path), DIM, "Flat")
+    index, records = store.open()
+    vectors, batch = _batch(0, 4)
+    store.append(vectors, batch)
+    index.add(vectors)
+    records.extend(batch)
+    index, records = store.compact(index, records)
+    assert store.generation == 1
+    assert sorted(os.listdir(str(tmp_path))) == ["index-1.faiss", MANIFEST_NAME, "metadata-1.arrow", "wal-1.jsonl"]
+    with open(os.path.join(str(tmp_path), MANIFEST_NAME)) as f:
+        assert json.load(f)["rows"] == 4
+
+    # Appends after compaction land in the new WAL and the delta index
+    more, batch = _batch(4, 2)
+    store.append(more, batch)
+    index.add(more)
+    records.extend(batch)
+    index, records = store.compact(index, records)
+    assert store.generation == 2
+    store.close()
+
+    index, records = VectorStore(str(tmp_path), DIM, "Flat").open()
+    assert index.ntotal == 6
+    assert _ids(records) == [0, 1, 2, 3, 4, 5]
+    _, ids = index.search(more[1:2], 1)
+    assert ids[0][0] == 5
+
+
+def test_invalid_batch_is_rejected_before_logging(tmp_path):
+    store = VectorStore(str(tmp_path), DIM, "Flat")
+    store.open()
+    vectors, batch = _batch(0, 2)
+    with pytest.raises(ValueError):
+        store.append(vectors[:, :DIM - 1], batch)
+    with pytest.raises(ValueError):
+        store.append(vectors[:1], batch)
+    store.close()
+    index, records = VectorStore(str(tmp_path), DIM, "Flat").open()
+    assert index.ntotal == 0 and len(records) == 0
+
+
+def test_training_failure_does_not_break_replay(tmp_path):
+    # 300 vectors cannot train 512 IVF lists; the index stays a flat staging index instead of raising
+    kwargs = {"train_threshold": 100}
+    store = VectorStore(str(tmp_path), DIM, "IVF512,Flat", **kwargs)
+    store.open()
+    vectors, batch = _batch(0, 300)
+    store.append(vectors, batch)
+    store.close()
+    index, records = VectorStore(str(tmp_path), DIM, "IVF512,Flat", **kwargs).open()
+    assert index.ntotal == 300
+    assert len(records) == 300
+    _, ids = index.search(vectors[7:8], 1)
+    assert ids[0][0] == 7
@@ -0,0 +1,274 @@
+"""
+vector_index.py
+
+Configurable FAISS index for EmbeddingsService, built from a faiss.index_factory string, e.g.:
+- "Flat"                exact brute force (previous behaviour, ~6 KB per 1536-d vector)
+- "HNSW32"              graph ANN, no training
+- "IVF{nlist},Flat"     inverted lists over full vectors
+- "IVF{nlist},SQfp16"   inverted lists over float16 vectors (half the memory)
+- "IVF{nlist},PQ64"     inverted lists over 64-byte product-quantization codes
+"{nlist}" is filled at training time from the corpus size. Indexes that need training buffer vectors in a
+flat index until train_threshold vectors exist (raised to the factory's minimum: a literal IVF list count,
+2**nbits for PQ), then train and migrate automatically. They are retrained whenever the corpus grows
+retrain_growth times past the last training size, from raw vectors supplied by raw_source; quantized
+(PQ/SQ) indexes without a raw_source are not retrained, since their reconstructions are lossy.
+
+An index read back with read() keeps its on-disk part memory-mapped and read-only; later additions go to
+an in-memory flat delta index that search() merges in, until compaction rewrites the file (see vector_store.py).
+
+`python -m genai.vector_index --cache embedding_cache.db` prints a recall/latency report of each option
+against the flat index on cached embeddings.
+"""
+import math
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import faiss
+
+DEFAULT_FACTORY = "Flat"
+BENCHMARK_FACTORIES = ["Flat", "HNSW32", "IVF{nlist},Flat", "IVF{nlist},SQfp16", "IVF{nlist},PQ{pq_m}"]
+
+
+def nlist_for(n: int) -> int:
+    """
+    Number of IVF lists for a corpus of n vectors (~4*sqrt(n), keeping >= 39 training points per list).
+    """
+    return max(1, min(int(4 * math.sqrt(n)), n // 39 or 1))
+
+
+def pq_m_for(dim: int) -> int:
+    """
+    Largest PQ sub-quantizer count <= dim / 24 that divides dim (64 for 1536-d embeddings).
+    """
+    m = max(1, dim // 24)
+    while dim % m:
+        m -= 1
+    return m
+
+
+def min_train_points(factory: str, dim: int) -> int:
+    """
+    Fewest vectors the factory's index can be trained on: a literal IVF list count, and 2**nbits for PQ
+    (including IVF residual PQ and OPQ). A templated {nlist} is sized from the corpus and always fits.
+    """
+    spec = factory.format(nlist=1, pq_m=pq_m_for(dim))
+    points = 1
+    ivf = re.search(r"IVF(\d+)", factory)
+    if ivf:
+        points = max(points, int(ivf.group(1)))
+    for pq in re.finditer(r"PQ(\d+)(?:x(\d+))?", spec):
+        points = max(points, 2 ** int(pq.group(2) or 8))
+    return points
+
+
+def as_vector_batch(vectors: Any, dim: int, n: Optional[int] = None) -> np.ndarray:
+    """
+    Validate an (n, dim) batch and return it as contiguous float32. Raises ValueError on a wrong shape or
+    non-finite values, so bad input is rejected before it is logged or indexed.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1 and vectors.shape[0] == dim:
+        vectors = vectors.reshape(1, dim)
+    if vectors.ndim != 2 or vectors.shape[1] != dim:
+        raise ValueError(f"Expected vectors of shape (n, {dim}), got {vectors.shape}")
+    if n is not None and vectors.shape[0] != n:
+        raise ValueError(f"Got {vectors.shape[0]} vectors for {n} records")
+    if not np.isfinite(vectors).all():
+        raise ValueError("Vectors contain NaN or infinite values")
+    return vectors
+
+
+class VectorIndex:
+    """
+    Wraps a FAISS index with automatic training and retraining. IDs are insertion positions.
+    search_params are faiss ParameterSpace settings applied after (re)building, e.g. "nprobe=16" or "efSearch=64".
+    """
+
+    def __init__(self, dim: int, factory: str = DEFAULT_FACTORY, train_threshold: int = 10_000,
+                 retrain_growth: float = 4.0, search_params: str = ""):
+        self.dim = dim
+        self.factory = factory
+        self.train_threshold = max(train_threshold, min_train_points(factory, dim))
+        self.retrain_growth = retrain_growth
+        self.lossy = bool(re.search(r"PQ|SQ", factory))
+        # Callable returning every raw vector in insertion order (e.g., from the EmbeddingCache), for retraining
+        self.raw_source: Optional[Callable[[], np.ndarray]] = None
+        self.search_params = search_params
+        self.trained_size = 0
+        self.delta: Optional[Any] = None  # appends on top of a read-only (memory-mapped) index
+        self.index = self._build(0)
+        self.needs_training = not self.index.is_trained
+        if self.needs_training:
+            # Staging area until enough vectors exist to train the target index
+            self.index = faiss.IndexFlatL2(dim)
+
+    @classmethod
+    def read(cls, path: str, dim: int, factory: str = DEFAULT_FACTORY, trained_size: int = 0,
+             mmap: bool = True, **kwargs) -> "VectorIndex":
+        """
+        Load an index written by write(). With mmap=True the file is memory-mapped read-only where the
+        index type supports it, and new vectors go to the delta index.
+        """
+        vector_index = cls(dim, factory, **kwargs)
+        index = None
+        if mmap:
+            try:
+                index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                vector_index.delta = faiss.IndexFlatL2(dim)
+            except RuntimeError:
+                index = None
+        vector_index.index = index if index is not None else faiss.read_index(path)
+        vector_index.trained_size = trained_size
+        if vector_index.search_params and vector_index.trained_size:
+            faiss.ParameterSpace().set_index_parameters(vector_index.index, vector_index.search_params)
+        return vector_index
+
+    def write(self, path: str):
+        """
+        Serialize the index with faiss.write_index. Requires an empty delta (compact first).
+        """
+        if self.delta is not None and self.delta.ntotal:
+            raise ValueError("Cannot write an index with pending delta vectors; compact it first")
+        faiss.write_index(self.index, path)
+
+    @property
+    def ntotal(self) -> int:
+        return self.index.ntotal + (self.delta.ntotal if self.delta is not None else 0)
+
+    def _factory_string(self, n: int) -> str:
+        return self.factory.format(nlist=nlist_for(max(n, 1)), pq_m=pq_m_for(self.dim))
+
+    def _build(self, n: int) -> Any:
+        index = faiss.index_factory(self.dim, self._factory_string(n))
+        if self.search_params:
+            faiss.ParameterSpace().set_index_parameters(index, self.search_params)
+        return index
+
+    def add(self, vectors: np.ndarray):
+        vectors = as_vector_batch(vectors, self.dim)
+        if self.delta is not None:
+            self.delta.add(vectors)
+            return
+        self.index.add(vectors)
+        if not self.needs_training:
+            return
+        n = self.index.ntotal
+        if (self.trained_size == 0 and n >= self.train_threshold) or \
+                (self.trained_size and n >= self.trained_size * self.retrain_growth):
+            try:
+                self._retrain()
+            except RuntimeError as e:
+                # Keep the current (staging or previously trained) index; the vectors are already added,
+                # so a failed training never loses data or breaks WAL replay
+                print(f"Vector index training failed, keeping the current index: {e}")
+
+    def _training_vectors(self) -> Optional[np.ndarray]:
+        """
+        Every stored vector, exactly: from the flat staging index, raw_source, or a lossless trained index.
+        None when only lossy reconstructions are available.
+        """
+        if not self.trained_size:
+            return self.index.reconstruct_n(0, self.index.ntotal)
+        if self.raw_source is not None:
+            return as_vector_batch(self.raw_source(), self.dim, self.index.ntotal)
+        if self.lossy:
+            return None
+        faiss.extract_index_ivf(self.index).make_direct_map()
+        return self.index.reconstruct_n(0, self.index.ntotal)
+
+    def _retrain(self):
+        """
+        Train a fresh target index on every stored vector and re-add them in order, so IDs stay insertion
+        positions. Skipped when exact vectors are unavailable (see _training_vectors).
+        """
+        vectors = self._training_vectors()
+        if vectors is None:
+            return
+        index = self._build(len(vectors))
+        index.train(vectors)
+        index.add(vectors)
+        self.index = index
+        self.trained_size = len(vectors)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        queries = np.ascontiguousarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        distances, ids = self.index.search(queries, k)
+        if self.delta is None or self.delta.ntotal == 0:
+            return distances, ids
+        # Merge base and delta hits by distance; delta IDs follow the base IDs
+        delta_distances, delta_ids = self.delta.search(queries, k)
+        delta_ids = np.where(delta_ids >= 0, delta_ids + self.index.ntotal, -1)
+        distances = np.hstack([distances, delta_distances])
+        ids = np.hstack([ids, delta_ids])
+        distances = np.where(ids >= 0, distances, np.inf)
+        order = np.argsort(distances, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(distances, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+    def delta_vectors(self) -> np.ndarray:
+        if self.delta is None or self.delta.ntotal == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return self.delta.reconstruct_n(0, self.delta.ntotal)
+
+    def nbytes(self) -> int:
+        return int(faiss.serialize_index(self.index).nbytes)
+
+
+def compare_indexes(vectors: np.ndarray, queries: np.ndarray, factories: Sequence[str] = BENCHMARK_FACTORIES,
+                    k: int = 10, search_params: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    Recall@k against exact flat search, mean query latency and index bytes per vector for each factory.
+    """
+    search_params = search_params or {"HNSW32": "efSearch=64"}
+    dim = vectors.shape[1]
+    exact = faiss.IndexFlatL2(dim)
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+    report = []
+    for factory in factories:
+        started = time.perf_counter()
+        index = VectorIndex(dim, factory, train_threshold=len(vectors),
+                            search_params=search_params.get(factory, "nprobe=16" if "IVF" in factory else ""))
+        index.add(vectors)
+        build_s = time.perf_counter() - started
+        started = time.perf_counter()
+        _, found = index.search(queries, k)
+        query_ms = (time.perf_counter() - started) * 1000 / len(queries)
+        recall = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)])
+        report.append({
+            "factory": index._factory_string(len(vectors)),
+            "recall_at_k": float(recall),
+            "query_ms": query_ms,
+            "bytes_per_vector": index.nbytes() / len(vectors),
+            "build_s": build_s,
+        })
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import sqlite3
+
+    parser = argparse.ArgumentParser(description="Recall/latency report for EmbeddingsService index options")
+    parser.add_argument("--cache", help="EmbeddingCache SQLite file to benchmark on (default: synthetic vectors)")
+    parser.add_argument("--vectors", type=int, default=50_000, help="synthetic corpus size")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.cache:
+        rows = sqlite3.connect(args.cache).execute("SELECT vector FROM embeddings").fetchall()
+        data = np.stack([np.frombuffer(blob, dtype=np.float32) for (blob,) in rows])
+    else:
+        # Clustered synthetic data is closer to real embeddings than uniform noise
+        centers = rng.standard_normal((64, args.dim)).astype(np.float32)
+        data = centers[rng.integers(0, 64, args.vectors)] + 0.3 * rng.standard_normal((args.vectors, args.dim)).astype(np.float32)
+    picks = rng.choice(len(data), min(args.queries, len(data)), replace=False)
+    queries = data[picks] + 0.05 * rng.standard_normal((len(picks), data.shape[1])).astype(np.float32)
+    print(f"{len(data):,} vectors x {data.shape[1]} dims, {len(queries)} queries, k={args.k}")
+    print(f"{'factory':<22}{'recall@k':>10}{'ms/query':>10}{'bytes/vec':>11}{'build s':>9}")
+    for row in compare_indexes(data, queries, k=args.k):
+        print(f"{row['factory']:<22}{row['recall_at_k']:>10.3f}{row['query_ms']:>10.3f}"
+              f"{row['bytes_per_vector']:>11.0f}{row['build_s']:>9.2f}")
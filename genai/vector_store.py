@@ -0,0 +1,200 @@
+"""
+vector_store.py
+
+On-disk persistence for EmbeddingsService, so restarts neither rebuild nor re-embed the semantic memory.
+A store directory holds one generation at a time:
+- index-<gen>.faiss      FAISS serialization of the vector index (memory-mapped read-only on load)
+- metadata-<gen>.arrow   columnar sidecar of record summaries and JSON metadata (memory-mapped on load)
+- wal-<gen>.jsonl        write-ahead log of appends since the generation was written
+- manifest.json          current generation, index settings and row count (replaced atomically)
+Every append is written and fsynced to the WAL before it is applied in memory, so a crash loses at most
+the write in flight; a torn last line is ignored on replay. compact() folds the WAL into a new generation.
+"""
+import base64
+import collections.abc
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import pyarrow as pa
+from genai.vector_index import VectorIndex, as_vector_batch
+
+MANIFEST_NAME = "manifest.json"
+METADATA_SCHEMA = pa.schema([pa.field("summary", pa.string()), pa.field("metadata", pa.string())])
+
+
+class RecordList(collections.abc.Sequence):
+    """
+    A tenant partition's records (see tenant_index.py), backed by a memory-mapped Arrow table plus appended dicts.
+    Rows of the table are decoded on access.
+    """
+
+    def __init__(self, table: Optional[pa.Table] = None):
+        self.table = table
+        self._base = table.num_rows if table is not None else 0
+        self.appended: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return self._base + len(self.appended)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if i >= self._base:
+            return self.appended[i - self._base]
+        metadata = self.table.column("metadata")[i].as_py()
+        return {"summary": self.table.column("summary")[i].as_py(), "metadata": json.loads(metadata) if metadata else {}}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self[i] for i in range(len(self)))
+
+    def append(self, record: Dict[str, Any]):
+        self.appended.append(record)
+
+    def extend(self, records):
+        self.appended.extend(records)
+
+
+def _write_metadata(records: Sequence[Dict[str, Any]], path: str):
+    columns = {
+        "summary": [r["summary"] for r in records],
+        "metadata": [json.dumps(r.get("metadata") or {}, default=str) for r in records],
+    }
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, METADATA_SCHEMA) as writer:
+        writer.write_table(pa.Table.from_pydict(columns, schema=METADATA_SCHEMA))
+
+
+class VectorStore:
+    """
+    Opens, appends to and compacts a persisted VectorIndex + RecordList pair in one directory.
+    """
+
+    def __init__(self, path: str, dim: int, factory: str, **index_kwargs):
+        self.path = path
+        self.dim = dim
+        self.factory = factory
+        self.index_kwargs = index_kwargs
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._wal = None
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, kind: str, generation: int, ext: str) -> str:
+        return os.path.join(self.path, f"{kind}-{generation}.{ext}")
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.path, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def open(self) -> Tuple[VectorIndex, RecordList]:
+        """
+        Memory-map the current generation (if any) and replay its WAL.
+        """
+        manifest = self._read_manifest()
+        if manifest is None:
+            index, records = VectorIndex(self.dim, self.factory, **self.index_kwargs), RecordList()
+        else:
+            if manifest["dim"] != self.dim:
+                raise ValueError(f"Stored index dimension {manifest['dim']} != {self.dim}")
+            self.generation = manifest["generation"]
+            index = VectorIndex.read(self._file("index", self.generation, "faiss"), self.dim,
+                                     manifest["factory"], trained_size=manifest["trained_size"], **self.index_kwargs)
+            source = pa.memory_map(self._file("metadata", self.generation, "arrow"), "r")
+            records = RecordList(pa.ipc.open_file(source).read_all())
+        vectors, replayed = self._replay()
+        if replayed:
+            index.add(vectors)
+            records.extend(replayed)
+        self._wal = open(self._file("wal", self.generation, "jsonl"), "a", encoding="utf-8")
+        return index, records
+
+    def _replay(self) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """
+        Read complete WAL entries and truncate a torn tail, so later appends start on a clean line.
+        """
+        path = self._file("wal", self.generation, "jsonl")
+        vectors, records = [], []
+        if os.path.exists(path):
+            good = 0
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("incomplete entry")
+                        entry = json.loads(line)
+                        vector = np.frombuffer(base64.b64decode(entry["vector"]), dtype=np.float32)
+                    except (ValueError, KeyError):
+                        break  # torn write at the tail
+                    good += len(line)
+                    if vector.shape[0] != self.dim or not np.isfinite(vector).all():
+                        print(f"Skipping invalid WAL entry in {path}")
+                        continue
+                    vectors.append(vector)
+                    records.append({"summary": entry["summary"], "metadata": entry["metadata"]})
+            if os.path.getsize(path) > good:
+                os.truncate(path, good)
+        stacked = np.stack(vectors) if vectors else np.empty((0, self.dim), dtype=np.float32)
+        return stacked, records
+
+    def append(self, vectors: np.ndarray, records: Sequence[Dict[str, Any]]):
+        """
+        Durably log appended vectors and records (one fsync per call) before they are applied in memory.
+        The batch is validated first, so nothing is logged that replay could not apply.
+        """
+        vectors = as_vector_batch(vectors, self.dim, len(records))
+        lines = "".join(
+            json.dumps({"summary": r["summary"], "metadata": r.get("metadata") or {},
+                        "vector": base64.b64encode(np.asarray(v, dtype=np.float32).tobytes()).decode("ascii")},
+                       default=str) + "\n"
+            for v, r in zip(vectors, records))
+        with self._lock:
+            self._wal.write(lines)
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+
+    def compact(self, index: VectorIndex, records: Sequence[Dict[str, Any]]) -> Tuple[VectorIndex, RecordList]:
+        """
+        Write a new generation holding every vector and record, switch the manifest to it, drop the old
+        generation's files and reopen (memory-mapped). Returns the reopened (index, records).
+        """
+        with self._lock:
+            previous = self.generation
+            generation = previous + 1
+            if index.delta is not None:
+                # Fold the delta into an in-memory copy of the base index (training/retraining as needed)
+                manifest = self._read_manifest()
+                merged = VectorIndex.read(self._file("index", previous, "faiss"), self.dim, manifest["factory"],
+                                          trained_size=manifest["trained_size"], mmap=False, **self.index_kwargs)
+                # Retraining triggered by the fold must start from exact vectors, not lossy reconstructions
+                merged.raw_source = index.raw_source
+                merged.add(index.delta_vectors())
+                index = merged
+            index.write(self._file("index", generation, "faiss"))
+            _write_metadata(records, self._file("metadata", generation, "arrow"))
+            manifest = {"generation": generation, "dim": self.dim, "factory": index.factory,
+                        "trained_size": index.trained_size, "rows": len(records)}
+            tmp_path = os.path.join(self.path, MANIFEST_NAME + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(manifest, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.path, MANIFEST_NAME))
+            if self._wal is not None:
+                self._wal.close()
+            self.generation = generation
+            for kind, ext in (("index", "faiss"), ("metadata", "arrow"), ("wal", "jsonl")):
+                stale = self._file(kind, previous, ext)
+                if os.path.exists(stale):
+                    os.remove(stale)
+        return self.open()
+
+    def close(self):
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
@@ -0,0 +1,173 @@
+"""
+alias_resolver.py
+
+Compiled fuzzy resolver mapping raw metric column names (e.g., "Click-thru %", "ctr_pct", "CTR (All)")
+to canonical metric names. Built once from the canonical alias lists (see ontology.py) into:
+- exact indexes over normalized alias keys, with and without qualifier tokens (pct, all, rate, ...)
+- an inverted token index for aliases contained in longer column names whose other tokens are only
+  qualifiers or context words ("Total CTR", "Campaign ROAS"); a name with any other extra token
+  ("roas_target", "LTV:CAC") scores below min_confidence
+- a character-trigram index whose candidates are scored by Dice similarity and edit distance
+Resolutions are memoized in a bounded LRU cache and carry a confidence score in [0, 1].
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Token rewrites applied before matching
+TOKEN_SYNONYMS: Dict[str, str] = {
+    "thru": "through",
+    "clickthrough": "click through",
+    "clickthru": "click through",
+    "conv": "conversion",
+    "acq": "acquisition",
+    "cust": "customer",
+    "rev": "revenue",
+    "adspend": "ad spend",
+}
+# Qualifier tokens that do not change which metric a column holds
+QUALIFIER_TOKENS: Set[str] = {"pct", "percent", "percentage", "all", "rate", "usd", "x"}
+# Context words that may surround an alias in a longer column name without changing the metric
+CONTEXT_TOKENS: Set[str] = {"total", "overall", "campaign", "avg", "average", "blended", "current", "actual"}
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_tokens(name: str) -> Tuple[str, ...]:
+    """
+    Token pipeline: split camelCase, lowercase, split on punctuation and apply synonyms.
+    """
+    text = _CAMEL_BOUNDARY.sub(" ", name).lower().replace("&", " and ")
+    tokens: List[str] = []
+    for token in _NON_ALNUM.split(text):
+        if token:
+            tokens.extend(TOKEN_SYNONYMS.get(token, token).split())
+    return tuple(tokens)
+
+
+def strip_qualifiers(tokens: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(t for t in tokens if t not in QUALIFIER_TOKENS) or tokens
+
+
+def _trigrams(key: str) -> Counter:
+    padded = f"  {key} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _edit_distance(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class AliasResolution(NamedTuple):
+    canonical: str
+    confidence: float
+    method: str  # 'exact', 'token' or 'fuzzy'
+    matched_alias: str
+
+
+class AliasResolver:
+    """
+    Resolve raw metric names against {canonical_name: [aliases]}. Thread-safe for reads once built.
+    """
+
+    def __init__(self, aliases: Dict[str, Iterable[str]], min_confidence: float = 0.8, cache_size: int = 65536):
+        self.min_confidence = min_confidence
+        self._exact: Dict[str, Tuple[str, str]] = {}
+        self._stripped: Dict[str, Tuple[str, str]] = {}
+        self._compact: Dict[str, Tuple[str, str]] = {}
+        self._by_token: Dict[str, List[Tuple[Tuple[str, ...], str, str]]] = {}
+        self._by_trigram: Dict[str, List[str]] = {}
+        self._trigram_counts: Dict[str, Counter] = {}
+        for canonical, names in aliases.items():
+            for alias in [canonical, *names]:
+                tokens = normalize_tokens(alias)
+                key = " ".join(tokens)
+                if not key or key in self._exact:
+                    continue
+                self._exact[key] = (canonical, alias)
+                stripped = " ".join(strip_qualifiers(tokens))
+                self._stripped.setdefault(stripped, (canonical, alias))
+                self._compact.setdefault(stripped.replace(" ", ""), (canonical, alias))
+                self._by_token.setdefault(tokens[0], []).append((tokens, canonical, alias))
+                grams = _trigrams(key)
+                self._trigram_counts[key] = grams
+                for gram in grams:
+                    self._by_trigram.setdefault(gram, []).append(key)
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def cache_info(self):
+        return self.resolve.cache_info()
+
+    def canonical_name(self, name: str) -> Optional[str]:
+        resolution = self.resolve(name)
+        return resolution.canonical if resolution else None
+
+    def _resolve(self, name: str) -> Optional[AliasResolution]:
+        tokens = normalize_tokens(name)
+        key = " ".join(tokens)
+        if not key:
+            return None
+        if key in self._exact:
+            canonical, alias = self._exact[key]
+            return AliasResolution(canonical, 1.0, "exact", alias)
+        stripped = " ".join(strip_qualifiers(tokens))
+        if stripped in self._stripped:
+            canonical, alias = self._stripped[stripped]
+            return AliasResolution(canonical, 0.95, "exact", alias)
+        compact = stripped.replace(" ", "")
+        if compact in self._compact:
+            canonical, alias = self._compact[compact]
+            return AliasResolution(canonical, 0.9, "exact", alias)
+        best = max(self._token_candidates(tokens) + self._fuzzy_candidates(key),
+                   key=lambda r: r.confidence, default=None)
+        if best is None or best.confidence < self.min_confidence:
+            return None
+        return best
+
+    def _token_candidates(self, tokens: Tuple[str, ...]) -> List[AliasResolution]:
+        """
+        Aliases whose tokens appear as a contiguous run inside the name. A run covering every token that is
+        not a qualifier or context word scores 0.85; partial coverage scores at most 0.79, below the default
+        min_confidence, since "roas_target" or "cac payback" is a different metric.
+        """
+        found = []
+        for start, token in enumerate(tokens):
+            for alias_tokens, canonical, alias in self._by_token.get(token, ()):
+                end = start + len(alias_tokens)
+                if tokens[start:end] != alias_tokens:
+                    continue
+                rest = tokens[:start] + tokens[end:]
+                if all(t in QUALIFIER_TOKENS or t in CONTEXT_TOKENS for t in rest):
+                    confidence = 0.85
+                else:
+                    confidence = round(0.7 + 0.09 * len(alias_tokens) / len(tokens), 3)
+                found.append(AliasResolution(canonical, confidence, "token", alias))
+        return found
+
+    def _fuzzy_candidates(self, key: str, limit: int = 5) -> List[AliasResolution]:
+        """
+        Trigram-index candidates scored by the better of Dice similarity and normalized edit distance.
+        """
+        grams = _trigrams(key)
+        shared: Counter = Counter()
+        for gram, n in grams.items():
+            for alias_key in self._by_trigram.get(gram, ()):
+                shared[alias_key] += min(n, self._trigram_counts[alias_key][gram])
+        found = []
+        total = sum(grams.values())
+        for alias_key, overlap in shared.most_common(limit):
+            dice = 2 * overlap / (total + sum(self._trigram_counts[alias_key].values()))
+            edit = 1 - _edit_distance(key, alias_key) / max(len(key), len(alias_key))
+            canonical, alias = self._exact[alias_key]
+            found.append(AliasResolution(canonical, round(0.95 * max(dice, edit), 3), "fuzzy", alias))
+        return found
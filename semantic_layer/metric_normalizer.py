@@ -4,9 +4,12 @@ metric_normalizer.py
 Provides normalization utilities for mapping raw metric names to canonical business definitions
 using the semantic abstraction layer. This enables consistent analytics and reporting across sources.
 """
-from .ontology import get_metric
+from functools import lru_cache
+from .ontology import CANONICAL_METRICS, get_metric, resolve_metric_alias
 from .schema import MarketingMetric
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Mapping, Tuple, Union
+import numpy as np
+import pandas as pd
 
 
 def normalize_metric_name(raw_name: str) -> Optional[MarketingMetric]:
@@ -67,11 +70,12 @@ def normalize_marketing_metrics(raw_input: Dict[str, Any]) -> Dict[str, Any]:
     - Validate numeric ranges
     - Enrich with semantic metadata
     - Tag by business category
-    Returns a dict: {canonical_name: {value, valid, metadata, category}}
+    Returns a dict: {canonical_name: {value, valid, metadata, category, alias_confidence}}
     """
     result = {}
     for raw_name, value in raw_input.items():
-        metric = normalize_metric_name(raw_name)
+        resolution = resolve_metric_alias(raw_name)
+        metric = CANONICAL_METRICS[resolution.canonical] if resolution else None
         if not metric:
             # Treat non-canonical metrics (e.g., attendee count, pipeline) as valid if they are numbers
             try:
@@ -87,10 +91,126 @@ def normalize_marketing_metrics(raw_input: Dict[str, Any]) -> Dict[str, Any]:
             "value": value,
             "valid": valid,
             "metadata": metric.dict(),
-            "category": category
+            "category": category,
+            "alias_confidence": resolution.confidence
         }
     return result
 
+# -------------------
+# Batch / columnar API
+# -------------------
+
+OTHER_RECORD: Dict[str, Any] = {"metadata": None, "category": "other"}
+
+
+@lru_cache(maxsize=None)
+def metric_record(canonical_name: str) -> Dict[str, Any]:
+    """
+    Shared, precomputed {metadata, category} record for a canonical metric.
+    Batch results reference these records instead of copying metric.dict() per row; treat them as read-only.
+    """
+    metric = get_metric(canonical_name)
+    return {"metadata": metric.dict(), "category": _tag_category(metric.name)}
+
+
+def _value_bounds(metric: Optional[MarketingMetric]) -> Tuple[float, float]:
+    """
+    Inclusive valid range for a metric, matching _validate_range(); unknown metrics only need to be numeric.
+    """
+    if metric is None:
+        return -np.inf, np.inf
+    if metric.is_ratio or (metric.unit and metric.unit == "%"):
+        return 0.0, 100.0
+    if metric.unit in ("$", "ratio"):
+        return 0.0, np.inf
+    return -np.inf, np.inf
+
+
+class NormalizedMetricBatch:
+    """
+    Result of normalize_metrics_batch():
+    - values: float DataFrame, one column per canonical metric (non-numeric input becomes NaN)
+    - valid: boolean DataFrame of the same shape
+    - keys: the passed-through key columns (e.g., campaign_id, date)
+    - records: column -> shared metric_record() (or OTHER_RECORD for non-canonical columns)
+    - source_columns: column -> raw column name it was resolved from
+    - confidence: column -> alias resolution confidence (canonical metrics only)
+    """
+
+    def __init__(self, values: pd.DataFrame, valid: pd.DataFrame, keys: pd.DataFrame,
+                 records: Dict[str, Dict[str, Any]], source_columns: Dict[str, str],
+                 confidence: Dict[str, float]):
+        self.values = values
+        self.valid = valid
+        self.keys = keys
+        self.records = records
+        self.source_columns = source_columns
+        self.confidence = confidence
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """
+        One row in the normalize_marketing_metrics() shape; metadata dicts are shared, not copied.
+        """
+        result = {}
+        for name in self.values.columns:
+            value = self.values[name].iat[i]
+            valid = bool(self.valid[name].iat[i])
+            record = self.records[name]
+            entry = {"value": None if np.isnan(value) else float(value), "valid": valid, "category": record["category"]}
+            if record["metadata"] is not None:
+                entry["metadata"] = record["metadata"]
+                entry["alias_confidence"] = self.confidence[name]
+            elif not valid:
+                entry["error"] = "Unknown metric"
+            result[name] = entry
+        return result
+
+
+def normalize_metrics_batch(frame: Union[pd.DataFrame, Mapping[str, Iterable[Any]]],
+                            key_columns: Iterable[str] = ()) -> NormalizedMetricBatch:
+    """
+    Normalize many metric rows at once (e.g., one row per campaign per day):
+    - resolve each column alias once, not per row
+    - coerce whole columns with pd.to_numeric and validate ranges with vectorized masks by unit
+    - attach metadata by reference to shared precomputed records
+    Accepts a DataFrame or a mapping of column name -> array-like. key_columns are passed through untouched.
+    If two columns resolve to the same canonical metric, the last one wins (as in normalize_marketing_metrics).
+    """
+    if not isinstance(frame, pd.DataFrame):
+        frame = pd.DataFrame(frame)
+    key_columns = list(key_columns)
+    values: Dict[str, np.ndarray] = {}
+    valid: Dict[str, np.ndarray] = {}
+    records: Dict[str, Dict[str, Any]] = {}
+    source_columns: Dict[str, str] = {}
+    confidence: Dict[str, float] = {}
+    for raw_name in frame.columns:
+        if raw_name in key_columns:
+            continue
+        resolution = resolve_metric_alias(str(raw_name))
+        metric = CANONICAL_METRICS[resolution.canonical] if resolution else None
+        name = metric.name if metric else raw_name
+        if resolution:
+            confidence[name] = resolution.confidence
+        column = pd.to_numeric(frame[raw_name], errors="coerce").to_numpy(dtype=np.float64)
+        low, high = _value_bounds(metric)
+        with np.errstate(invalid="ignore"):
+            values[name] = column
+            valid[name] = (column >= low) & (column <= high)
+        records[name] = metric_record(metric.name) if metric else OTHER_RECORD
+        source_columns[name] = raw_name
+    return NormalizedMetricBatch(
+        values=pd.DataFrame(values, index=frame.index),
+        valid=pd.DataFrame(valid, index=frame.index),
+        keys=frame[key_columns],
+        records=records,
+        source_columns=source_columns,
+        confidence=confidence,
+    )
+
 # -------------------
 # Inline unit tests (pytest style)
 # -------------------
@@ -120,5 +240,24 @@ def test_normalize_marketing_metrics():
     print("All tests passed.")
 
 
+def test_normalize_metrics_batch():
+    batch = normalize_metrics_batch({
+        "campaign_id": ["c1", "c2", "c3"],
+        "ctr": [2.5, 120, "n/a"],
+        "customer acquisition cost": [100, -5, 80],
+        "unknown_metric": [1, "x", 3],
+    }, key_columns=["campaign_id"])
+    assert list(batch.values.columns) == ["CTR", "CAC", "unknown_metric"]
+    assert batch.valid["CTR"].tolist() == [True, False, False]
+    assert batch.valid["CAC"].tolist() == [True, False, True]
+    assert batch.valid["unknown_metric"].tolist() == [True, False, True]
+    assert batch.keys["campaign_id"].tolist() == ["c1", "c2", "c3"]
+    row0, row1 = batch.row(0), batch.row(1)
+    assert row0["CTR"]["category"] == "acquisition"
+    assert row0["CTR"]["metadata"] is row1["CTR"]["metadata"]
+    assert row1["unknown_metric"]["error"] == "Unknown metric"
+
+
 if __name__ == "__main__":
     test_normalize_marketing_metrics()
+    test_normalize_metrics_batch()
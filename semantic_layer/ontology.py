@@ -4,8 +4,9 @@ ontology.py
 Defines the ontology and canonical mapping for marketing metrics in the semantic abstraction layer.
 This enables mapping of aliases and synonyms to canonical metric definitions for robust, extensible analytics.
 """
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .schema import MarketingMetric
+from .alias_resolver import AliasResolution, AliasResolver
 
 # Canonical marketing metrics
 CANONICAL_METRICS: Dict[str, MarketingMetric] = {
@@ -58,15 +59,30 @@ for canonical, metric in CANONICAL_METRICS.items():
     for alias in metric.aliases:
         ALIAS_TO_CANONICAL[alias.lower()] = canonical
 
+# Fuzzy resolver for column-name variants ("Click-thru %", "ctr_pct", ...), compiled once at import
+ALIAS_RESOLVER = AliasResolver({canonical: metric.aliases for canonical, metric in CANONICAL_METRICS.items()})
+
+
+def resolve_metric_alias(alias: str) -> Optional[AliasResolution]:
+    """
+    Resolve an alias to its canonical name with a confidence score; exact alias matches score 1.0.
+    Returns None if nothing matches with enough confidence.
+    """
+    key = alias.strip().lower()
+    if key in ALIAS_TO_CANONICAL:
+        return AliasResolution(ALIAS_TO_CANONICAL[key], 1.0, "exact", key)
+    return ALIAS_RESOLVER.resolve(alias)
+
+
 def get_canonical_metric_name(alias: str) -> str:
     """
-    Returns the canonical metric name for a given alias or synonym.
+    Returns the canonical metric name for a given alias or synonym (exact or fuzzy match).
     Raises KeyError if not found.
     """
-    key = alias.strip().lower()
-    if key not in ALIAS_TO_CANONICAL:
+    resolution = resolve_metric_alias(alias)
+    if resolution is None:
         raise KeyError(f"Unknown metric alias: {alias}")
-    return ALIAS_TO_CANONICAL[key]
+    return resolution.canonical
 
 def get_metric(alias: str) -> MarketingMetric:
     """
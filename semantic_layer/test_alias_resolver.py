@@ -0,0 +1,53 @@
+"""
+Unit tests for the compiled fuzzy metric alias resolver.
+"""
+from semantic_layer.alias_resolver import AliasResolver, normalize_tokens
+
+ALIASES = {
+    "CAC": ["customer acquisition cost", "acquisition cost"],
+    "LTV": ["lifetime value", "customer lifetime value", "ltv"],
+    "ROAS": ["return on ad spend", "roas"],
+    "CTR": ["click through rate", "ctr"],
+    "Conversion Rate": ["conversion rate", "cr"],
+}
+
+
+def test_normalize_tokens():
+    assert normalize_tokens("Click-thru %") == ("click", "through")
+    assert normalize_tokens("ClickThroughRate") == ("click", "through", "rate")
+    assert normalize_tokens("cust_acq_cost") == ("customer", "acquisition", "cost")
+
+
+def test_resolve_variants():
+    resolver = AliasResolver(ALIASES)
+    for name in ["Click-thru %", "ctr_pct", "CTR (All)", "ClickThroughRate", "CTR"]:
+        assert resolver.canonical_name(name) == "CTR", name
+    assert resolver.canonical_name("Customer Acquisition Cost (USD)") == "CAC"
+    assert resolver.canonical_name("Return on Adspend") == "ROAS"
+    exact = resolver.resolve("click through rate")
+    assert exact.confidence == 1.0 and exact.method == "exact"
+    typo = resolver.resolve("Lifetime Valu")
+    assert typo.canonical == "LTV" and typo.method == "fuzzy" and 0.8 <= typo.confidence < 1.0
+
+
+def test_unrelated_names_stay_unresolved():
+    resolver = AliasResolver(ALIASES)
+    for name in ["unknown_metric", "Pipeline", "Number of attendees", "Conversions", "Clicks", "Cost"]:
+        assert resolver.resolve(name) is None, name
+
+
+def test_resolutions_are_memoized():
+    resolver = AliasResolver(ALIASES, cache_size=2)
+    resolver.resolve("ctr_pct")
+    resolver.resolve("ctr_pct")
+    info = resolver.cache_info()
+    assert info.hits == 1 and info.maxsize == 2
+
+
+def test_partial_token_matches_stay_unresolved():
+    resolver = AliasResolver(ALIASES)
+    for name in ["LTV:CAC", "roas_target", "cac payback", "CTR Goal", "ltv to cac ratio"]:
+        assert resolver.resolve(name) is None, name
+    # Context words around an alias still resolve
+    assert resolver.canonical_name("Total CTR") == "CTR"
+    assert resolver.canonical_name("Campaign ROAS") == "ROAS"